@@ -0,0 +1 @@
+""" Benchmarks for the biomancy package, run them as modules, e.g. `python -m benchmarks.json_backend`. """
@@ -0,0 +1,51 @@
+""" Benchmark the load time of a large synthetic report with every available JSON backend """
+import argparse
+import gc
+import glob
+import os
+import tempfile
+import time
+
+from biomancy import Report
+from biomancy.tools import json_backend
+
+from .synthetic import generate_report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pages', type=int, default=100)
+    parser.add_argument('--visuals', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=5)
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory_path:
+        generate_report(directory_path, pages=arguments.pages, visuals_per_page=arguments.visuals)
+        file_paths = glob.glob(os.path.join(directory_path, '**', '*.json'), recursive=True)
+        print(f'{arguments.pages} pages, {len(file_paths)} JSON files, best of {arguments.repeat}')
+
+        default_backend = json_backend.get_backend()
+        for backend in json_backend.BACKENDS:
+            json_backend.set_backend(backend)
+            parse_timings = []
+            report_timings = []
+
+            for _ in range(arguments.repeat):
+                gc.collect()
+                start = time.perf_counter()
+                for file_path in file_paths:
+                    json_backend.read_json(file_path)
+                parse_timings.append(time.perf_counter() - start)
+
+                gc.collect()
+                start = time.perf_counter()
+                Report(directory_path)
+                report_timings.append(time.perf_counter() - start)
+
+            print(f'{backend:>8}: read_json {min(parse_timings) * 1000:8.1f} ms, Report {min(report_timings) * 1000:8.1f} ms')
+
+        json_backend.set_backend(default_backend)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+""" Benchmark the memory held per visual by a loaded synthetic report """
+import argparse
+import gc
+import glob
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import tracemalloc
+
+from biomancy import Report
+from biomancy.tools import read_json
+
+from .synthetic import generate_report
+
+
+def measure(function) -> tuple[object, int]:
+    """ Get the result of a function and the number of bytes still allocated by it once it returns """
+    gc.collect()
+    tracemalloc.start()
+    result = function()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, size
+
+
+def run_at_revision(revision: str, pages: int, visuals: int) -> None:
+    """ Run this benchmark against the `biomancy` package of a git revision, e.g. `d22334a^` before `__slots__` """
+    benchmarks_path = os.path.dirname(os.path.abspath(__file__))
+    archive = subprocess.run(
+        ['git', 'archive', revision, 'biomancy'], cwd=os.path.dirname(benchmarks_path), check=True, capture_output=True
+    ).stdout
+
+    with tempfile.TemporaryDirectory() as directory_path:
+        with tarfile.open(fileobj=io.BytesIO(archive)) as archive_file:
+            archive_file.extractall(directory_path)
+
+        shutil.copytree(benchmarks_path, os.path.join(directory_path, 'benchmarks'),
+                        ignore=shutil.ignore_patterns('__pycache__'))
+        subprocess.run(
+            [sys.executable, '-m', 'benchmarks.memory', '--pages', str(pages), '--visuals', str(visuals)],
+            cwd=directory_path, check=True
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pages', type=int, default=100)
+    parser.add_argument('--visuals', type=int, default=50)
+    parser.add_argument('--revision', help='measure the biomancy package of this git revision instead')
+    arguments = parser.parse_args()
+
+    if arguments.revision:
+        run_at_revision(arguments.revision, arguments.pages, arguments.visuals)
+        return
+
+    with tempfile.TemporaryDirectory() as directory_path:
+        generate_report(directory_path, pages=arguments.pages, visuals_per_page=arguments.visuals)
+        file_paths = glob.glob(os.path.join(directory_path, '**', 'visual.json'), recursive=True)
+
+        _, raw_size = measure(lambda: [read_json(file_path) for file_path in file_paths])
+        report, report_size = measure(lambda: Report(directory_path))
+        visual_count = sum(len(page.visuals) for page in report.pages)
+
+        print(f'{arguments.pages} pages, {visual_count} visuals')
+        print(f'   raw JSON: {raw_size / visual_count:8.0f} bytes per visual')
+        print(f'     Report: {report_size / visual_count:8.0f} bytes per visual')
+        print(f'      model: {(report_size - raw_size) / visual_count:8.0f} bytes per visual on top of the raw JSON')
+
+
+if __name__ == '__main__':
+    main()
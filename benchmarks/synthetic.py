@@ -0,0 +1,99 @@
+""" Module to generate synthetic PBIP report definitions for benchmarks """
+import json
+import os
+import random
+
+VISUAL_SCHEMA = 'https://developer.microsoft.com/json-schemas/fabric/item/report/definition/visualContainer/1.0.0/schema.json'
+PAGE_SCHEMA = 'https://developer.microsoft.com/json-schemas/fabric/item/report/definition/page/1.0.0/schema.json'
+VISUAL_TYPES = ['lineChart', 'clusteredColumnChart', 'card', 'slicer', 'tableEx', 'shape', 'textbox']
+
+
+def literal(value: str) -> dict:
+    """ Wrap a value in a PowerBI literal expression """
+    return {'expr': {'Literal': {'Value': value}}}
+
+
+def visual_data(name: str, visual_type: str, index: int, rng: random.Random, parent_group_name: str = None) -> dict:
+    """ Build the content of a synthetic `visual.json` file """
+    data = {
+        '$schema': VISUAL_SCHEMA,
+        'name': name,
+        'position': {
+            'x': rng.randint(0, 1200), 'y': rng.randint(0, 680), 'z': index * 1000,
+            'width': rng.randint(40, 600), 'height': rng.randint(40, 400), 'tabOrder': index * 1000
+        },
+        'visual': {
+            'visualType': visual_type,
+            'query': {'queryState': {'Values': {'projections': [
+                {'field': {'Measure': {'Expression': {'SourceRef': {'Entity': 'Sales'}}, 'Property': 'Total Sales'}},
+                 'queryRef': 'Sales.Total Sales'},
+                {'field': {'Column': {'Expression': {'SourceRef': {'Entity': 'Date'}}, 'Property': 'Year'}},
+                 'queryRef': 'Date.Year'},
+            ]}}},
+            'objects': {
+                'legend': [{'properties': {'show': literal('true'), 'position': literal("'Top'")}}],
+                'labels': [{'properties': {'fontSize': literal('10D')}}],
+            },
+            'visualContainerObjects': {
+                'border': [{'properties': {'show': literal(rng.choice(['true', 'false'])), 'radius': literal('4D'), 'width': literal('1D')}}],
+                'title': [{'properties': {'show': literal('true'), 'text': literal(f"'Visual {index}'"), 'alignment': literal("'center'")}}],
+                'padding': [{'properties': {'top': literal('5D'), 'left': literal('5D'), 'right': literal('5D'), 'bottom': literal('5D')}}],
+                'background': [{'properties': {'show': literal('true'), 'transparency': literal('0D')}}],
+            },
+            'drillFilterOtherVisuals': True,
+        },
+    }
+
+    if parent_group_name:
+        data['parentGroupName'] = parent_group_name
+
+    return data
+
+
+def generate_report(directory_path: str, pages: int = 50, visuals_per_page: int = 40, seed: int = 0) -> str:
+    """
+    Write a synthetic report definition with one visual group per page
+
+    Args:
+        directory_path (str): The directory to write `pages.json` and the page directories to.
+        pages (int): The number of pages.
+        visuals_per_page (int): The number of visuals on each page, besides its visual group.
+        seed (int): The seed of the random positions and types.
+
+    Returns:
+        str: The directory path
+
+    """
+    rng = random.Random(seed)
+    page_order = [f'{page:020x}' for page in range(pages)]
+
+    os.makedirs(directory_path, exist_ok=True)
+    with open(os.path.join(directory_path, 'pages.json'), 'w') as pages_json:
+        json.dump({'pageOrder': page_order, 'activePageName': page_order[0]}, pages_json, indent=2)
+
+    for page_index, page_hash in enumerate(page_order):
+        page_directory = os.path.join(directory_path, page_hash)
+        os.makedirs(os.path.join(page_directory, 'visuals'), exist_ok=True)
+
+        with open(os.path.join(page_directory, 'page.json'), 'w') as page_json:
+            json.dump({'$schema': PAGE_SCHEMA, 'name': page_hash, 'displayName': f'Page {page_index}',
+                       'displayOption': 'FitToPage', 'height': 720, 'width': 1280}, page_json, indent=2)
+
+        group_name = f'{page_hash}g'
+        visuals = [(group_name, {
+            '$schema': VISUAL_SCHEMA, 'name': group_name,
+            'position': {'x': 0, 'y': 0, 'z': 0, 'width': 640, 'height': 360},
+            'visualGroup': {'displayName': f'Group {page_index}', 'groupMode': 'ScaleMode'},
+        })]
+
+        for visual_index in range(visuals_per_page):
+            name = f'{page_hash}{visual_index:04x}'
+            parent_group_name = group_name if visual_index % 5 == 0 else None
+            visuals.append((name, visual_data(name, rng.choice(VISUAL_TYPES), visual_index, rng, parent_group_name)))
+
+        for name, data in visuals:
+            os.makedirs(os.path.join(page_directory, 'visuals', name), exist_ok=True)
+            with open(os.path.join(page_directory, 'visuals', name, 'visual.json'), 'w') as visual_json:
+                json.dump(data, visual_json, indent=2)
+
+    return directory_path
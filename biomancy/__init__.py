@@ -1 +1,11 @@
-from .report import Report
\ No newline at end of file
+from .corpus import CorpusIndex
+from .field_index import FieldIndex
+from .file_systems import AsyncFileSystem, FakeFileSystem, LocalFileSystem
+from .fleet import ScanResult, aggregate, scan
+from .merge import MergeConflict, MergeResult
+from .parse_cache import ParseCache
+from .query import VisualQuery
+from .report import Report
+from .streaming import iter_visuals
+from .transaction import Transaction
+from .watcher import ReportEvent, ReportWatcher
@@ -0,0 +1,127 @@
+""" Module to export the visuals of a PowerBI report as columns """
+import math
+
+from array import array
+from typing import Union
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+from biomancy.components import Pages, VisualContainerObjects
+
+NUMERIC_COLUMNS: list[str] = ['x', 'y', 'z', 'width', 'height', 'tab_order', 'angle']
+TEXT_COLUMNS: list[str] = ['page_hash', 'page_display_name', 'name', 'type', 'parent_group_name']
+CONTAINER_SECTIONS: list[str] = list(VisualContainerObjects.SECTIONS)
+
+
+def to_columns(pages: Pages) -> dict[str, Union[array, list]]:
+    """
+    Export every visual of a set of pages as columns in a single pass. Position columns are contiguous `array('d')`
+    with NaN for missing values, `page_index` is an `array('q')`, text columns are lists, and every
+    `visual_container_objects` setting found is flattened into a `<section>_<key>` list column, None where absent.
+
+    Args:
+        pages (Pages): The pages to export the visuals of.
+
+    Returns:
+        dict[str, Union[array, list]]: The columns keyed by name, all of the same length
+
+    """
+    columns: dict[str, Union[array, list]] = {'page_index': array('q')}
+    columns.update({name: [] for name in TEXT_COLUMNS})
+    columns.update({name: array('d') for name in NUMERIC_COLUMNS})
+    container_columns: dict[str, list] = {}
+    nan = math.nan
+    row_count = 0
+
+    for page_index, page in enumerate(pages):
+        page_display_name = page.display_name
+
+        for visual in page.visuals:
+            position = visual.position
+            columns['page_index'].append(page_index)
+            columns['page_hash'].append(page.hash)
+            columns['page_display_name'].append(page_display_name)
+            columns['name'].append(visual.name)
+            columns['type'].append(visual.type)
+            columns['parent_group_name'].append(visual.parent_group_name)
+            columns['x'].append(position.x)
+            columns['y'].append(position.y)
+            columns['z'].append(nan if position.z is None else position.z)
+            columns['width'].append(position.width)
+            columns['height'].append(position.height)
+            columns['tab_order'].append(nan if position.tab_order is None else position.tab_order)
+            columns['angle'].append(nan if position.angle is None else position.angle)
+
+            container_objects = getattr(visual, 'visual_container_objects', None)
+            if container_objects is not None:
+                for section in CONTAINER_SECTIONS:
+                    for key, value in container_objects[section].items():
+                        column = container_columns.get(f'{section}_{key}')
+
+                        if column is None:
+                            column = container_columns[f'{section}_{key}'] = [None] * row_count
+
+                        column.append(value)
+
+            row_count += 1
+
+            for column in container_columns.values():
+                if len(column) < row_count:
+                    column.append(None)
+
+    columns.update(sorted(container_columns.items()))
+
+    return columns
+
+
+def to_arrow(pages: Pages) -> 'pyarrow.Table':
+    """
+    Export every visual of a set of pages as an Arrow table, sharing the buffers of the numeric columns
+
+    Args:
+        pages (Pages): The pages to export the visuals of.
+
+    Returns:
+        pyarrow.Table: One row per visual
+
+    """
+    if pyarrow is None:
+        raise ImportError("Exporting to Arrow requires the `pyarrow` package")
+
+    arrays = {}
+    for name, values in to_columns(pages).items():
+        if isinstance(values, array):
+            data_type = pyarrow.float64() if values.typecode == 'd' else pyarrow.int64()
+            arrays[name] = pyarrow.Array.from_buffers(data_type, len(values), [None, pyarrow.py_buffer(values)])
+        else:
+            arrays[name] = pyarrow.array(values)
+
+    return pyarrow.table(arrays)
+
+
+def to_dataframe(pages: Pages) -> 'pandas.DataFrame':
+    """
+    Export every visual of a set of pages as a pandas DataFrame
+
+    Args:
+        pages (Pages): The pages to export the visuals of.
+
+    Returns:
+        pandas.DataFrame: One row per visual
+
+    """
+    if pandas is None:
+        raise ImportError("Exporting to a DataFrame requires the `pandas` package")
+
+    if pyarrow is not None:
+        return to_arrow(pages).to_pandas()
+
+    return pandas.DataFrame(to_columns(pages))
@@ -1,6 +1,7 @@
 """ Components module. """
 from .page import Page
 from .pages import Pages
+from .spatial_index import SpatialIndex
 from .visual_base import VisualBase
 from .visual_container_objects import VisualContainerObjects
 from .visual_group import VisualGroup
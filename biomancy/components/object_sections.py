@@ -0,0 +1,124 @@
+""" Module to decode the formatting sections of a visual, such as `visualContainerObjects` and `objects` """
+from typing import Any, Callable, Optional
+
+from ..tools.expressions import decode_expression, get_expression
+
+
+def get_literal(value: Any) -> Any:
+    """
+    Get the undecoded value of a literal expression, e.g. `'12D'` for `{'expr': {'Literal': {'Value': '12D'}}}`
+
+    Args:
+        value (Any): The raw value of a property.
+
+    Returns:
+        Any: The literal string, or the decoded expression when it is not a literal
+
+    """
+    expression = get_expression(value)
+
+    if isinstance(expression, dict) and 'Literal' in expression:
+        return expression['Literal'].get('Value')
+
+    return decode_expression(value)
+
+
+def decode_integer(value: Any) -> Any:
+    """ Decode a numeric literal, e.g. `'12D'` or `'4L'`, as an integer """
+    decoded = decode_expression(value)
+    return int(decoded) if isinstance(decoded, float) else decoded
+
+
+DECODERS: dict[str, Callable[[Any], Any]] = {
+    'literal': get_literal, 'integer': decode_integer, 'boolean': decode_expression, 'text': decode_expression,
+    'value': decode_expression,
+}
+
+
+def decode_section(entries: Any, properties: Optional[dict[str, str]] = None) -> dict[str, Any]:
+    """
+    Decode the properties of the first entry of a formatting section
+
+    Args:
+        entries (Any): The raw section, a list of `{'properties': {...}}` entries.
+        properties (Optional[dict[str, str]]): The name of the decoder of every property to decode, keyed by
+            property name. Every property is decoded with `decode_expression` when None.
+
+    Returns:
+        dict[str, Any]: The decoded properties, empty when the section is absent
+
+    """
+    if not entries or not isinstance(entries, list) or not isinstance(entries[0], dict):
+        return {}
+
+    raw_properties = entries[0].get('properties', {})
+
+    if properties is None:
+        return {name: decode_expression(value) for name, value in raw_properties.items()}
+
+    return {name: DECODERS[decoder](raw_properties[name]) for name, decoder in properties.items() if name in raw_properties}
+
+
+class ObjectSections(object):
+    """
+    Base class for the formatting sections of a visual, decoded from `raw_data` on first access and cached.
+    Subclasses declare `SECTIONS`, the JSON key and the property decoders of every section keyed by attribute name.
+    """
+    __slots__ = ('raw_data', '__decoded')
+
+    SECTIONS: dict[str, tuple[str, Optional[dict[str, str]]]] = {}
+
+    def __init__(self, data: dict):
+        self.raw_data: dict = data if data else {}
+        self.__decoded: Optional[dict[str, dict]] = None
+
+    def __getattr__(self, item: str) -> dict:
+        if item not in self.SECTIONS:
+            raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{item}'")
+
+        return self.__get_section(item)
+
+    def __contains__(self, item):
+        return item in self.SECTIONS
+
+    def __getitem__(self, item: str):
+        if item not in self.SECTIONS:
+            raise KeyError(item)
+
+        return self.__get_section(item)
+
+    def __iter__(self):
+        return iter([(name, self.__get_section(name)) for name in self.SECTIONS])
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.raw_data})"
+
+    def __get_section(self, name: str) -> dict:
+        if self.__decoded is None:
+            self.__decoded = {}
+
+        if name not in self.__decoded:
+            key, properties = self.SECTIONS[name]
+            self.__decoded[name] = decode_section(self.raw_data.get(key), properties)
+
+        return self.__decoded[name]
+
+    def keys(self):
+        """ Return the names of the sections """
+        return self.SECTIONS.keys()
+
+    def invalidate(self, data: Optional[dict] = None) -> None:
+        """
+        Discard the decoded sections, to decode them again from `raw_data` after it was edited
+
+        Args:
+            data (Optional[dict]): The new raw sections, when the edit replaced the dictionary instead of changing it.
+
+        Returns:
+            None
+
+        """
+        if data is not None:
+            self.raw_data = data
+
+        self.__decoded = None
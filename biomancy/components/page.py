@@ -1,46 +1,239 @@
 """ Class to represent a PowerBI page """
-import json
+import itertools
 import os
 
+from typing import Optional, Union
+
+from .spatial_index import SpatialIndex
 from .visual_type import VisualType
 from .visual_group import VisualGroup
 from .visual_groups import VisualGroups
 from .visuals import Visuals
+from ..parse_cache import ParseCache
+from ..tools import read_json, write_json
+from ..tools.hashing import combine_hashes, hash_json
+
+REVISIONS = itertools.count()
 
 
 class Page(object):
     """ Class to represent a PowerBI page """
-    def __init__(self, directory_path: str):
-        self.raw_data = {}
+    def __init__(self, directory_path: str, lazy: bool = False, cache: Optional[ParseCache] = None):
+        """
+        Initialize the Page object
+
+        Args:
+            directory_path (str): The directory path of the page, containing `page.json` and `visuals/`.
+            lazy (bool): When True, `page.json` and the visuals are only read on first access.
+            cache (Optional[ParseCache]): The parse cache to serve unchanged `page.json` and `visual.json` files from.
+
+        """
+        self.cache: Optional[ParseCache] = cache
         self.directory_path: str = directory_path
-        self.display_name: str = ''
         self.file_path: str = os.path.join(directory_path, 'page.json')
         self.hash: str = os.path.basename(directory_path)
-        self.visuals: Visuals = Visuals()
         self.visuals_directories: list[str] = []
+        self.dirty: bool = False
+        self.revision: int = next(REVISIONS)
 
-        self.visual_groups: VisualGroups = VisualGroups()
+        self.__raw_data: Optional[dict] = None
+        self.__visuals: Optional[Visuals] = None
+        self.__visual_groups: Optional[VisualGroups] = None
+        self.__spatial_index: Optional[SpatialIndex] = None
+        self.__signatures: dict[str, Optional[tuple[int, int]]] = {}
+        self.__content_hash: Optional[str] = None
 
         if not os.path.exists(directory_path):
             raise FileNotFoundError(f"Expected Structural Error || Target directory {directory_path} not found")
 
-        with open(self.file_path) as page_json_file:
-            self.raw_data = json.load(page_json_file)
-
-        self.display_name = self.raw_data['displayName'] if 'displayName' in self.raw_data else ''
-        self.objects = self.raw_data.get('objects', []) if 'objects' in self.raw_data else []
-
-        self.__populate_visuals_data()
-        self.__construct_groups()
+        if not lazy:
+            self.load()
 
     def __len__(self):
         return len(self.visuals)
 
     def __repr__(self):
+        if self.__raw_data is None:
+            return f'Page({self.hash})'
+
         return f'Page({self.display_name})'
 
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state['_Page__spatial_index'] = None
+
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.revision = next(REVISIONS)
+
+    @property
+    def raw_data(self) -> dict:
+        """
+        Get the raw data of the page, reading `page.json` on first access
+
+        Returns:
+            dict: The raw data from the `page.json` file
+
+        """
+        if self.__raw_data is None:
+            self.__load_page_data()
+
+        return self.__raw_data
+
+    @property
+    def display_name(self) -> str:
+        """
+        Get the display name of the page
+
+        Returns:
+            str: The display name of the page, empty when not defined
+
+        """
+        return self.raw_data['displayName'] if 'displayName' in self.raw_data else ''
+
+    @property
+    def objects(self) -> list:
+        """
+        Get the objects of the page
+
+        Returns:
+            list: The objects of the page, empty when not defined
+
+        """
+        return self.raw_data.get('objects', []) if 'objects' in self.raw_data else []
+
+    @property
+    def visuals(self) -> Visuals:
+        """
+        Get the visuals of the page, reading every `visual.json` on first access
+
+        Returns:
+            Visuals: The visuals of the page
+
+        """
+        if self.__visuals is None:
+            self.__load_visuals()
+
+        return self.__visuals
+
+    @property
+    def visual_groups(self) -> VisualGroups:
+        """
+        Get the visual groups of the page, reading every `visual.json` on first access
+
+        Returns:
+            VisualGroups: The visual groups of the page
+
+        """
+        if self.__visual_groups is None:
+            self.__load_visuals()
+
+        return self.__visual_groups
+
+    @property
+    def spatial_index(self) -> SpatialIndex:
+        """
+        Get the spatial index of the visuals and visual groups of the page, built on first access and kept up to
+        date as visual positions change or the page is refreshed
+
+        Returns:
+            SpatialIndex: The spatial index of the page
+
+        """
+        if self.__spatial_index is None:
+            self.__spatial_index = SpatialIndex(list(self.visuals))
+
+        return self.__spatial_index
+
+    @property
+    def content_hash(self) -> str:
+        """
+        Get the Merkle hash of the page, combining the hash of `page.json` with the hash of every visual, each
+        visual group hashing itself together with its children. The hash is cached until the page or one of its
+        visuals is marked dirty, reloaded or reverted.
+
+        Returns:
+            str: The hash of the page, independent of key order and of the order visuals are listed in
+
+        """
+        if self.__content_hash is not None:
+            return self.__content_hash
+
+        tree_hashes = []
+
+        for visual in self.visuals:
+            if isinstance(visual, VisualGroup):
+                children_hashes = sorted(child.content_hash for child in visual.children.values())
+                tree_hashes.append(combine_hashes(visual.content_hash, *children_hashes))
+            elif not (visual.parent_group_name and visual.parent_group_name in self.visual_groups):
+                tree_hashes.append(visual.content_hash)
+
+        self.__content_hash = combine_hashes(hash_json(self.raw_data), *sorted(tree_hashes))
+
+        return self.__content_hash
+
+    @property
+    def signatures(self) -> dict[str, Optional[tuple[int, int]]]:
+        """
+        Get the modification time and size of every file and directory read for the page, as last seen on disk
+
+        Returns:
+            dict[str, Optional[tuple[int, int]]]: The `(mtime_ns, size)` keyed by path, None for missing paths
+
+        """
+        return dict(self.__signatures)
+
+    @property
+    def is_loaded(self) -> bool:
+        """
+        Check if both `page.json` and the visuals of the page have been read
+
+        Returns:
+            bool: True if the page is fully loaded, False otherwise
+
+        """
+        return self.__raw_data is not None and self.__visuals is not None
+
+    @staticmethod
+    def __get_signature(path: str) -> Optional[tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+
+        return stat.st_mtime_ns, stat.st_size
+
+    def __load_page_data(self):
+        signature = self.__get_signature(self.file_path)
+        self.__raw_data = self.cache.read_json(self.file_path) if self.cache else read_json(self.file_path)
+        self.__signatures[self.file_path] = signature
+        self.invalidate_content_hash()
+
+    def __track(self, visual: Union[VisualGroup, VisualType]) -> Union[VisualGroup, VisualType]:
+        visual.observers.append(self.update_group_membership)
+        visual.observers.append(self.invalidate_content_hash)
+        self.invalidate_content_hash()
+
+        return visual
+
+    def __load_visuals(self, visuals_data: Optional[list[dict]] = None,
+                       signatures: Optional[dict[str, Optional[tuple[int, int]]]] = None,
+                       visual_paths: Optional[list[str]] = None):
+        if self.__spatial_index is not None:
+            self.__spatial_index.close()
+            self.__spatial_index = None
+
+        self.__visuals = Visuals(cache=self.cache)
+        self.__visual_groups = VisualGroups()
+
+        self.__populate_visuals_data(visuals_data, signatures, visual_paths)
+        self.__construct_groups()
+
     def __get_visuals_directories(self):
         visuals_dir = os.path.join(self.directory_path, 'visuals')
+        self.__signatures[visuals_dir] = self.__get_signature(visuals_dir)
         if not os.path.exists(visuals_dir):
             return
 
@@ -48,26 +241,399 @@ class Page(object):
             directory for directory in os.listdir(visuals_dir) if os.path.isdir(os.path.join(visuals_dir, directory))
         ]
 
-    def __populate_visuals_data(self):
+    def __populate_visuals_data(self, visuals_data: Optional[list[dict]] = None,
+                                signatures: Optional[dict[str, Optional[tuple[int, int]]]] = None,
+                                visual_paths: Optional[list[str]] = None):
+        visual_paths = self.get_visual_paths() if visual_paths is None else visual_paths
+        signatures = signatures if signatures else {}
+
+        if visuals_data is not None and len(visuals_data) != len(visual_paths):
+            raise ValueError(f"Expected {len(visual_paths)} parsed visuals for page {self.hash}, received {len(visuals_data)}")
+
+        for index, visual_json_path in enumerate(visual_paths):
+            data = visuals_data[index] if visuals_data is not None else None
+            visual_file_path = os.path.join(visual_json_path, 'visual.json')
+            self.__signatures[visual_file_path] = (
+                signatures[visual_file_path] if visual_file_path in signatures else self.__get_signature(visual_file_path)
+            )
+            created_visual = self.__track(self.__visuals.add(visual_json_path, data=data))
+
+            if isinstance(created_visual, VisualGroup):
+                self.__visual_groups.add(created_visual)
+
+    def __rebuild_groups(self):
+        self.__visual_groups = VisualGroups()
+
+        for visual in self.__visuals:
+            if isinstance(visual, VisualGroup):
+                visual.children = {}
+                self.__visual_groups.add(visual)
+
+        self.__construct_groups()
+
+    def __get_group_membership(self) -> dict[str, set[str]]:
+        return {name: set(self.__visual_groups[name].children) for name in self.__visual_groups}
+
+    def __construct_groups(self):
+        for visual in self.__visuals:
+            if not isinstance(visual, VisualGroup) and visual.parent_group_name and visual.parent_group_name in self.__visual_groups:
+                self.__visual_groups[visual.parent_group_name].add(visual)
+
+    def get_visual_paths(self) -> list[str]:
+        """
+        Get the directory paths of the visuals of the page, in loading order
+
+        Returns:
+            list[str]: The directory paths of the visuals
+
+        """
         if not self.visuals_directories:
             self.__get_visuals_directories()
 
+        visual_paths = []
         for visual_dir in self.visuals_directories:
             visual_json_path = os.path.join(self.directory_path, 'visuals', visual_dir)
 
             if not os.path.exists(visual_json_path):
                 continue
 
-            created_visual = self.visuals.add(visual_json_path)
+            visual_paths.append(visual_json_path)
 
-            if isinstance(created_visual, VisualGroup):
-                self.visual_groups.add(created_visual)
+        return visual_paths
 
-    def __construct_groups(self):
-        for visual in self.visuals:
-            if not isinstance(visual, VisualGroup) and visual.parent_group_name and visual.parent_group_name in self.visual_groups:
-                self.visual_groups[visual.parent_group_name].add(visual)
+    def load(self, raw_data: Optional[dict] = None, visuals_data: Optional[list[dict]] = None,
+             signatures: Optional[dict[str, Optional[tuple[int, int]]]] = None,
+             visuals_directories: Optional[list[str]] = None) -> None:
+        """
+        Read `page.json` and the visuals of the page if they have not been read yet
+
+        Args:
+            raw_data (Optional[dict]): Already parsed content of `page.json`, read from disk when not given.
+            visuals_data (Optional[list[dict]]): Already parsed content of every `visual.json`, matching the order
+                of `get_visual_paths`, read from disk when not given.
+            signatures (Optional[dict[str, Optional[tuple[int, int]]]]): The `(mtime_ns, size)` of the already
+                parsed files and of the `visuals` directory, keyed by path, taken when they were read. Paths
+                missing from it are checked on disk.
+            visuals_directories (Optional[list[str]]): Already listed names of the visual directories, every one
+                of them holding a `visual.json`, listed from disk when not given.
+
+        Returns:
+            None
+
+        """
+        signatures = signatures if signatures else {}
+
+        if self.__raw_data is None:
+            if raw_data is None:
+                self.__load_page_data()
+            else:
+                self.__signatures[self.file_path] = (
+                    signatures[self.file_path] if self.file_path in signatures else self.__get_signature(self.file_path)
+                )
+                self.__raw_data = raw_data
+
+        if self.__visuals is None:
+            visual_paths = None
+
+            if visuals_directories is not None:
+                visuals_dir = os.path.join(self.directory_path, 'visuals')
+                self.__signatures[visuals_dir] = (
+                    signatures[visuals_dir] if visuals_dir in signatures else self.__get_signature(visuals_dir)
+                )
+                self.visuals_directories = list(visuals_directories)
+                visual_paths = [os.path.join(visuals_dir, directory) for directory in visuals_directories]
+
+            self.__load_visuals(visuals_data, signatures, visual_paths)
+
+    def refresh(self) -> dict[str, Union[bool, list[str]]]:
+        """
+        Reload what changed on disk since the page was read. `page.json` is reloaded when its modification time or
+        size changed, added, modified and removed `visual.json` files are reloaded individually and the visual
+        groups are only rebuilt when at least one visual changed. Parts of a lazy page that were never read are
+        left untouched. Files changed or removed on disk while they have unsaved edits are never reloaded, they
+        are reported as conflicts until the edits are saved or reverted.
+
+        Returns:
+            dict[str, Union[bool, list[str]]]: `page_modified`, the names of the `added`, `modified` and
+                `removed` visuals, the names of the visual groups whose membership changed under `groups`,
+                `page_conflict` and the names of the dirty visuals changed on disk under `conflicts`
+
+        """
+        summary = {
+            'page_modified': False, 'added': [], 'modified': [], 'removed': [], 'groups': [], 'page_conflict': False,
+            'conflicts': []
+        }
+
+        if self.__raw_data is not None and self.__get_signature(self.file_path) != self.__signatures.get(self.file_path):
+            if self.dirty:
+                summary['page_conflict'] = True
+            else:
+                self.__load_page_data()
+                summary['page_modified'] = True
+
+        if self.__visuals is None:
+            return summary
+
+        visuals_dir = os.path.join(self.directory_path, 'visuals')
+        if self.__get_signature(visuals_dir) != self.__signatures.get(visuals_dir):
+            self.visuals_directories = []
+
+        visual_paths = self.get_visual_paths()
+        known_visuals = {visual.directory_path: visual for visual in self.__visuals}
+
+        for visual_path in known_visuals.keys() - set(visual_paths):
+            if known_visuals[visual_path].dirty:
+                summary['conflicts'].append(known_visuals[visual_path].name)
+                continue
+
+            removed_visual = self.__visuals.remove(known_visuals[visual_path].name)
+            self.invalidate_content_hash()
+            self.__signatures.pop(os.path.join(visual_path, 'visual.json'), None)
+            summary['removed'].append(removed_visual.name)
+
+            if self.__spatial_index is not None:
+                self.__spatial_index.remove(removed_visual.name)
+
+        for visual_path in visual_paths:
+            visual_file_path = os.path.join(visual_path, 'visual.json')
+            signature = self.__get_signature(visual_file_path)
+
+            if visual_path not in known_visuals:
+                added_visual = self.__track(self.__visuals.add(visual_path))
+                self.__signatures[visual_file_path] = signature
+                summary['added'].append(added_visual.name)
+
+                if self.__spatial_index is not None:
+                    self.__spatial_index.insert(added_visual)
+            elif signature != self.__signatures.get(visual_file_path):
+                if known_visuals[visual_path].dirty:
+                    summary['conflicts'].append(known_visuals[visual_path].name)
+                    continue
+
+                modified_visual = self.__track(self.__visuals.replace(known_visuals[visual_path].name, visual_path))
+                self.__signatures[visual_file_path] = signature
+                summary['modified'].append(modified_visual.name)
+
+                if self.__spatial_index is not None:
+                    self.__spatial_index.remove(known_visuals[visual_path].name)
+                    self.__spatial_index.insert(modified_visual)
+
+        if summary['added'] or summary['modified'] or summary['removed']:
+            previous_membership = self.__get_group_membership()
+            self.__rebuild_groups()
+            current_membership = self.__get_group_membership()
+
+            summary['groups'] = sorted(
+                name for name in previous_membership.keys() | current_membership.keys()
+                if previous_membership.get(name) != current_membership.get(name)
+            )
+
+        return summary
+
+    def mark_dirty(self) -> None:
+        """
+        Flag `page.json` as changed so that the next save writes it. Edits made to `raw_data` must be flagged by
+        calling this method, visuals track their own changes.
+
+        Returns:
+            None
+
+        """
+        self.dirty = True
+        self.invalidate_content_hash()
+
+    def update_group_membership(self, visual: Union[VisualGroup, VisualType]) -> None:
+        """
+        Move a visual to the visual group named by its `parent_group_name`, called whenever one of the visuals is
+        marked dirty so the groups follow edits made to `raw_data`
+
+        Args:
+            visual (Union[VisualGroup, VisualType]): The visual that changed.
+
+        Returns:
+            None
+
+        """
+        if self.__visual_groups is None or isinstance(visual, VisualGroup):
+            return
+
+        try:
+            if self.__visuals.get_by_hash(visual.name) is not visual:
+                return
+        except IndexError:
+            return
+
+        current_group = next(
+            (self.__visual_groups[name] for name in self.__visual_groups
+             if self.__visual_groups[name].children.get(visual.name) is visual), None
+        )
+        parent_group = self.__visual_groups[visual.parent_group_name] if visual.parent_group_name in self.__visual_groups else None
+
+        if current_group is parent_group:
+            return
+
+        if current_group is not None:
+            del current_group.children[visual.name]
+
+        if parent_group is not None:
+            parent_group.add(visual)
+
+    def invalidate_content_hash(self, *_) -> None:
+        """
+        Discard the cached content hash and move the page to a new `revision`, a number unique across every page
+        of the process. Called whenever the page or one of its visuals is marked dirty, reloaded or reverted.
+
+        Returns:
+            None
+
+        """
+        self.__content_hash = None
+        self.revision = next(REVISIONS)
+
+    def save(self) -> list[str]:
+        """
+        Write `page.json` and the `visual.json` of every visual that changed since they were read or last saved.
+        Unchanged files are never touched, and the recorded signatures are updated so that a following `refresh`
+        does not reload what was just written.
+
+        Returns:
+            list[str]: The paths of the files written
+
+        """
+        written = []
+
+        if self.dirty and self.__raw_data is not None:
+            if write_json(self.file_path, self.__raw_data):
+                self.__signatures[self.file_path] = self.__get_signature(self.file_path)
+                written.append(self.file_path)
+
+            self.dirty = False
+
+        if self.__visuals is None:
+            return written
+
+        for visual in self.__visuals:
+            if visual.dirty and visual.save():
+                self.__signatures[visual.file_path] = self.__get_signature(visual.file_path)
+                written.append(visual.file_path)
+
+        return written
+
+    @property
+    def dirty_visuals(self) -> list[Union[VisualGroup, VisualType]]:
+        """
+        Get the visuals changed since they were read or last saved, without reading the visuals of a lazy page
+
+        Returns:
+            list[Union[VisualGroup, VisualType]]: The dirty visuals, empty when the visuals were never read
+
+        """
+        if self.__visuals is None:
+            return []
+
+        return [visual for visual in self.__visuals if visual.dirty]
+
+    def revert(self, raw_data: Optional[dict] = None, visuals_data: Optional[dict[str, dict]] = None) -> list[str]:
+        """
+        Discard the unsaved changes of the page. Dirty files are read again from disk, unless replacement content
+        is given for them, in which case the page or visual is rebuilt from that content and stays dirty. Dirty
+        visuals whose `visual.json` was removed from disk are removed from the page.
+
+        Args:
+            raw_data (Optional[dict]): The content to restore `page.json` to instead of reading it from disk.
+            visuals_data (Optional[dict[str, dict]]): The content to restore visuals to, keyed by visual name.
+
+        Returns:
+            list[str]: The names of the visuals reverted
+
+        """
+        visuals_data = visuals_data if visuals_data else {}
+
+        if raw_data is not None:
+            self.__raw_data = raw_data
+            self.invalidate_content_hash()
+            self.dirty = True
+        elif self.dirty:
+            self.__load_page_data()
+            self.dirty = False
+
+        reverted = []
+        for visual in self.dirty_visuals:
+            data = visuals_data.get(visual.name)
+            reverted.append(visual.name)
+
+            if self.__spatial_index is not None:
+                self.__spatial_index.remove(visual.name)
+
+            if data is None:
+                signature = self.__get_signature(visual.file_path)
+
+                if signature is None:
+                    self.__visuals.remove(visual.name)
+                    self.__signatures.pop(visual.file_path, None)
+                    self.invalidate_content_hash()
+                    continue
+
+                self.__signatures[visual.file_path] = signature
+
+            reverted_visual = self.__track(self.__visuals.replace(visual.name, visual.directory_path, data=data))
+            reverted_visual.dirty = data is not None
+
+            if self.__spatial_index is not None:
+                self.__spatial_index.insert(reverted_visual)
+
+        if reverted:
+            self.__rebuild_groups()
+
+        return reverted
 
     def visuals_by_type(self, visual_type: str) -> list[VisualType]:
-        """ Get all visuals of a specific type from all pages """
-        return [visual for visual in self.visuals if visual.type == visual_type]
+        """ Get all visuals of a specific type from the page """
+        return self.visuals.get_by_type(visual_type)
+
+    def visuals_at(self, x: float, y: float, include_groups: bool = False) -> list[Union[VisualGroup, VisualType]]:
+        """
+        Get the visuals under a point of the page
+
+        Args:
+            x (float): The x-coordinate of the point.
+            y (float): The y-coordinate of the point.
+            include_groups (bool): Also return the visual groups under the point.
+
+        Returns:
+            list[Union[VisualGroup, VisualType]]: The visuals under the point, top-most first
+
+        """
+        return self.spatial_index.at(x, y, include_groups=include_groups)
+
+    def visuals_in(self, rect: tuple[float, float, float, float], contained: bool = False,
+                   include_groups: bool = False) -> list[Union[VisualGroup, VisualType]]:
+        """
+        Get the visuals intersecting, or contained in, a rectangle of the page
+
+        Args:
+            rect (tuple[float, float, float, float]): The `x`, `y`, `width` and `height` of the rectangle.
+            contained (bool): Only return visuals fully inside the rectangle.
+            include_groups (bool): Also return visual groups.
+
+        Returns:
+            list[Union[VisualGroup, VisualType]]: The matching visuals, top-most first
+
+        """
+        return self.spatial_index.within(*rect, contained=contained, include_groups=include_groups)
+
+    def nearest_visuals(self, visual: Union[VisualGroup, VisualType], count: int = 1,
+                        include_groups: bool = False) -> list[tuple[Union[VisualGroup, VisualType], float]]:
+        """
+        Get the visuals closest to a visual of the page
+
+        Args:
+            visual (Union[VisualGroup, VisualType]): The visual to search around.
+            count (int): The number of visuals to return.
+            include_groups (bool): Also return visual groups.
+
+        Returns:
+            list[tuple[Union[VisualGroup, VisualType], float]]: The closest visuals and their distance, nearest first
+
+        """
+        return self.spatial_index.nearest(visual, count=count, include_groups=include_groups)
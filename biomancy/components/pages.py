@@ -8,23 +8,27 @@ from .visual_type import VisualType
 
 
 class Pages(object):
-    """ Class to represent a collection of PowerBI pages """
+    """
+    Class to represent a collection of PowerBI pages.
+
+    Pages are indexed by hash and by display name. When several pages share a display name, lookups by that
+    display name resolve to the first of them in page order. The display name index is rebuilt on a lookup that
+    misses or hits a renamed page, so renaming a page needs no explicit `reindex`.
+    """
     def __init__(self):
         self.__pages: list[Page] = []
-        self.display_names: list[str] = []
+        self.__pages_by_hash: dict[str, Page] = {}
+        self.__pages_by_display_name: Optional[dict[str, Page]] = None
         self.hashes: list[str] = []
 
     def __getitem__(self, item: Union[int, str]) -> Optional[Page]:
         if isinstance(item, int):
             return self.__pages[item]
 
-        if item in self.hashes:
-            return self.__pages[self.hashes.index(item)]
-
-        if item in self.display_names:
-            return self.__pages[self.display_names.index(item)]
+        if item in self.__pages_by_hash:
+            return self.__pages_by_hash[item]
 
-        return None
+        return self.__get_by_display_name(item)
 
     def __iter__(self):
         return iter(self.__pages)
@@ -38,19 +42,102 @@ class Pages(object):
     def __list__(self):
         return self.__pages
 
+    def __get_by_display_name(self, display_name: str) -> Optional[Page]:
+        reindexed = self.__pages_by_display_name is None
+
+        if reindexed:
+            self.reindex()
+
+        page = self.__pages_by_display_name.get(display_name)
+
+        if not reindexed and (page is None or page.display_name != display_name):
+            # A page may have been renamed to or from this display name since the index was built
+            self.reindex()
+            page = self.__pages_by_display_name.get(display_name)
+
+        return page
+
+    def reindex(self) -> None:
+        """
+        Rebuild the display name index, needed after the display name of a page changed
+
+        Returns:
+            None
+
+        """
+        pages_by_display_name = {}
+        for page in self.__pages:
+            pages_by_display_name.setdefault(page.display_name, page)
+
+        self.__pages_by_display_name = pages_by_display_name
+
+    @property
+    def display_names(self) -> list[str]:
+        """
+        Get the display names of all pages, reading `page.json` of lazy pages as needed
+
+        Returns:
+            list[str]: The display names of all pages, in page order
+
+        """
+        return [page.display_name for page in self.__pages]
+
     def add(self, page: Page):
         """ Add a page to the list of pages """
         self.__pages.append(page)
-        self.display_names.append(page.display_name)
+        self.__pages_by_hash[page.hash] = page
         self.hashes.append(page.hash)
 
+        if self.__pages_by_display_name is not None:
+            self.__pages_by_display_name.setdefault(page.display_name, page)
+
+    def remove(self, page_hash: str) -> Page:
+        """
+        Remove a page from the list of pages
+
+        Args:
+            page_hash (str): The hash of the page to remove.
+
+        Returns:
+            Page: The removed page
+
+        """
+        if page_hash not in self.__pages_by_hash:
+            raise IndexError(f"Hash {page_hash} not found in the list of hashes")
+
+        index = self.hashes.index(page_hash)
+        page = self.__pages.pop(index)
+        del self.hashes[index]
+        del self.__pages_by_hash[page_hash]
+        self.__pages_by_display_name = None
+
+        return page
+
+    def reorder(self, page_hashes: list[str]) -> None:
+        """
+        Reorder the pages to follow the given hashes
+
+        Args:
+            page_hashes (list[str]): The hashes of every page, in the expected order.
+
+        Returns:
+            None
+
+        """
+        if sorted(page_hashes) != sorted(self.hashes):
+            raise ValueError("Expected the hashes of every page when reordering pages")
+
+        self.__pages = [self.__pages_by_hash[page_hash] for page_hash in page_hashes]
+        self.hashes = list(page_hashes)
+        self.__pages_by_display_name = None
+
     def get_all_visuals(self) -> list[Union[VisualGroup, VisualShape, VisualType]]:
         """ Get all visuals from all pages """
         return [visual for page in self.__pages for visual in page.visuals]
 
     def get_all_visuals_by_type(self, visual_type: str) -> list[Union[VisualGroup, VisualShape, VisualType]]:
         """ Get all visuals of a specific type from all pages """
-        return [visual for page in self.__pages for visual in page.visuals if visual.type == visual_type]
+        return [visual for page in self.__pages for visual in page.visuals.get_by_type(visual_type)]
 
     def visual_occurrences_count(self) -> dict[str, int]:
         """
@@ -62,11 +149,8 @@ class Pages(object):
         """
         visual_occurrences = {}
         for page in self.__pages:
-            for visual in page.visuals:
-                if visual.visual_type not in visual_occurrences:
-                    visual_occurrences[visual.visual_type] = 1
-                else:
-                    visual_occurrences[visual.visual_type] += 1
+            for visual_type, count in page.visuals.count_by_type().items():
+                visual_occurrences[visual_type] = visual_occurrences.get(visual_type, 0) + count
 
         return visual_occurrences
 
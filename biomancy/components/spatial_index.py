@@ -0,0 +1,281 @@
+""" Module to represent a spatial index of the visuals on a PowerBI report page """
+import math
+
+from typing import Callable, Union
+
+from .visual_group import VisualGroup
+from .visual_shape import VisualShape
+from .visual_type import VisualType
+
+
+class SpatialIndex(object):
+    """
+    Class to represent a grid bucket index of the bounding boxes of the visuals on a PowerBI report page.
+
+    Every visual is registered in each grid cell its bounding box touches. The index observes the position of
+    every indexed visual and moves it between cells as soon as its geometry changes. Results are ordered top-most
+    first by `z`, nested visuals before the visual groups containing them.
+    """
+    DEFAULT_CELL_SIZE: float = 128.0
+
+    def __init__(self, visuals: list[Union[VisualGroup, VisualShape, VisualType]], cell_size: float = DEFAULT_CELL_SIZE):
+        """
+        Initialize the SpatialIndex object
+
+        Args:
+            visuals (list[Union[VisualGroup, VisualShape, VisualType]]): The visuals to index.
+            cell_size (float): The width and height of a grid cell.
+
+        """
+        self.cell_size: float = cell_size
+        self.__cells: dict[tuple[int, int], set[str]] = {}
+        self.__visuals: dict[str, Union[VisualGroup, VisualShape, VisualType]] = {}
+        self.__bounds: dict[str, tuple[float, float, float, float]] = {}
+        self.__observers: dict[str, Callable] = {}
+
+        for visual in visuals:
+            self.insert(visual)
+
+    def __len__(self):
+        return len(self.__visuals)
+
+    def __repr__(self):
+        return f'SpatialIndex({len(self.__visuals)})'
+
+    def __get_depth(self, visual: Union[VisualGroup, VisualShape, VisualType]) -> int:
+        depth = 0
+        seen = set()
+        parent_group_name = visual.parent_group_name
+
+        while parent_group_name in self.__visuals and parent_group_name not in seen:
+            seen.add(parent_group_name)
+            depth += 1
+            parent_group_name = self.__visuals[parent_group_name].parent_group_name
+
+        return depth
+
+    def __get_cells(self, bounds: tuple[float, float, float, float]) -> list[tuple[int, int]]:
+        left, top, right, bottom = bounds
+        return [
+            (column, row)
+            for column in range(math.floor(left / self.cell_size), math.floor(right / self.cell_size) + 1)
+            for row in range(math.floor(top / self.cell_size), math.floor(bottom / self.cell_size) + 1)
+        ]
+
+    def __sort(self, names: set[str]) -> list[Union[VisualGroup, VisualShape, VisualType]]:
+        visuals = [self.__visuals[name] for name in names]
+        return sorted(visuals, key=lambda visual: (-(visual.z or 0), -self.__get_depth(visual), visual.name))
+
+    def insert(self, visual: Union[VisualGroup, VisualShape, VisualType]) -> None:
+        """
+        Add a visual to the index and start following changes to its position
+
+        Args:
+            visual (Union[VisualGroup, VisualShape, VisualType]): The visual to add.
+
+        Returns:
+            None
+
+        """
+        if visual.name in self.__visuals:
+            self.remove(visual.name)
+
+        bounds = visual.position.bounds
+        self.__visuals[visual.name] = visual
+        self.__bounds[visual.name] = bounds
+
+        for cell in self.__get_cells(bounds):
+            self.__cells.setdefault(cell, set()).add(visual.name)
+
+        observer = self.__observers[visual.name] = lambda position, name=visual.name: self.update(name)
+        visual.position.observers.append(observer)
+
+    def remove(self, name: str) -> None:
+        """
+        Remove a visual from the index and stop following changes to its position
+
+        Args:
+            name (str): The name of the visual to remove.
+
+        Returns:
+            None
+
+        """
+        visual = self.__visuals.pop(name)
+
+        for cell in self.__get_cells(self.__bounds.pop(name)):
+            self.__cells[cell].discard(name)
+
+            if not self.__cells[cell]:
+                del self.__cells[cell]
+
+        observer = self.__observers.pop(name)
+        if observer in visual.position.observers:
+            visual.position.observers.remove(observer)
+
+    def update(self, name: str) -> None:
+        """
+        Move a visual to the cells matching its current position
+
+        Args:
+            name (str): The name of the visual to update.
+
+        Returns:
+            None
+
+        """
+        visual = self.__visuals[name]
+        previous_cells = set(self.__get_cells(self.__bounds[name]))
+        bounds = self.__bounds[name] = visual.position.bounds
+        cells = set(self.__get_cells(bounds))
+
+        for cell in previous_cells - cells:
+            self.__cells[cell].discard(name)
+
+            if not self.__cells[cell]:
+                del self.__cells[cell]
+
+        for cell in cells - previous_cells:
+            self.__cells.setdefault(cell, set()).add(name)
+
+    def close(self) -> None:
+        """
+        Stop following changes to the positions of every indexed visual
+
+        Returns:
+            None
+
+        """
+        for name in list(self.__visuals):
+            self.remove(name)
+
+    def at(self, x: float, y: float, include_groups: bool = False) -> list[Union[VisualGroup, VisualShape, VisualType]]:
+        """
+        Get the visuals under a point
+
+        Args:
+            x (float): The x-coordinate of the point.
+            y (float): The y-coordinate of the point.
+            include_groups (bool): Also return the visual groups under the point.
+
+        Returns:
+            list[Union[VisualGroup, VisualShape, VisualType]]: The visuals under the point, top-most first
+
+        """
+        cell = (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+        names = set()
+
+        for name in self.__cells.get(cell, ()):
+            left, top, right, bottom = self.__bounds[name]
+
+            if left <= x <= right and top <= y <= bottom:
+                if include_groups or not isinstance(self.__visuals[name], VisualGroup):
+                    names.add(name)
+
+        return self.__sort(names)
+
+    def within(self, x: float, y: float, width: float, height: float, contained: bool = False,
+               include_groups: bool = False) -> list[Union[VisualGroup, VisualShape, VisualType]]:
+        """
+        Get the visuals intersecting, or contained in, a rectangle
+
+        Args:
+            x (float): The x-coordinate of the rectangle.
+            y (float): The y-coordinate of the rectangle.
+            width (float): The width of the rectangle.
+            height (float): The height of the rectangle.
+            contained (bool): Only return visuals fully inside the rectangle.
+            include_groups (bool): Also return visual groups.
+
+        Returns:
+            list[Union[VisualGroup, VisualShape, VisualType]]: The matching visuals, top-most first
+
+        """
+        region = (x, y, x + width, y + height)
+        names = set()
+
+        for cell in self.__get_cells(region):
+            for name in self.__cells.get(cell, ()):
+                if name in names or not (include_groups or not isinstance(self.__visuals[name], VisualGroup)):
+                    continue
+
+                left, top, right, bottom = self.__bounds[name]
+
+                if contained:
+                    matches = left >= region[0] and top >= region[1] and right <= region[2] and bottom <= region[3]
+                else:
+                    matches = left <= region[2] and right >= region[0] and top <= region[3] and bottom >= region[1]
+
+                if matches:
+                    names.add(name)
+
+        return self.__sort(names)
+
+    def nearest(self, visual: Union[VisualGroup, VisualShape, VisualType], count: int = 1,
+                include_groups: bool = False) -> list[tuple[Union[VisualGroup, VisualShape, VisualType], float]]:
+        """
+        Get the visuals closest to a visual, searching grid rings outwards until no closer visual can exist
+
+        Args:
+            visual (Union[VisualGroup, VisualShape, VisualType]): The visual to search around.
+            count (int): The number of visuals to return.
+            include_groups (bool): Also return visual groups.
+
+        Returns:
+            list[tuple[Union[VisualGroup, VisualShape, VisualType], float]]: The closest visuals and the distance
+                between their bounding boxes, 0 when they touch or overlap
+
+        """
+        bounds = visual.position.bounds
+        left_column, top_row, right_column, bottom_row = (math.floor(value / self.cell_size) for value in bounds)
+        candidates: dict[str, float] = {}
+        ring = 0
+
+        if not self.__cells:
+            return []
+
+        max_ring = max(
+            max(abs(column - left_column), abs(column - right_column), abs(row - top_row), abs(row - bottom_row))
+            for column, row in self.__cells
+        )
+
+        while ring <= max_ring:
+            for column in range(left_column - ring, right_column + ring + 1):
+                for row in range(top_row - ring, bottom_row + ring + 1):
+                    on_ring = column in (left_column - ring, right_column + ring) or row in (top_row - ring, bottom_row + ring)
+                    if ring and not on_ring:
+                        continue
+
+                    for name in self.__cells.get((column, row), ()):
+                        other = self.__visuals[name]
+                        if name == visual.name or name in candidates or not (include_groups or not isinstance(other, VisualGroup)):
+                            continue
+
+                        candidates[name] = self.distance(bounds, self.__bounds[name])
+
+            closest = sorted(candidates.values())[:count]
+            if len(closest) == count and closest[-1] <= ring * self.cell_size:
+                break
+
+            ring += 1
+
+        names = sorted(candidates, key=lambda name: (candidates[name], name))[:count]
+        return [(self.__visuals[name], candidates[name]) for name in names]
+
+    @staticmethod
+    def distance(bounds: tuple[float, float, float, float], other_bounds: tuple[float, float, float, float]) -> float:
+        """
+        Get the distance between two bounding boxes
+
+        Args:
+            bounds (tuple[float, float, float, float]): The left, top, right and bottom of the first box.
+            other_bounds (tuple[float, float, float, float]): The left, top, right and bottom of the second box.
+
+        Returns:
+            float: The shortest distance between both boxes, 0 when they touch or overlap
+
+        """
+        horizontal = max(0.0, other_bounds[0] - bounds[2], bounds[0] - other_bounds[2])
+        vertical = max(0.0, other_bounds[1] - bounds[3], bounds[1] - other_bounds[3])
+
+        return math.hypot(horizontal, vertical)
@@ -1,11 +1,18 @@
 """ Module to represent the base class for all PowerBI visual constructs """
-from typing import Optional
+import os
+import sys
+
+from typing import Callable, Optional
 
 from .visual_position import VisualPosition
+from ..tools import write_json
+from ..tools.hashing import hash_visual_sections
 
 
 class VisualBase(object):
     """ Base class for PowerBI visual objects """
+    __slots__ = ('raw_data', 'directory_path', 'dirty', 'observers', '__hashes', 'name', 'schema', 'position')
+
     def __init__(self, data: dict, directory_path: Optional[str] = None):
         """
         Initialize the VisualBase object
@@ -18,14 +25,30 @@ class VisualBase(object):
         self.validate_required_fields(data)
         self.raw_data: dict = data
         self.directory_path: Optional[str] = directory_path
+        self.dirty: bool = False
+        self.observers: list[Callable[['VisualBase'], None]] = []
+        self.__hashes: Optional[dict[str, str]] = None
 
         self.name: str = data['name']
-        self.schema: str = data['$schema']
+        self.schema: str = sys.intern(data['$schema'])
+        data['$schema'] = self.schema
         self.position: VisualPosition = VisualPosition(data['position'])
+        self.position.observers.append(self.mark_dirty)
 
     def __repr__(self):
         return f"{self.__class__.__name__}({self.name})"
 
+    @property
+    def file_path(self) -> Optional[str]:
+        """
+        Get the path of the `visual.json` file of the visual
+
+        Returns:
+            Optional[str]: The path of the file, None when the visual was not read from a directory
+
+        """
+        return os.path.join(self.directory_path, 'visual.json') if self.directory_path else None
+
     @property
     def height(self) -> Optional[int]:
         """
@@ -115,6 +138,66 @@ class VisualBase(object):
         """
         return self.position.angle
 
+    @property
+    def hashes(self) -> dict[str, str]:
+        """
+        Get the content hashes of the visual, computed on first access and cleared when the visual is marked dirty
+
+        Returns:
+            dict[str, str]: The hashes of the `position`, `style` and `content` sections, and of the whole `visual`
+
+        """
+        if self.__hashes is None:
+            self.__hashes = hash_visual_sections(self.raw_data)
+
+        return self.__hashes
+
+    @property
+    def content_hash(self) -> str:
+        """
+        Get the hash of the whole raw data of the visual, independent of key order
+
+        Returns:
+            str: The hash of the visual
+
+        """
+        return self.hashes['visual']
+
+    def mark_dirty(self, *_) -> None:
+        """
+        Flag the visual as changed so that the next save writes its `visual.json`, and notify the observers.
+        Position changes flag the visual automatically, edits made directly to `raw_data` must be flagged by
+        calling this method.
+
+        Returns:
+            None
+
+        """
+        self.dirty = True
+        self.__hashes = None
+
+        for observer in self.observers:
+            observer(self)
+
+    def save(self) -> bool:
+        """
+        Write the raw data of the visual to its `visual.json` if it changed since it was read or last saved
+
+        Returns:
+            bool: True if the file was written, False otherwise
+
+        """
+        if not self.dirty:
+            return False
+
+        if self.file_path is None:
+            raise ValueError(f"Expected Structural Error || Visual {self.name} has no directory path to save to")
+
+        written = write_json(self.file_path, self.raw_data)
+        self.dirty = False
+
+        return written
+
     @staticmethod
     def validate_required_fields(data: dict) -> None:
         """
@@ -8,6 +8,8 @@ from .visual_type import VisualType
 
 class VisualGroup(VisualBase):
     """ Class to represent a visualGroup on a PowerBI report page """
+    __slots__ = ('display_name', 'group_mode', 'children', 'objects', 'type', 'parent_group_name')
+
     def __init__(self, data: dict, directory_path: Optional[str] = None):
         super().__init__(data, directory_path=directory_path)
         self.display_name: str = ''
@@ -44,8 +46,7 @@ class VisualGroup(VisualBase):
         self.display_name = visual_group['displayName']
         self.group_mode = visual_group['groupMode']
 
-        if 'objects' in visual_group:
-            self.objects = visual_group['objects']
+        self.objects = visual_group['objects'] if 'objects' in visual_group else {}
 
     def add(self, visual: Union[VisualShape, VisualType]) -> None:
         """
@@ -59,3 +60,19 @@ class VisualGroup(VisualBase):
 
         """
         self.children[visual.name] = visual
+
+    def mark_dirty(self, *_) -> None:
+        """
+        Flag the visual group as changed. Its properties are read again from `raw_data` before the observers are
+        notified, unless the required fields were removed, leaving invalid edits to the schema validation on save.
+
+        Returns:
+            None
+
+        """
+        visual_group = self.raw_data.get('visualGroup', {})
+
+        if 'displayName' in visual_group and 'groupMode' in visual_group:
+            self.__populate_properties()
+
+        super().mark_dirty()
@@ -3,21 +3,30 @@ from .visual_group import VisualGroup
 
 
 class VisualGroups(object):
-    """ Class to represent a collection of PowerBI visual groups """
+    """
+    Class to represent a collection of PowerBI visual groups.
+
+    Groups are indexed by hash name and by display name. When several groups share a display name, lookups by
+    that display name resolve to the first group added.
+    """
     def __init__(self):
         self.__groups: dict[str, VisualGroup] = {}
+        self.__groups_by_display_name: dict[str, VisualGroup] = {}
         self.hash_names: list[str] = []
         self.display_names: list[str] = []
 
+    def __contains__(self, item) -> bool:
+        return item in self.__groups
+
     def __getitem__(self, item):
         if isinstance(item, int):
             return self.__groups[self.hash_names[item]]
 
-        if item in self.hash_names:
+        if item in self.__groups:
             return self.__groups[item]
 
-        if item in self.display_names:
-            return self.__groups[self.hash_names[self.display_names.index(item)]]
+        if item in self.__groups_by_display_name:
+            return self.__groups_by_display_name[item]
 
         return self.__groups[item]
 
@@ -33,5 +42,6 @@ class VisualGroups(object):
     def add(self, group: VisualGroup):
         """ Add a visual group to the list of visual groups """
         self.__groups[group.name] = group
+        self.__groups_by_display_name.setdefault(group.display_name, group)
         self.display_names.append(group.display_name)
         self.hash_names.append(group.name)
@@ -1,48 +1,55 @@
 """ Module to represent the internal properties of a visual on a PowerBI report page """
+from typing import Optional
 
+from .object_sections import ObjectSections
 
-class VisualObjects(object):
-    """ Class to represent the internal properties of a visual on a PowerBI report page """
-    def __init__(self, data: dict):
-        self.raw_data: dict = data
 
-        self.shadow_custom = None
-        self.category_axis = None
-        self.zoom = None
-        self.image_scaling = None
-        self.y1_axis_reference_line = None
-        self.ribbon_bands = None
-        self.selection = None
-        self.spacing = None
-        self.data = None
-        self.error = None
-        self.labels = None
-        self.column_width = None
-        self.icon = None
-        self.label = None
-        self.outline = None
-        self.value = None
-        self.legend = None
-        self.map_controls = None
-        self.column_formatting = None
-        self.data_point = None
-        self.column_headers = None
-        self.bubble_layer = None
-        self.y2_axis = None
-        self.value_axis = None
-        self.shape_custom_rectangle = None
-        self.line_styles = None
-        self.image = None
-        self.padding = None
-        self.reference_line = None
-        self.items = None
-        self.indicator = None
-        self.selection_icon = None
-        self.header = None
-        self.markers = None
-        self.analysis = None
-        self.series_labels = None
-        self.tree = None
-        self.layout = None
-        self.general = None
-        self.fill_custom = None
+class VisualObjects(ObjectSections):
+    """
+    Class to represent the internal properties of a visual on a PowerBI report page. Every section is decoded on
+    first access from its first entry, each property with `decode_expression`.
+    """
+    __slots__ = ()
+
+    SECTIONS: dict[str, tuple[str, Optional[dict[str, str]]]] = {
+        'shadow_custom': ('shadowCustom', None),
+        'category_axis': ('categoryAxis', None),
+        'zoom': ('zoom', None),
+        'image_scaling': ('imageScaling', None),
+        'y1_axis_reference_line': ('y1AxisReferenceLine', None),
+        'ribbon_bands': ('ribbonBands', None),
+        'selection': ('selection', None),
+        'spacing': ('spacing', None),
+        'data': ('data', None),
+        'error': ('error', None),
+        'labels': ('labels', None),
+        'column_width': ('columnWidth', None),
+        'icon': ('icon', None),
+        'label': ('label', None),
+        'outline': ('outline', None),
+        'value': ('value', None),
+        'legend': ('legend', None),
+        'map_controls': ('mapControls', None),
+        'column_formatting': ('columnFormatting', None),
+        'data_point': ('dataPoint', None),
+        'column_headers': ('columnHeaders', None),
+        'bubble_layer': ('bubbleLayer', None),
+        'y2_axis': ('y2Axis', None),
+        'value_axis': ('valueAxis', None),
+        'shape_custom_rectangle': ('shapeCustomRectangle', None),
+        'line_styles': ('lineStyles', None),
+        'image': ('image', None),
+        'padding': ('padding', None),
+        'reference_line': ('referenceLine', None),
+        'items': ('items', None),
+        'indicator': ('indicator', None),
+        'selection_icon': ('selectionIcon', None),
+        'header': ('header', None),
+        'markers': ('markers', None),
+        'analysis': ('analysis', None),
+        'series_labels': ('seriesLabels', None),
+        'tree': ('tree', None),
+        'layout': ('layout', None),
+        'general': ('general', None),
+        'fill_custom': ('fillCustom', None),
+    }
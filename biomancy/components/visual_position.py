@@ -1,11 +1,25 @@
 """ Module to represent the position of a visual on a PowerBI report page """
-from typing import Optional
+import inspect
+import math
+
+from typing import Callable, Optional
 
 
 class VisualPosition(object):
-    """ Class to represent the position of a visual on a PowerBI report page """
+    """
+    Class to represent the position of a visual on a PowerBI report page. Observers are called after every change
+    to a position field, only the observers that are bound methods are kept when pickling.
+    """
+    __slots__ = ('observers', 'raw_data', 'height', 'width', 'x', 'y', 'z', 'tab_order', 'angle')
+
+    FIELDS: dict[str, str] = {
+        'height': 'height', 'width': 'width', 'x': 'x', 'y': 'y', 'z': 'z', 'tab_order': 'tabOrder', 'angle': 'angle'
+    }
+
     def __init__(self, data: dict):
         self.validate_required_fields(data)
+        self.observers: list[Callable[['VisualPosition'], None]] = []
+        self.raw_data: dict = data
 
         self.height: int = data['height']
         self.width: int = data['width']
@@ -16,6 +30,52 @@ class VisualPosition(object):
         self.tab_order: Optional[int] = data['tabOrder'] if 'tabOrder' in data else None
         self.angle: Optional[int] = data['angle'] if 'angle' in data else None
 
+    def __getstate__(self) -> dict:
+        state = {name: getattr(self, name) for name in self.__slots__}
+        state['observers'] = [observer for observer in self.observers if inspect.ismethod(observer)]
+
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        if name not in self.FIELDS:
+            object.__setattr__(self, name, value)
+            return
+
+        changed = getattr(self, name, value) != value
+        object.__setattr__(self, name, value)
+
+        if value is None:
+            self.raw_data.pop(self.FIELDS[name], None)
+        else:
+            self.raw_data[self.FIELDS[name]] = value
+
+        if changed:
+            for observer in list(self.observers):
+                observer(self)
+
+    @property
+    def bounds(self) -> tuple[float, float, float, float]:
+        """
+        Get the axis aligned bounding box of the visual, accounting for its rotation around its centre
+
+        Returns:
+            tuple[float, float, float, float]: The left, top, right and bottom coordinates
+
+        """
+        if not self.angle or self.angle % 180 == 0:
+            return self.x, self.y, self.x + self.width, self.y + self.height
+
+        radians = math.radians(self.angle)
+        rotated_width = abs(self.width * math.cos(radians)) + abs(self.height * math.sin(radians))
+        rotated_height = abs(self.width * math.sin(radians)) + abs(self.height * math.cos(radians))
+        centre_x, centre_y = self.x + self.width / 2, self.y + self.height / 2
+
+        return centre_x - rotated_width / 2, centre_y - rotated_height / 2, centre_x + rotated_width / 2, centre_y + rotated_height / 2
+
     @staticmethod
     def validate_required_fields(data: dict) -> None:
         """
@@ -1,18 +1,77 @@
+import sys
+
 from typing import Optional
 
 from .visual_base import VisualBase
+from .visual_objects import VisualObjects
 
 
 class VisualShape(VisualBase):
     """ Class to represent a visualType on a PowerBI report page """
+    __slots__ = ('visual_data', 'type', 'objects', 'drill_filter_other_visuals', 'parent_group_name', 'how_created',
+                 '__visual_objects')
+
     def __init__(self, data: dict, directory_path: Optional[str] = None):
         super().__init__(data, directory_path=directory_path)
-        self.visual_data: dict = self.raw_data['visual'] if 'visual' in self.raw_data else None
-        self.type: str = self.raw_data['visual']['visualType']
-        self.objects: Optional[dict[str: dict]] = self.visual_data['objects'] if 'objects' in self.visual_data else None
-        self.drill_filter_other_visuals: bool = self.visual_data['drillFilterOtherVisuals'] if 'drillFilterOtherVisuals' in self.visual_data else None
-        self.parent_group_name: Optional[str] = self.raw_data['parentGroupName'] if 'parentGroupName' in self.raw_data else None
-        self.how_created: str = self.raw_data['howCreated'] if 'howCreated' in self.raw_data else None
+        self.visual_data: Optional[dict] = None
+        self.type: str = data['visual']['visualType']
+        self.objects: Optional[dict[str: dict]] = None
+        self.drill_filter_other_visuals: Optional[bool] = None
+        self.parent_group_name: Optional[str] = None
+        self.how_created: Optional[str] = None
+        self.__visual_objects: Optional[VisualObjects] = None
+
+        self.__populate_properties()
 
     def __repr__(self):
         return f"VisualShape({self.type})"
+
+    @property
+    def visual_objects(self) -> VisualObjects:
+        """
+        Get the formatting objects of the shape, each section decoded on first access
+
+        Returns:
+            VisualObjects: The formatting objects of the shape, empty sections when not defined
+
+        """
+        if self.__visual_objects is None:
+            self.__visual_objects = VisualObjects(self.objects)
+
+        return self.__visual_objects
+
+    def __populate_properties(self) -> None:
+        """
+        Populate instance properties from the raw data, discarding the decoded formatting sections so they are
+        decoded again on access. The type is kept when `visualType` was removed, leaving invalid edits to the
+        schema validation on save.
+
+        Returns:
+            None
+
+        """
+        self.visual_data = self.raw_data.get('visual')
+        visual = self.visual_data if self.visual_data is not None else {}
+
+        if 'visualType' in visual:
+            self.type = sys.intern(visual['visualType'])
+            visual['visualType'] = self.type
+
+        self.objects = visual.get('objects')
+        self.drill_filter_other_visuals = visual.get('drillFilterOtherVisuals')
+        self.parent_group_name = self.raw_data.get('parentGroupName')
+        self.how_created = self.raw_data.get('howCreated')
+
+        if self.__visual_objects is not None:
+            self.__visual_objects.invalidate(self.objects if self.objects is not None else {})
+
+    def mark_dirty(self, *_) -> None:
+        """
+        Flag the shape as changed. Every property is read again from `raw_data` before the observers are notified.
+
+        Returns:
+            None
+
+        """
+        self.__populate_properties()
+        super().mark_dirty()
@@ -1,31 +1,34 @@
 """ Module to represent a visualType on a PowerBI report page """
+import sys
+
 from typing import Optional
 
 from .visual_base import VisualBase
 from .visual_container_objects import VisualContainerObjects
+from .visual_objects import VisualObjects
 
 
 class VisualType(VisualBase):
     """ Class to represent a visualType on a PowerBI report page """
+    __slots__ = (
+        'drill_filter_other_visuals', 'filterConfig', 'objects', 'parent_group_name', 'query', 'type',
+        'visual_container_objects', '__visual_objects'
+    )
+
+    next_object_properties: tuple[str, ...] = tuple(key for key, _ in VisualObjects.SECTIONS.values())
+
     def __init__(self, data: dict, directory_path: Optional[str] = None):
         super().__init__(data, directory_path=directory_path)
-        self.drill_filter_other_visuals: bool = data['visual']['drillFilterOtherVisuals'] if 'drillFilterOtherVisuals' in data['visual'] else None
-        self.filterConfig: dict = self.raw_data['filterConfig'] if 'filterConfig' in self.raw_data else None
-        self.objects: Optional[dict[str: dict]] = data['visual']['objects'] if 'objects' in data['visual'] else None
-        self.parent_group_name: Optional[str] = self.raw_data['parentGroupName'] if 'parentGroupName' in self.raw_data else None
-        self.query: dict = data['visual']['query'] if 'query' in data['visual'] else None
+        self.drill_filter_other_visuals: Optional[bool] = None
+        self.filterConfig: Optional[dict] = None
+        self.objects: Optional[dict[str: dict]] = None
+        self.parent_group_name: Optional[str] = None
+        self.query: Optional[dict] = None
         self.type: str = data['visual']['visualType']
-        self.visual_container_objects: VisualContainerObjects = VisualContainerObjects(data['visual']['visualContainerObjects']) if 'visualContainerObjects' in data['visual'] else None
-
-        self.next_object_properties = [
-            'shadowCustom', 'categoryAxis', 'zoom', 'imageScaling', 'y1AxisReferenceLine',
-            'ribbonBands', 'selection', 'spacing', 'data', 'error', 'labels', 'columnWidth', 'icon',
-            'label', 'outline', 'value', 'legend', 'mapControls', 'columnFormatting', 'dataPoint',
-            'columnHeaders', 'bubbleLayer', 'y2Axis', 'valueAxis', 'shapeCustomRectangle',
-            'lineStyles', 'image', 'padding', 'referenceLine', 'items', 'indicator', 'selectionIcon',
-            'header', 'markers', 'analysis', 'seriesLabels', 'tree', 'layout', 'general',
-            'fillCustom'
-        ]
+        self.visual_container_objects: Optional[VisualContainerObjects] = None
+        self.__visual_objects: Optional[VisualObjects] = None
+
+        self.__populate_properties()
 
     def __contains__(self, item):
         return item in self.__dict__()
@@ -43,3 +46,62 @@ class VisualType(VisualBase):
 
     def __repr__(self):
         return f"VisualType({self.type})"
+
+    @property
+    def visual_objects(self) -> VisualObjects:
+        """
+        Get the formatting objects of the visual, each section decoded on first access
+
+        Returns:
+            VisualObjects: The formatting objects of the visual, empty sections when not defined
+
+        """
+        if self.__visual_objects is None:
+            self.__visual_objects = VisualObjects(self.objects)
+
+        return self.__visual_objects
+
+    def __populate_properties(self) -> None:
+        """
+        Populate instance properties from the raw data, discarding the decoded formatting sections so they are
+        decoded again on access. The type is kept when `visualType` was removed, leaving invalid edits to the
+        schema validation on save.
+
+        Returns:
+            None
+
+        """
+        visual = self.raw_data.get('visual', {})
+        self.drill_filter_other_visuals = visual.get('drillFilterOtherVisuals')
+        self.filterConfig = self.raw_data.get('filterConfig')
+        self.objects = visual.get('objects')
+        self.parent_group_name = self.raw_data.get('parentGroupName')
+        self.query = visual.get('query')
+
+        if 'visualType' in visual:
+            self.type = sys.intern(visual['visualType'])
+            visual['visualType'] = self.type
+
+        if self.__visual_objects is not None:
+            self.__visual_objects.invalidate(self.objects if self.objects is not None else {})
+
+        container_objects = visual.get('visualContainerObjects')
+
+        if container_objects is None:
+            self.visual_container_objects = None
+        elif self.visual_container_objects is None:
+            self.visual_container_objects = VisualContainerObjects(container_objects)
+        else:
+            self.visual_container_objects.invalidate(container_objects)
+
+    def mark_dirty(self, *_) -> None:
+        """
+        Flag the visual as changed. Every property is read again from `raw_data` before the observers are
+        notified, so they see the new `type`, `parent_group_name`, `query` and formatting sections.
+
+        Returns:
+            None
+
+        """
+        self.__populate_properties()
+        super().mark_dirty()
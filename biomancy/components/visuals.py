@@ -1,19 +1,29 @@
 """ Module to represent a collection of PowerBI visuals """
-import json
 import os
 
-from typing import Union
+from typing import Optional, Union
 
 from .visual_group import VisualGroup
 from .visual_shape import VisualShape
 from .visual_type import VisualType
+from ..parse_cache import ParseCache
+from ..tools import read_json
 
 
 class Visuals(object):
-    """ Class to represent a collection of PowerBI visuals """
-    def __init__(self):
+    """
+    Class to represent a collection of PowerBI visuals.
+
+    Visuals are indexed by hash, by position and by type. The collection observes its visuals, so a visual whose
+    `type` changed when it was marked dirty is moved to the per-type list of its new type.
+    """
+    def __init__(self, cache: Optional[ParseCache] = None):
+        self.cache: Optional[ParseCache] = cache
         self.ordered_visuals: list[Union[VisualType, VisualShape, VisualGroup]] = []
         self.hashes: list[str] = []
+        self.__visuals_by_hash: dict[str, Union[VisualType, VisualShape, VisualGroup]] = {}
+        self.__positions: dict[str, int] = {}
+        self.__visuals_by_type: dict[str, list[Union[VisualType, VisualShape, VisualGroup]]] = {}
 
     def __getitem__(self, item):
         return self.ordered_visuals[item]
@@ -28,16 +38,32 @@ class Visuals(object):
         return f"Visuals({len(self.ordered_visuals)})"
 
     @staticmethod
-    def __init_visual_from_directory(directory_path: str) -> Union[VisualType, VisualShape, VisualGroup]:
+    def __init_visual_from_directory(directory_path: str, cache: Optional[ParseCache] = None) -> Union[VisualType, VisualShape, VisualGroup]:
         """
         Read the JSON file and populate the raw_data property
 
         Args:
             directory_path (str): the directory path which contains the PowerBI JSON file.
+            cache (Optional[ParseCache]): The parse cache to serve unchanged files from.
 
         Returns:
             None
 
+        """
+        return Visuals.create_visual(Visuals.read_visual_json(directory_path, cache=cache), directory_path)
+
+    @staticmethod
+    def read_visual_json(directory_path: str, cache: Optional[ParseCache] = None) -> dict:
+        """
+        Read and parse the `visual.json` file of a visual directory
+
+        Args:
+            directory_path (str): the directory path which contains the PowerBI JSON file.
+            cache (Optional[ParseCache]): The parse cache to serve unchanged files from.
+
+        Returns:
+            dict: The parsed content of the `visual.json` file
+
         """
         file_path = os.path.join(directory_path, 'visual.json')
 
@@ -45,38 +71,219 @@ class Visuals(object):
             raise FileNotFoundError(
                 f"Expected Structural Error || `visual.json` expected at {file_path}, not found")
 
-        with open(file_path) as visual_json_file:
-            data = json.load(visual_json_file)
+        if cache:
+            return cache.read_json(file_path)
+
+        return read_json(file_path)
+
+    @staticmethod
+    def create_visual(data: dict, directory_path: Optional[str] = None) -> Union[VisualType, VisualShape, VisualGroup]:
+        """
+        Construct the matching visual object from the parsed content of a `visual.json` file
+
+        Args:
+            data (dict): The parsed content of the `visual.json` file.
+            directory_path (Optional[str]): the directory path which contains the PowerBI JSON file.
+
+        Returns:
+            Union[VisualType, VisualShape, VisualGroup]: The constructed visual object
+
+        """
+        if 'visualGroup' in data:
+            return VisualGroup(data, directory_path=directory_path)
+        elif 'visual' in data:
+            if data['visual']['visualType'] == 'shape':
+                return VisualShape(data, directory_path=directory_path)
+            else:
+                return VisualType(data, directory_path=directory_path)
+        else:
+            raise ValueError(f'Expected Visual Type || `visual` or `visualGroup` not found when constructing *Visual Object, inspect raw data -- {data}.')
+
+    def __find_type_index(self, visuals_of_type: list[Union[VisualType, VisualShape, VisualGroup]], position: int) -> int:
+        """ Binary search the index of a position in a per-type list, which is kept in loading order """
+        low, high = 0, len(visuals_of_type)
 
-            if 'visualGroup' in data:
-                return VisualGroup(data, directory_path=directory_path)
-            elif 'visual' in data:
-                if data['visual']['visualType'] == 'shape':
-                    return VisualShape(data, directory_path=directory_path)
-                else:
-                    return VisualType(data, directory_path=directory_path)
+        while low < high:
+            middle = (low + high) // 2
+
+            if self.__positions[visuals_of_type[middle].name] < position:
+                low = middle + 1
             else:
-                raise ValueError(f'Expected Visual Type || `visual` or `visualGroup` not found when constructing *Visual Object, inspect raw data -- {data}.')
+                high = middle
+
+        return low
+
+    def __index_type(self, visual: Union[VisualType, VisualShape, VisualGroup], position: int) -> None:
+        visuals_of_type = self.__visuals_by_type.setdefault(visual.type, [])
+        visuals_of_type.insert(self.__find_type_index(visuals_of_type, position), visual)
+
+    def __unindex_type(self, visual: Union[VisualType, VisualShape, VisualGroup], position: int) -> None:
+        visuals_of_type = self.__visuals_by_type[visual.type]
+        del visuals_of_type[self.__find_type_index(visuals_of_type, position)]
+
+        if not visuals_of_type:
+            del self.__visuals_by_type[visual.type]
+
+    def update_type_index(self, visual: Union[VisualType, VisualShape, VisualGroup]) -> None:
+        """
+        Move a visual to the per-type list of its current type, called whenever one of the visuals is marked dirty
+
+        Args:
+            visual (Union[VisualType, VisualShape, VisualGroup]): The visual that changed.
+
+        Returns:
+            None
+
+        """
+        position = self.__positions.get(visual.name)
+
+        if position is None or self.ordered_visuals[position] is not visual:
+            return
+
+        visuals_of_type = self.__visuals_by_type.get(visual.type, [])
+        index = self.__find_type_index(visuals_of_type, position)
+
+        if index < len(visuals_of_type) and visuals_of_type[index] is visual:
+            return
+
+        for previous_type, visuals_of_type in self.__visuals_by_type.items():
+            index = self.__find_type_index(visuals_of_type, position)
+
+            if index < len(visuals_of_type) and visuals_of_type[index] is visual:
+                del visuals_of_type[index]
+
+                if not visuals_of_type:
+                    del self.__visuals_by_type[previous_type]
+                break
+
+        self.__index_type(visual, position)
 
     def get_unique_types(self) -> list[str]:
         """ Get a list of unique visual types """
-        return list(set(visual.type for visual in self.ordered_visuals))
+        return list(self.__visuals_by_type)
+
+    def get_by_type(self, visual_type: str) -> list[Union[VisualType, VisualShape, VisualGroup]]:
+        """
+        Get all visuals of a specific type
 
-    def add(self, visual_path: str) -> Union[VisualType, VisualShape, VisualGroup]:
-        """ Add a visual to the list of visuals """
-        visual = self.__init_visual_from_directory(visual_path)
+        Args:
+            visual_type (str): The type of visual to search for.
+
+        Returns:
+            list[Union[VisualType, VisualShape, VisualGroup]]: The visuals of the type, in loading order
+
+        """
+        return list(self.__visuals_by_type.get(visual_type, []))
+
+    def count_by_type(self) -> dict[str, int]:
+        """
+        Count the number of visuals of each type
+
+        Returns:
+            dict[str, int]: The number of visuals keyed by visual type
+
+        """
+        return {visual_type: len(visuals) for visual_type, visuals in self.__visuals_by_type.items()}
+
+    def add(self, visual_path: str, data: Optional[dict] = None) -> Union[VisualType, VisualShape, VisualGroup]:
+        """
+        Add a visual to the list of visuals
+
+        Args:
+            visual_path (str): the directory path which contains the PowerBI JSON file.
+            data (Optional[dict]): Already parsed content of the `visual.json` file, read from disk when not given.
+
+        Returns:
+            Union[VisualType, VisualShape, VisualGroup]: The added visual object
+
+        """
+        if data is None:
+            visual = self.__init_visual_from_directory(visual_path, cache=self.cache)
+        else:
+            visual = self.create_visual(data, visual_path)
 
         if not visual:
             raise ValueError(f"Expected Structural Error || Visual object not created for {visual_path}")
 
         self.ordered_visuals.append(visual)
         self.hashes.append(visual.name)
+        self.__visuals_by_hash[visual.name] = visual
+        self.__positions[visual.name] = len(self.hashes) - 1
+        self.__index_type(visual, len(self.hashes) - 1)
+        visual.observers.append(self.update_type_index)
+
+        return visual
+
+    def remove(self, hash_value: str) -> Union[VisualType, VisualShape, VisualGroup]:
+        """
+        Remove a visual from the list of visuals
+
+        Args:
+            hash_value (str): The hash of the visual to remove.
+
+        Returns:
+            Union[VisualType, VisualShape, VisualGroup]: The removed visual object
+
+        """
+        visual = self.get_by_hash(hash_value)
+        index = self.__positions[hash_value]
+        self.__unindex_type(visual, index)
+
+        del self.ordered_visuals[index]
+        del self.hashes[index]
+        del self.__visuals_by_hash[hash_value]
+        del self.__positions[hash_value]
+
+        for position in range(index, len(self.hashes)):
+            self.__positions[self.hashes[position]] = position
+
+        return visual
+
+    def replace(self, hash_value: str, visual_path: str, data: Optional[dict] = None) -> Union[VisualType, VisualShape, VisualGroup]:
+        """
+        Replace a visual by re-reading it from disk, keeping its position in the list of visuals and in the
+        per-type lists, so `get_by_type` stays in loading order
+
+        Args:
+            hash_value (str): The hash of the visual to replace.
+            visual_path (str): the directory path which contains the PowerBI JSON file.
+            data (Optional[dict]): Content to build the new visual from instead of reading the `visual.json` file.
+
+        Returns:
+            Union[VisualType, VisualShape, VisualGroup]: The new visual object
+
+        """
+        previous_visual = self.get_by_hash(hash_value)
+        index = self.__positions[hash_value]
+
+        if data is None:
+            visual = self.__init_visual_from_directory(visual_path, cache=self.cache)
+        else:
+            visual = self.create_visual(data, visual_path)
+
+        if visual.type == previous_visual.type:
+            visuals_of_type = self.__visuals_by_type[visual.type]
+            visuals_of_type[self.__find_type_index(visuals_of_type, index)] = visual
+        else:
+            self.__unindex_type(previous_visual, index)
+
+        self.ordered_visuals[index] = visual
+        self.hashes[index] = visual.name
+        del self.__visuals_by_hash[hash_value]
+        self.__visuals_by_hash[visual.name] = visual
+        del self.__positions[hash_value]
+        self.__positions[visual.name] = index
+
+        if visual.type != previous_visual.type:
+            self.__index_type(visual, index)
+
+        visual.observers.append(self.update_type_index)
 
         return visual
 
     def get_by_hash(self, hash_value: str) -> Union[VisualType, VisualShape, VisualGroup]:
         """ Get a visual by its hash """
-        if hash_value not in self.hashes:
+        if hash_value not in self.__visuals_by_hash:
             raise IndexError(f"Hash {hash_value} not found in the list of hashes")
 
-        return self.ordered_visuals[self.hashes.index(hash_value)]
+        return self.__visuals_by_hash[hash_value]
@@ -0,0 +1,350 @@
+""" Module to index a corpus of PBIP reports into a SQLite database for cross-report queries """
+import os
+import sqlite3
+
+from typing import Any, Optional
+
+from biomancy.components import Page
+from biomancy.fields import extract_field_references
+from biomancy.fleet import discover
+from biomancy.streaming import get_path
+from biomancy.tools import read_json
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS reports (
+    report_path TEXT PRIMARY KEY,
+    page_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    report_path TEXT NOT NULL,
+    page_hash TEXT NOT NULL,
+    ordinal INTEGER NOT NULL,
+    display_name TEXT,
+    width REAL,
+    height REAL,
+    PRIMARY KEY (report_path, page_hash)
+);
+CREATE TABLE IF NOT EXISTS visuals (
+    report_path TEXT NOT NULL,
+    page_hash TEXT NOT NULL,
+    name TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    type TEXT,
+    x REAL,
+    y REAL,
+    z INTEGER,
+    width REAL,
+    height REAL,
+    tab_order INTEGER,
+    angle REAL,
+    parent_group_name TEXT,
+    drill_filter_other_visuals INTEGER,
+    border_show TEXT,
+    title_show TEXT,
+    title_text TEXT,
+    background_show TEXT,
+    PRIMARY KEY (report_path, page_hash, name)
+);
+CREATE INDEX IF NOT EXISTS visuals_type ON visuals (type);
+CREATE INDEX IF NOT EXISTS visuals_file_path ON visuals (file_path);
+CREATE TABLE IF NOT EXISTS field_references (
+    report_path TEXT NOT NULL,
+    page_hash TEXT NOT NULL,
+    visual_name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    entity TEXT NOT NULL,
+    property TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS field_references_field ON field_references (entity, property);
+CREATE INDEX IF NOT EXISTS field_references_visual ON field_references (report_path, page_hash, visual_name);
+"""
+
+CONTAINER_LITERALS: dict[str, str] = {
+    'border_show': 'visual.visualContainerObjects.border.0.properties.show.expr.Literal.Value',
+    'title_show': 'visual.visualContainerObjects.title.0.properties.show.expr.Literal.Value',
+    'title_text': 'visual.visualContainerObjects.title.0.properties.text.expr.Literal.Value',
+    'background_show': 'visual.visualContainerObjects.background.0.properties.show.expr.Literal.Value',
+}
+
+
+class CorpusIndex(object):
+    """
+    Class to represent a SQLite index of the pages, visuals and field references of many reports.
+
+    Indexing is incremental, every `page.json` and `visual.json` is only parsed again when its modification time
+    or size changed since it was last indexed. Container settings are stored as their raw literal values, e.g.
+    `'true'` or `"'Title'"`.
+    """
+    def __init__(self, database_path: str = ':memory:'):
+        """
+        Initialize the CorpusIndex object
+
+        Args:
+            database_path (str): The path of the SQLite database, created when missing.
+
+        """
+        self.database_path: str = database_path
+        self.connection: sqlite3.Connection = sqlite3.connect(database_path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __repr__(self):
+        return f'CorpusIndex({self.database_path})'
+
+    def close(self) -> None:
+        """
+        Close the database connection
+
+        Returns:
+            None
+
+        """
+        self.connection.close()
+
+    def __is_unchanged(self, file_path: str) -> bool:
+        stat = os.stat(file_path)
+        row = self.connection.execute('SELECT mtime_ns, size FROM files WHERE path = ?', (file_path,)).fetchone()
+
+        if row is not None and row['mtime_ns'] == stat.st_mtime_ns and row['size'] == stat.st_size:
+            return True
+
+        self.connection.execute(
+            'INSERT OR REPLACE INTO files (path, mtime_ns, size) VALUES (?, ?, ?)',
+            (file_path, stat.st_mtime_ns, stat.st_size)
+        )
+        return False
+
+    def __delete_visual(self, report_path: str, page_hash: str, name: str, file_path: str) -> None:
+        self.connection.execute('DELETE FROM visuals WHERE report_path = ? AND page_hash = ? AND name = ?', (report_path, page_hash, name))
+        self.connection.execute(
+            'DELETE FROM field_references WHERE report_path = ? AND page_hash = ? AND visual_name = ?', (report_path, page_hash, name)
+        )
+        self.connection.execute('DELETE FROM files WHERE path = ?', (file_path,))
+
+    def __delete_page(self, report_path: str, page_hash: str) -> None:
+        for row in self.connection.execute(
+                'SELECT name, file_path FROM visuals WHERE report_path = ? AND page_hash = ?', (report_path, page_hash)).fetchall():
+            self.__delete_visual(report_path, page_hash, row['name'], row['file_path'])
+
+        self.connection.execute('DELETE FROM pages WHERE report_path = ? AND page_hash = ?', (report_path, page_hash))
+        self.connection.execute('DELETE FROM files WHERE path = ?', (os.path.join(report_path, page_hash, 'page.json'),))
+
+    def __index_visual(self, report_path: str, page_hash: str, file_path: str) -> None:
+        data = read_json(file_path)
+        name = data.get('name')
+
+        for row in self.connection.execute('SELECT page_hash, name FROM visuals WHERE file_path = ?', (file_path,)).fetchall():
+            self.connection.execute('DELETE FROM visuals WHERE report_path = ? AND page_hash = ? AND name = ?', (report_path, row['page_hash'], row['name']))
+            self.connection.execute(
+                'DELETE FROM field_references WHERE report_path = ? AND page_hash = ? AND visual_name = ?',
+                (report_path, row['page_hash'], row['name'])
+            )
+
+        drill_filter_other_visuals = get_path(data, 'visual.drillFilterOtherVisuals')
+        self.connection.execute(
+            'INSERT OR REPLACE INTO visuals VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (
+                report_path, page_hash, name, file_path,
+                'visualGroup' if 'visualGroup' in data else get_path(data, 'visual.visualType'),
+                get_path(data, 'position.x'), get_path(data, 'position.y'), get_path(data, 'position.z'),
+                get_path(data, 'position.width'), get_path(data, 'position.height'),
+                get_path(data, 'position.tabOrder'), get_path(data, 'position.angle'),
+                data.get('parentGroupName'),
+                None if drill_filter_other_visuals is None else int(drill_filter_other_visuals),
+                *(get_path(data, path) for path in CONTAINER_LITERALS.values()),
+            )
+        )
+
+        references = extract_field_references([get_path(data, 'visual.query'), data.get('filterConfig')])
+        self.connection.executemany(
+            'INSERT INTO field_references VALUES (?, ?, ?, ?, ?, ?)',
+            [(report_path, page_hash, name, kind, entity, field) for kind, entity, field in references]
+        )
+
+    def __index_page(self, report_path: str, page_hash: str, ordinal: int) -> dict[str, int]:
+        counts = {'visuals_indexed': 0, 'visuals_removed': 0}
+        page = Page(os.path.join(report_path, page_hash), lazy=True)
+
+        if not self.__is_unchanged(page.file_path):
+            raw_data = page.raw_data
+            self.connection.execute(
+                'INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?)',
+                (report_path, page_hash, ordinal, raw_data.get('displayName', ''), raw_data.get('width'), raw_data.get('height'))
+            )
+        else:
+            self.connection.execute('UPDATE pages SET ordinal = ? WHERE report_path = ? AND page_hash = ?', (ordinal, report_path, page_hash))
+
+        visual_file_paths = {
+            file_path for file_path in (os.path.join(visual_path, 'visual.json') for visual_path in page.get_visual_paths())
+            if os.path.exists(file_path)
+        }
+
+        for row in self.connection.execute(
+                'SELECT name, file_path FROM visuals WHERE report_path = ? AND page_hash = ?', (report_path, page_hash)).fetchall():
+            if row['file_path'] not in visual_file_paths:
+                self.__delete_visual(report_path, page_hash, row['name'], row['file_path'])
+                counts['visuals_removed'] += 1
+
+        for file_path in sorted(visual_file_paths):
+            if not self.__is_unchanged(file_path):
+                self.__index_visual(report_path, page_hash, file_path)
+                counts['visuals_indexed'] += 1
+
+        return counts
+
+    def index_report(self, report_path: str) -> dict[str, int]:
+        """
+        Index or update a single report in one transaction
+
+        Args:
+            report_path (str): The directory path of the report containing `pages.json`.
+
+        Returns:
+            dict[str, int]: The number of `visuals_indexed`, `visuals_removed` and `pages_removed`
+
+        """
+        report_path = os.path.abspath(report_path)
+        counts = {'visuals_indexed': 0, 'visuals_removed': 0, 'pages_removed': 0}
+
+        with self.connection:
+            page_order = read_json(os.path.join(report_path, 'pages.json'))['pageOrder']
+
+            for row in self.connection.execute('SELECT page_hash FROM pages WHERE report_path = ?', (report_path,)).fetchall():
+                if row['page_hash'] not in page_order:
+                    self.__delete_page(report_path, row['page_hash'])
+                    counts['pages_removed'] += 1
+
+            for ordinal, page_hash in enumerate(page_order):
+                for key, count in self.__index_page(report_path, page_hash, ordinal).items():
+                    counts[key] += count
+
+            self.connection.execute('INSERT OR REPLACE INTO reports VALUES (?, ?)', (report_path, len(page_order)))
+
+        return counts
+
+    def index_fleet(self, root: str, pattern: str = '**/*.Report/definition') -> dict[str, Any]:
+        """
+        Index or update every report under a root directory, dropping indexed reports that no longer exist. A
+        report that is missing files or holds invalid JSON is recorded under `failures` and left as it was indexed
+        before, any other error is raised.
+
+        Args:
+            root (str): The directory to search in.
+            pattern (str): The glob pattern of the report definition directories, relative to the root.
+
+        Returns:
+            dict[str, Any]: The per-report counts of `index_report` keyed by report path, and the error message of
+                every report that failed to index under `failures`
+
+        """
+        summary = {'reports': {}, 'failures': {}}
+        report_paths = [os.path.abspath(path) for path in discover(root, pattern)]
+        root_path = os.path.abspath(root)
+
+        for row in self.connection.execute('SELECT report_path FROM reports').fetchall():
+            if row['report_path'].startswith(root_path + os.sep) and row['report_path'] not in report_paths:
+                self.remove_report(row['report_path'])
+
+        for report_path in report_paths:
+            try:
+                summary['reports'][report_path] = self.index_report(report_path)
+            except (OSError, ValueError, KeyError) as error:
+                summary['failures'][report_path] = repr(error)
+
+        return summary
+
+    def remove_report(self, report_path: str) -> None:
+        """
+        Remove a report and everything indexed for it
+
+        Args:
+            report_path (str): The directory path of the report containing `pages.json`.
+
+        Returns:
+            None
+
+        """
+        report_path = os.path.abspath(report_path)
+
+        with self.connection:
+            for row in self.connection.execute('SELECT page_hash FROM pages WHERE report_path = ?', (report_path,)).fetchall():
+                self.__delete_page(report_path, row['page_hash'])
+
+            self.connection.execute('DELETE FROM reports WHERE report_path = ?', (report_path,))
+
+    def query(self, sql: str, parameters: tuple = ()) -> list[dict[str, Any]]:
+        """
+        Run a read query against the index
+
+        Args:
+            sql (str): The SQL query, over the `reports`, `pages`, `visuals` and `field_references` tables.
+            parameters (tuple): The query parameters.
+
+        Returns:
+            list[dict[str, Any]]: The resulting rows
+
+        """
+        return [dict(row) for row in self.connection.execute(sql, parameters).fetchall()]
+
+    def visual_type_counts(self) -> dict[str, int]:
+        """
+        Count the visuals of each type across every indexed report
+
+        Returns:
+            dict[str, int]: The number of visuals keyed by visual type
+
+        """
+        rows = self.connection.execute('SELECT type, COUNT(*) AS count FROM visuals GROUP BY type ORDER BY count DESC')
+        return {row['type']: row['count'] for row in rows}
+
+    def reports_using_type(self, visual_type: str) -> list[str]:
+        """
+        Get the reports containing at least one visual of a type
+
+        Args:
+            visual_type (str): The visual type, e.g. a custom visual identifier.
+
+        Returns:
+            list[str]: The report paths
+
+        """
+        rows = self.connection.execute('SELECT DISTINCT report_path FROM visuals WHERE type = ? ORDER BY report_path', (visual_type,))
+        return [row['report_path'] for row in rows]
+
+    def visuals_referencing(self, entity: str, field: Optional[str] = None) -> list[dict[str, Any]]:
+        """
+        Get the visuals whose query or filters reference a table, or a column or measure of it
+
+        Args:
+            entity (str): The table name.
+            field (Optional[str]): The column or measure name, any field of the table when None.
+
+        Returns:
+            list[dict[str, Any]]: The `report_path`, `page_hash`, `visual_name`, `type`, `kind` and `property` of
+                every reference
+
+        """
+        sql = (
+            'SELECT DISTINCT r.report_path, r.page_hash, r.visual_name, v.type, r.kind, r.property '
+            'FROM field_references r JOIN visuals v '
+            'ON v.report_path = r.report_path AND v.page_hash = r.page_hash AND v.name = r.visual_name '
+            'WHERE r.entity = ?'
+        )
+        parameters = (entity,)
+
+        if field is not None:
+            sql += ' AND r.property = ?'
+            parameters += (field,)
+
+        return self.query(sql + ' ORDER BY r.report_path, r.page_hash, r.visual_name', parameters)
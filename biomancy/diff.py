@@ -0,0 +1,75 @@
+""" Module to compare two versions of a PowerBI report """
+from biomancy.components import Page
+from biomancy.tools.hashing import hash_json
+
+CHANGE_SECTIONS: dict[str, str] = {'moved': 'position', 'restyled': 'style', 'modified': 'content'}
+
+
+def diff_pages(page: Page, other: Page) -> dict[str, object]:
+    """
+    Compare the visuals of two versions of a page by their content hashes
+
+    Args:
+        page (Page): The original version of the page.
+        other (Page): The new version of the page.
+
+    Returns:
+        dict[str, object]: `page_modified` when `page.json` changed, and the names of the `added` and `removed`
+            visuals, of the visuals `moved` or resized, `restyled` through their formatting objects, or otherwise
+            `modified`. A visual is listed under every kind of change it went through.
+
+    """
+    summary = {'page_modified': hash_json(page.raw_data) != hash_json(other.raw_data), 'added': [], 'removed': []}
+    summary.update({change: [] for change in CHANGE_SECTIONS})
+
+    visuals = {visual.name: visual for visual in page.visuals}
+    other_visuals = {visual.name: visual for visual in other.visuals}
+
+    summary['added'] = [name for name in other_visuals if name not in visuals]
+    summary['removed'] = [name for name in visuals if name not in other_visuals]
+
+    for name, visual in visuals.items():
+        other_visual = other_visuals.get(name)
+
+        if other_visual is None or visual.content_hash == other_visual.content_hash:
+            continue
+
+        for change, section in CHANGE_SECTIONS.items():
+            if visual.hashes[section] != other_visual.hashes[section]:
+                summary[change].append(name)
+
+    return summary
+
+
+def diff_reports(report, other) -> dict:
+    """
+    Compare two versions of a report, skipping every page whose Merkle hash is identical in both
+
+    Args:
+        report (Report): The original version of the report.
+        other (Report): The new version of the report.
+
+    Returns:
+        dict: `pages_added` and `pages_removed` hashes, `pages_reordered`, and the `diff_pages` summary of every
+            page that changed under `pages`
+
+    """
+    summary = {
+        'pages_added': [page_hash for page_hash in other.pages.hashes if page_hash not in report.pages.hashes],
+        'pages_removed': [page_hash for page_hash in report.pages.hashes if page_hash not in other.pages.hashes],
+        'pages_reordered': False,
+        'pages': {},
+    }
+
+    common_order = [page_hash for page_hash in report.pages.hashes if page_hash in other.pages.hashes]
+    summary['pages_reordered'] = common_order != [page_hash for page_hash in other.pages.hashes if page_hash in report.pages.hashes]
+
+    for page_hash in common_order:
+        page, other_page = report.pages[page_hash], other.pages[page_hash]
+
+        if page.content_hash == other_page.content_hash:
+            continue
+
+        summary['pages'][page_hash] = diff_pages(page, other_page)
+
+    return summary
@@ -0,0 +1,147 @@
+""" Module to index the semantic model fields referenced by the pages and visuals of a PowerBI report """
+from typing import Optional, Union
+
+from biomancy.components import Page, Pages, VisualGroup, VisualShape, VisualType
+from biomancy.fields import iter_field_references
+
+
+class FieldIndex(object):
+    """
+    Class to represent an inverted index from the semantic model fields referenced by a report to the pages and
+    visuals referencing them.
+
+    The index is built in a single pass over the `query` and `filterConfig` of every visual and the `filterConfig`
+    of every page. Fields are `(kind, table, name)` tuples, kind being `Column`, `Measure` or `HierarchyLevel`.
+    """
+    def __init__(self, pages: Pages):
+        """
+        Initialize the FieldIndex object
+
+        Args:
+            pages (Pages): The pages to index.
+
+        """
+        self.pages: Pages = pages
+
+        self.__visuals_by_field: dict[tuple[str, str, str], list[tuple[str, str]]] = {}
+        self.__pages_by_field: dict[tuple[str, str, str], list[str]] = {}
+        self.__fields_by_table: dict[str, set[tuple[str, str, str]]] = {}
+
+        self.__build()
+
+    def __contains__(self, item: tuple[str, str, str]):
+        return item in self.__visuals_by_field or item in self.__pages_by_field
+
+    def __len__(self):
+        return len(self.__visuals_by_field.keys() | self.__pages_by_field.keys())
+
+    def __repr__(self):
+        return f'FieldIndex({len(self)})'
+
+    def __build(self) -> None:
+        for page in self.pages:
+            for field in dict.fromkeys(iter_field_references(page.raw_data.get('filterConfig'))):
+                self.__pages_by_field.setdefault(field, []).append(page.hash)
+                self.__fields_by_table.setdefault(field[1], set()).add(field)
+
+            for visual in page.visuals:
+                data = visual.raw_data
+                sources = [data['visual'].get('query'), data.get('filterConfig')] if 'visual' in data else [data.get('filterConfig')]
+
+                for field in dict.fromkeys(iter_field_references(sources)):
+                    self.__visuals_by_field.setdefault(field, []).append((page.hash, visual.name))
+                    self.__fields_by_table.setdefault(field[1], set()).add(field)
+
+    def __match(self, table: str, name: Optional[str], kind: Optional[str]) -> list[tuple[str, str, str]]:
+        return sorted(
+            field for field in self.__fields_by_table.get(table, ())
+            if (name is None or field[2] == name) and (kind is None or field[0] == kind)
+        )
+
+    def get_fields(self, table: Optional[str] = None) -> list[tuple[str, str, str]]:
+        """
+        Get the fields referenced by the report
+
+        Args:
+            table (Optional[str]): Only return the fields of this table.
+
+        Returns:
+            list[tuple[str, str, str]]: The sorted `(kind, table, name)` of every referenced field
+
+        """
+        if table is not None:
+            return self.__match(table, None, None)
+
+        return sorted(field for fields in self.__fields_by_table.values() for field in fields)
+
+    def get_tables(self) -> list[str]:
+        """
+        Get the tables referenced by the report
+
+        Returns:
+            list[str]: The sorted names of the tables
+
+        """
+        return sorted(self.__fields_by_table)
+
+    def get_visual_references(self, table: str, name: Optional[str] = None,
+                              kind: Optional[str] = None) -> list[tuple[str, str]]:
+        """
+        Get the visuals referencing a field, or any field of a table, without resolving them
+
+        Args:
+            table (str): The table of the field.
+            name (Optional[str]): The name of the column or measure, any field of the table when None.
+            kind (Optional[str]): Only match fields of this kind, e.g. `Measure`.
+
+        Returns:
+            list[tuple[str, str]]: The distinct `(page_hash, visual_name)` of every referencing visual
+
+        """
+        return list(dict.fromkeys(
+            reference for field in self.__match(table, name, kind) for reference in self.__visuals_by_field.get(field, ())
+        ))
+
+    def get_visuals(self, table: str, name: Optional[str] = None,
+                    kind: Optional[str] = None) -> list[Union[VisualGroup, VisualShape, VisualType]]:
+        """
+        Get the visuals referencing a field, or any field of a table
+
+        Args:
+            table (str): The table of the field.
+            name (Optional[str]): The name of the column or measure, any field of the table when None.
+            kind (Optional[str]): Only match fields of this kind, e.g. `Measure`.
+
+        Returns:
+            list[Union[VisualGroup, VisualShape, VisualType]]: The referencing visuals
+
+        """
+        return [
+            self.pages[page_hash].visuals.get_by_hash(visual_name)
+            for page_hash, visual_name in self.get_visual_references(table, name=name, kind=kind)
+        ]
+
+    def get_pages(self, table: str, name: Optional[str] = None, kind: Optional[str] = None,
+                  include_visuals: bool = True) -> list[Page]:
+        """
+        Get the pages referencing a field, or any field of a table, in their filters or through their visuals
+
+        Args:
+            table (str): The table of the field.
+            name (Optional[str]): The name of the column or measure, any field of the table when None.
+            kind (Optional[str]): Only match fields of this kind, e.g. `Measure`.
+            include_visuals (bool): Also return pages whose visuals reference the field, not only their filters.
+
+        Returns:
+            list[Page]: The referencing pages, in page order
+
+        """
+        page_hashes = set()
+
+        for field in self.__match(table, name, kind):
+            page_hashes.update(self.__pages_by_field.get(field, ()))
+
+            if include_visuals:
+                page_hashes.update(page_hash for page_hash, _ in self.__visuals_by_field.get(field, ()))
+
+        return [page for page in self.pages if page.hash in page_hashes]
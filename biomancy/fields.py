@@ -0,0 +1,89 @@
+""" Module to extract the semantic model fields referenced by PowerBI JSON files """
+from typing import Any, Iterator, Optional
+
+FIELD_KINDS: list[str] = ['Column', 'Measure', 'Aggregation', 'HierarchyLevel']
+
+
+def get_entity(expression: dict, aliases: Optional[dict[str, str]] = None) -> str:
+    """
+    Get the table name of a field expression
+
+    Args:
+        expression (dict): The `Expression` of a field, e.g. `{'SourceRef': {'Entity': 'Sales'}}`.
+        aliases (Optional[dict[str, str]]): The table names keyed by the aliases declared in an enclosing `From`.
+
+    Returns:
+        str: The table name, empty when the expression does not reference a table
+
+    """
+    source_ref = expression.get('SourceRef', {}) if isinstance(expression, dict) else {}
+
+    if 'Entity' in source_ref:
+        return source_ref['Entity']
+
+    source = source_ref.get('Source', '')
+    return aliases.get(source, source) if aliases else source
+
+
+def iter_field_references(data: Any) -> Iterator[tuple[str, str, str]]:
+    """
+    Walk a PowerBI JSON structure and yield every semantic model field it references. Table aliases declared
+    in a `From` clause, as used by filter definitions, are resolved to their table names.
+
+    Args:
+        data (Any): Any part of the raw data of a PowerBI JSON file, e.g. a visual `query` or a `filterConfig`.
+
+    Returns:
+        Iterator[tuple[str, str, str]]: The `(kind, table, name)` of every reference, kind being `Column`,
+            `Measure` or `HierarchyLevel`
+
+    """
+    stack = [(data, {})]
+
+    while stack:
+        value, aliases = stack.pop()
+
+        if isinstance(value, list):
+            stack.extend((child, aliases) for child in reversed(value))
+            continue
+
+        if not isinstance(value, dict):
+            continue
+
+        if isinstance(value.get('From'), list):
+            aliases = dict(aliases)
+            aliases.update({source['Name']: source['Entity'] for source in value['From']
+                            if isinstance(source, dict) and 'Name' in source and 'Entity' in source})
+
+        for kind in FIELD_KINDS:
+            field = value.get(kind)
+            if not isinstance(field, dict):
+                continue
+
+            if kind == 'Aggregation':
+                stack.append((field.get('Expression'), aliases))
+            elif kind == 'HierarchyLevel':
+                hierarchy = field.get('Expression', {}).get('Hierarchy', {})
+                name = f"{hierarchy.get('Hierarchy', '')}.{field.get('Level', '')}"
+                yield kind, get_entity(hierarchy.get('Expression', {}), aliases), name
+            elif 'Property' in field:
+                yield kind, get_entity(field.get('Expression', {}), aliases), field['Property']
+
+        stack.extend(
+            (child, aliases) for key, child in reversed(value.items())
+            if key not in FIELD_KINDS and isinstance(child, (dict, list))
+        )
+
+
+def extract_field_references(data: Any) -> list[tuple[str, str, str]]:
+    """
+    Get the distinct semantic model fields referenced by a PowerBI JSON structure
+
+    Args:
+        data (Any): Any part of the raw data of a PowerBI JSON file.
+
+    Returns:
+        list[tuple[str, str, str]]: The distinct `(kind, table, name)` references, in order of first occurrence
+
+    """
+    return list(dict.fromkeys(iter_field_references(data)))
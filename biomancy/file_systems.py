@@ -0,0 +1,177 @@
+""" Module to read the files of a PowerBI report asynchronously, from local disk or slower mounted storage """
+import abc
+import asyncio
+import os
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Optional
+
+
+class AsyncFileSystem(abc.ABC):
+    """
+    Base class for the file systems a report is read from with `Report.aload`. Subclasses implement `read` and
+    `scan`, every call being awaited concurrently with many others.
+    """
+    @abc.abstractmethod
+    async def read(self, path: str) -> tuple[bytes, tuple[int, int]]:
+        """
+        Read the content of a file
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            tuple[bytes, tuple[int, int]]: The content of the file, and its `(mtime_ns, size)` when it was read
+
+        """
+
+    @abc.abstractmethod
+    async def scan(self, path: str) -> tuple[Optional[tuple[int, int]], list[str]]:
+        """
+        List the subdirectories of a directory
+
+        Args:
+            path (str): The path of the directory.
+
+        Returns:
+            tuple[Optional[tuple[int, int]], list[str]]: The `(mtime_ns, size)` of the directory, and the names of
+                its subdirectories in listing order, None and an empty list when it does not exist
+
+        """
+
+    def close(self) -> None:
+        """ Release the resources held by the file system """
+
+
+async def gather_tasks(*awaitables: Awaitable) -> list[Any]:
+    """
+    Run awaitables concurrently, so that the first failure cancels every other one. Unlike `asyncio.gather`, no
+    task is left running once this returns or raises, and the exception raised is the one of the failing task.
+
+    Args:
+        *awaitables (Awaitable): The awaitables to run.
+
+    Returns:
+        list[Any]: The results, in the order the awaitables were given
+
+    """
+    tasks = [asyncio.ensure_future(awaitable) for awaitable in awaitables]
+
+    if not tasks:
+        return []
+
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    for task in tasks:
+        if not task.cancelled() and task.exception() is not None:
+            raise task.exception()
+
+    return [task.result() for task in tasks]
+
+
+def read_file(path: str) -> tuple[bytes, tuple[int, int]]:
+    """ Read a local file, taking its signature from the open file so a single `open` is needed """
+    with open(path, 'rb') as file:
+        stat = os.fstat(file.fileno())
+        return file.read(), (stat.st_mtime_ns, stat.st_size)
+
+
+def scan_directory(path: str) -> tuple[Optional[tuple[int, int]], list[str]]:
+    """ List the subdirectories of a local directory, see `AsyncFileSystem.scan` """
+    try:
+        stat = os.stat(path)
+        with os.scandir(path) as entries:
+            return (stat.st_mtime_ns, stat.st_size), [entry.name for entry in entries if entry.is_dir()]
+    except FileNotFoundError:
+        return None, []
+
+
+class LocalFileSystem(AsyncFileSystem):
+    """
+    Class to read local or mounted files without blocking the event loop. Every blocking call is offloaded to a
+    pool of threads, so as many reads as there are threads wait on the storage at the same time. Once closed,
+    every call raises a RuntimeError instead of starting a new pool.
+    """
+    def __init__(self, max_workers: int = 64):
+        """
+        Initialize the LocalFileSystem object
+
+        Args:
+            max_workers (int): The number of threads, the maximum number of blocking calls in flight.
+
+        """
+        self.max_workers: int = max_workers
+        self.closed: bool = False
+        self.__executor: Optional[ThreadPoolExecutor] = None
+
+    def __repr__(self):
+        return f'LocalFileSystem({self.max_workers})'
+
+    async def __run(self, function, path: str):
+        if self.closed:
+            raise RuntimeError(f"{self!r} is closed")
+
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='biomancy-io')
+
+        return await asyncio.get_running_loop().run_in_executor(self.__executor, function, path)
+
+    async def read(self, path: str) -> tuple[bytes, tuple[int, int]]:
+        return await self.__run(read_file, path)
+
+    async def scan(self, path: str) -> tuple[Optional[tuple[int, int]], list[str]]:
+        return await self.__run(scan_directory, path)
+
+    def close(self) -> None:
+        self.closed = True
+
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=False)
+            self.__executor = None
+
+
+class FakeFileSystem(AsyncFileSystem):
+    """
+    Class to simulate high latency storage over local files, for tests and benchmarks. Every call waits for
+    `latency` seconds without blocking the event loop before reading the file, and the number of calls in flight
+    is tracked.
+    """
+    def __init__(self, latency: float = 0.02):
+        """
+        Initialize the FakeFileSystem object
+
+        Args:
+            latency (float): The number of seconds every call waits for.
+
+        """
+        self.latency: float = latency
+        self.calls: int = 0
+        self.in_flight: int = 0
+        self.max_in_flight: int = 0
+
+    def __repr__(self):
+        return f'FakeFileSystem({self.latency})'
+
+    async def __wait(self) -> None:
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+
+    async def read(self, path: str) -> tuple[bytes, tuple[int, int]]:
+        await self.__wait()
+        return read_file(path)
+
+    async def scan(self, path: str) -> tuple[Optional[tuple[int, int]], list[str]]:
+        await self.__wait()
+        return scan_directory(path)
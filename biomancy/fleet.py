@@ -0,0 +1,218 @@
+""" Module to scan a fleet of PBIP reports at once """
+import glob
+import os
+import traceback
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, BrokenExecutor, wait
+from typing import Any, Callable, Iterator, Optional
+
+from biomancy.report import Report
+
+
+class ScanResult(object):
+    """ Class to represent the outcome of analysing one report of a fleet """
+    def __init__(self, path: str, value: Any = None, error: Optional[str] = None):
+        """
+        Initialize the ScanResult object
+
+        Args:
+            path (str): The directory path of the report containing `pages.json`.
+            value (Any): The value returned by the analysis of the report.
+            error (Optional[str]): The formatted exception raised while loading or analysing the report.
+
+        """
+        self.path: str = path
+        self.value: Any = value
+        self.error: Optional[str] = error
+
+    def __repr__(self):
+        return f"ScanResult({self.path}, {'ok' if self.ok else 'error'})"
+
+    @property
+    def ok(self) -> bool:
+        """
+        Check if the report was loaded and analysed without error
+
+        Returns:
+            bool: True if no error was raised, False otherwise
+
+        """
+        return self.error is None
+
+
+def report_statistics(report: Report) -> dict:
+    """
+    Default analysis of a report in a scan
+
+    Args:
+        report (Report): The loaded report.
+
+    Returns:
+        dict: The number of `pages` and `visuals`, and the `visual_occurrences` count per visual type
+
+    """
+    visual_occurrences = report.pages.visual_occurrences_count()
+
+    return {
+        'pages': len(report.pages),
+        'visuals': sum(visual_occurrences.values()),
+        'visual_occurrences': visual_occurrences,
+    }
+
+
+def discover(root: str, pattern: str = '**/*.Report/definition') -> list[str]:
+    """
+    Discover the report directories under a root directory
+
+    Args:
+        root (str): The directory to search in.
+        pattern (str): The glob pattern of the report definition directories, relative to the root.
+
+    Returns:
+        list[str]: The sorted directory paths containing `pages.json`, either the matched directory itself or its
+            `pages` subdirectory
+
+    """
+    report_paths = []
+
+    for match in glob.glob(os.path.join(root, pattern), recursive=True):
+        for candidate in (match, os.path.join(match, 'pages')):
+            if os.path.isfile(os.path.join(candidate, 'pages.json')):
+                report_paths.append(candidate)
+                break
+
+    return sorted(report_paths)
+
+
+def analyze_report(path: str, analyze: Callable[[Report], Any], report_options: dict) -> ScanResult:
+    """
+    Load and analyse a single report, capturing any exception in the result instead of raising it
+
+    Args:
+        path (str): The directory path of the report containing `pages.json`.
+        analyze (Callable[[Report], Any]): The analysis to run on the loaded report.
+        report_options (dict): Keyword arguments passed to `Report`.
+
+    Returns:
+        ScanResult: The outcome of the analysis
+
+    """
+    try:
+        return ScanResult(path, value=analyze(Report(path, **report_options)))
+    except Exception:
+        return ScanResult(path, error=traceback.format_exc())
+
+
+def analyze_isolated(path: str, analyze: Callable[[Report], Any], report_options: dict, executor: str) -> ScanResult:
+    """
+    Load and analyse a single report in a pool of its own, so that a worker dying on it only fails this report
+
+    Args:
+        path (str): The directory path of the report containing `pages.json`.
+        analyze (Callable[[Report], Any]): The analysis to run on the loaded report.
+        report_options (dict): Keyword arguments passed to `Report`.
+        executor (str): The pool backend, either 'thread' or 'process'.
+
+    Returns:
+        ScanResult: The outcome of the analysis
+
+    """
+    try:
+        with Report.EXECUTORS[executor](max_workers=1) as pool:
+            return pool.submit(analyze_report, path, analyze, report_options).result()
+    except Exception:
+        return ScanResult(path, error=traceback.format_exc())
+
+
+def scan(root: str, pattern: str = '**/*.Report/definition', workers: Optional[int] = None, executor: str = 'process',
+         analyze: Callable[[Report], Any] = report_statistics, **report_options) -> Iterator[ScanResult]:
+    """
+    Load every report under a root directory and yield the outcome of analysing each of them. A report that fails
+    to load or analyse yields a result carrying the error instead of stopping the scan, as does a report whose
+    worker process dies, e.g. when running out of memory. At most `workers` reports are in flight, so when a worker
+    dies only those are run again, each in a process of its own, and the scan goes on in a new pool.
+
+    Args:
+        root (str): The directory to search in.
+        pattern (str): The glob pattern of the report definition directories, relative to the root.
+        workers (Optional[int]): When set, analyse the reports across a pool of this size, yielding results as
+            they complete. Reports are analysed one after another in discovery order otherwise.
+        executor (str): The pool backend used when `workers` is set, either 'thread' or 'process'. With 'process',
+            `analyze` must be a module level function and return a picklable value.
+        analyze (Callable[[Report], Any]): The analysis to run on each loaded report, `report_statistics` by default.
+        **report_options: Keyword arguments passed to `Report`, e.g. `ignored_pages` or `cache`.
+
+    Returns:
+        Iterator[ScanResult]: The outcome of every report
+
+    """
+    if executor not in Report.EXECUTORS:
+        raise ValueError(f"Unknown executor {executor}, expected one of {list(Report.EXECUTORS)}")
+
+    report_paths = discover(root, pattern)
+
+    if not workers:
+        for path in report_paths:
+            yield analyze_report(path, analyze, report_options)
+        return
+
+    pending = deque(report_paths)
+
+    while pending:
+        suspects = []
+
+        with Report.EXECUTORS[executor](max_workers=workers) as pool:
+            in_flight = {}
+
+            while (pending or in_flight) and not suspects:
+                while pending and len(in_flight) < workers:
+                    path = pending.popleft()
+                    in_flight[pool.submit(analyze_report, path, analyze, report_options)] = path
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    path = in_flight.pop(future)
+
+                    try:
+                        yield future.result()
+                    except BrokenExecutor:
+                        suspects.append(path)
+                    except Exception:
+                        yield ScanResult(path, error=traceback.format_exc())
+
+            if suspects:
+                suspects.extend(in_flight.values())
+
+        for path in suspects:
+            yield analyze_isolated(path, analyze, report_options, executor)
+
+
+def aggregate(results: Iterator[ScanResult]) -> dict:
+    """
+    Aggregate the results of a scan run with the default `report_statistics` analysis
+
+    Args:
+        results (Iterator[ScanResult]): The results yielded by `scan`.
+
+    Returns:
+        dict: The number of `reports`, `pages` and `visuals`, the merged `visual_occurrences` count per visual
+            type, and the `failures` keyed by report path
+
+    """
+    statistics = {'reports': 0, 'pages': 0, 'visuals': 0, 'visual_occurrences': {}, 'failures': {}}
+
+    for result in results:
+        if not result.ok:
+            statistics['failures'][result.path] = result.error
+            continue
+
+        statistics['reports'] += 1
+        statistics['pages'] += result.value['pages']
+        statistics['visuals'] += result.value['visuals']
+
+        for visual_type, count in result.value['visual_occurrences'].items():
+            statistics['visual_occurrences'][visual_type] = statistics['visual_occurrences'].get(visual_type, 0) + count
+
+    return statistics
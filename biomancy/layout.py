@@ -0,0 +1,195 @@
+""" Module to analyse the layout of the visuals on PowerBI report pages """
+import heapq
+
+from typing import Union
+
+from biomancy.components import Page, VisualGroup, VisualShape, VisualType
+
+EDGES: dict[str, int] = {'left': 0, 'right': 2, 'top': 1, 'bottom': 3}
+
+
+def get_bounds(visual: Union[VisualGroup, VisualShape, VisualType]) -> tuple[float, float, float, float]:
+    """
+    Get the axis aligned bounding box of a visual, accounting for its rotation around its centre
+
+    Args:
+        visual (Union[VisualGroup, VisualShape, VisualType]): The visual.
+
+    Returns:
+        tuple[float, float, float, float]: The left, top, right and bottom coordinates
+
+    """
+    return visual.position.bounds
+
+
+def get_ancestors(page: Page, visual: Union[VisualGroup, VisualShape, VisualType]) -> set[str]:
+    """
+    Get the names of the visual groups a visual is nested in
+
+    Args:
+        page (Page): The page of the visual.
+        visual (Union[VisualGroup, VisualShape, VisualType]): The visual.
+
+    Returns:
+        set[str]: The names of the parent group, its own parent group, and so on
+
+    """
+    ancestors = set()
+    parent_group_name = visual.parent_group_name
+
+    while parent_group_name and parent_group_name not in ancestors:
+        ancestors.add(parent_group_name)
+        parent = page.visual_groups[parent_group_name] if parent_group_name in page.visual_groups else None
+        parent_group_name = parent.parent_group_name if parent is not None else None
+
+    return ancestors
+
+
+def find_overlaps(page: Page, include_groups: bool = False, min_area: float = 0.0) -> list[tuple[str, str, float]]:
+    """
+    Find the pairs of visuals whose bounding boxes overlap, with a sweep line over the left edges so that the cost
+    grows with the number of visuals and overlaps rather than with every pair of visuals
+
+    Args:
+        page (Page): The page to analyse.
+        include_groups (bool): Also report visual groups overlapping visuals outside of the group.
+        min_area (float): The overlapping area below which a pair is ignored.
+
+    Returns:
+        list[tuple[str, str, float]]: The names of both visuals and their overlapping area
+
+    """
+    visuals = [visual for visual in page.visuals if include_groups or not isinstance(visual, VisualGroup)]
+    bounds = sorted(((get_bounds(visual), visual) for visual in visuals), key=lambda item: item[0][0])
+    ancestors = {visual.name: get_ancestors(page, visual) for visual in visuals} if include_groups else {}
+
+    overlaps = []
+    active: list[tuple[float, int]] = []
+    for index, ((left, top, right, bottom), visual) in enumerate(bounds):
+        while active and active[0][0] <= left:
+            heapq.heappop(active)
+
+        for _, other_index in active:
+            (other_left, other_top, other_right, other_bottom), other = bounds[other_index]
+
+            if other_top >= bottom or top >= other_bottom:
+                continue
+
+            if other.name in ancestors.get(visual.name, ()) or visual.name in ancestors.get(other.name, ()):
+                continue
+
+            area = (min(right, other_right) - left) * (min(bottom, other_bottom) - max(top, other_top))
+            if area > min_area:
+                overlaps.append((other.name, visual.name, area))
+
+        heapq.heappush(active, (right, index))
+
+    return overlaps
+
+
+def find_out_of_bounds(page: Page) -> list[tuple[str, dict[str, float]]]:
+    """
+    Find the visuals extending past the canvas defined by the `width` and `height` of `page.json`
+
+    Args:
+        page (Page): The page to analyse.
+
+    Returns:
+        list[tuple[str, dict[str, float]]]: The name of each visual and by how much it exceeds each side of the canvas
+
+    """
+    page_width = page.raw_data.get('width')
+    page_height = page.raw_data.get('height')
+    violations = []
+
+    for visual in page.visuals:
+        left, top, right, bottom = get_bounds(visual)
+        exceeded = {
+            'left': -left, 'top': -top,
+            'right': right - page_width if page_width is not None else 0,
+            'bottom': bottom - page_height if page_height is not None else 0,
+        }
+        exceeded = {side: amount for side, amount in exceeded.items() if amount > 0}
+
+        if exceeded:
+            violations.append((visual.name, exceeded))
+
+    return violations
+
+
+def find_misalignments(page: Page, tolerance: float = 2.0, include_groups: bool = False) -> list[tuple[str, str, str, float]]:
+    """
+    Find the pairs of visuals whose edges are nearly, but not exactly, aligned. Edges are sorted once per side and
+    visuals sharing an edge value are grouped, so only distinct values within the tolerance are compared and
+    exactly aligned visuals cost nothing however many there are.
+
+    Args:
+        page (Page): The page to analyse.
+        tolerance (float): The largest distance between two edges considered a near miss.
+        include_groups (bool): Also compare the edges of visual groups.
+
+    Returns:
+        list[tuple[str, str, str, float]]: The edge, the names of both visuals and the distance between their edges
+
+    """
+    visuals = [visual for visual in page.visuals if include_groups or not isinstance(visual, VisualGroup)]
+    bounds = [(get_bounds(visual), visual.name) for visual in visuals]
+    misalignments = []
+
+    for edge, bounds_index in EDGES.items():
+        groups: list[tuple[float, list[str]]] = []
+
+        for value, name in sorted((box[bounds_index], name) for box, name in bounds):
+            if groups and groups[-1][0] == value:
+                groups[-1][1].append(name)
+            else:
+                groups.append((value, [name]))
+
+        for index, (value, names) in enumerate(groups):
+            for name in names:
+                for other_index in range(index + 1, len(groups)):
+                    other_value, other_names = groups[other_index]
+                    delta = other_value - value
+
+                    if delta > tolerance:
+                        break
+
+                    misalignments.extend((edge, name, other_name, delta) for other_name in other_names)
+
+    return misalignments
+
+
+def analyze_page(page: Page, tolerance: float = 2.0, include_groups: bool = False) -> dict[str, list]:
+    """
+    Run every layout check on a page
+
+    Args:
+        page (Page): The page to analyse.
+        tolerance (float): The largest distance between two edges considered a near miss.
+        include_groups (bool): Also check visual groups.
+
+    Returns:
+        dict[str, list]: The `overlaps`, `out_of_bounds` and `misalignments` found on the page
+
+    """
+    return {
+        'overlaps': find_overlaps(page, include_groups=include_groups),
+        'out_of_bounds': find_out_of_bounds(page),
+        'misalignments': find_misalignments(page, tolerance=tolerance, include_groups=include_groups),
+    }
+
+
+def analyze_report(report, tolerance: float = 2.0, include_groups: bool = False) -> dict[str, dict[str, list]]:
+    """
+    Run every layout check on every page of a report, usable as the `analyze` function of `biomancy.scan`
+
+    Args:
+        report (Report): The report to analyse.
+        tolerance (float): The largest distance between two edges considered a near miss.
+        include_groups (bool): Also check visual groups.
+
+    Returns:
+        dict[str, dict[str, list]]: The results of `analyze_page` keyed by page hash
+
+    """
+    return {page.hash: analyze_page(page, tolerance=tolerance, include_groups=include_groups) for page in report.pages}
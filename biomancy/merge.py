@@ -0,0 +1,418 @@
+""" Module to merge two versions of a PowerBI report that diverged from a common base """
+import os
+
+from typing import Any, Optional
+
+from biomancy.components import Page
+from biomancy.tools import read_json
+from biomancy.transaction import Transaction
+
+MISSING = object()
+
+VISUAL_MERGEABLE_PATHS: frozenset[tuple[str, ...]] = frozenset([
+    (), ('position',), ('visual',), ('visual', 'objects'), ('visual', 'visualContainerObjects'), ('visualGroup',),
+    ('visualGroup', 'objects'),
+])
+PAGE_MERGEABLE_PATHS: frozenset[tuple[str, ...]] = frozenset([(), ('objects',)])
+
+
+class MergeConflict(object):
+    """ Class to represent a property changed differently on both sides of a merge """
+    def __init__(self, page_hash: str, visual_name: Optional[str], path: tuple[str, ...], base: Any, ours: Any, theirs: Any):
+        """
+        Initialize the MergeConflict object
+
+        Args:
+            page_hash (str): The hash of the page the conflict is on.
+            visual_name (Optional[str]): The name of the visual in conflict, None for `page.json` and the page order.
+            path (tuple[str, ...]): The keys leading to the conflicting property, empty for a whole page or visual.
+            base (Any): The value in the common base, None when absent.
+            ours (Any): The value on our side, None when absent.
+            theirs (Any): The value on their side, None when absent.
+
+        """
+        self.page_hash: str = page_hash
+        self.visual_name: Optional[str] = visual_name
+        self.path: tuple[str, ...] = path
+        self.base: Any = None if base is MISSING else base
+        self.ours: Any = None if ours is MISSING else ours
+        self.theirs: Any = None if theirs is MISSING else theirs
+
+    def __repr__(self):
+        location = '/'.join(part for part in (self.page_hash, self.visual_name) if part)
+        return f"MergeConflict({location}:{'.'.join(self.path)})"
+
+
+class MergeResult(object):
+    """ Class to represent the outcome of a three-way merge, to inspect and then apply to our side """
+    def __init__(self, ours, theirs):
+        """
+        Initialize the MergeResult object
+
+        Args:
+            ours (Report): Our version of the report, the one the merge is applied to.
+            theirs (Report): Their version of the report.
+
+        """
+        self.ours = ours
+        self.theirs = theirs
+        self.conflicts: list[MergeConflict] = []
+        self.page_order: list[str] = list(ours.ordered_pages)
+        self.pages_added: list[str] = []
+        self.pages_removed: list[str] = []
+        self.pages: dict[str, dict[str, Any]] = {}
+
+    def __repr__(self):
+        return f"MergeResult({len(self.pages)} pages changed, {len(self.conflicts)} conflicts)"
+
+    @property
+    def ok(self) -> bool:
+        """
+        Check if every change was resolved automatically
+
+        Returns:
+            bool: True if there is no conflict, False otherwise
+
+        """
+        return not self.conflicts
+
+    def get_page_changes(self, page_hash: str) -> dict[str, Any]:
+        """
+        Get the pending changes to one of our pages, creating an empty entry on first access
+
+        Args:
+            page_hash (str): The hash of the page.
+
+        Returns:
+            dict[str, Any]: The merged `raw_data` of `page.json` (None when unchanged), and the `visuals_added`
+                (theirs), `visuals_modified` (merged content) and `visuals_removed` (ours) keyed by visual name
+
+        """
+        return self.pages.setdefault(page_hash, {
+            'raw_data': None, 'visuals_added': {}, 'visuals_modified': {}, 'visuals_removed': {}
+        })
+
+    def apply(self) -> None:
+        """
+        Write the merged changes into the directory of our report and refresh it. Conflicting properties keep the
+        value of the side preferred by the merge. Every file is written through a transaction journal, `pages.json`
+        last, so a failure restores our directory as it was.
+
+        Returns:
+            None
+
+        """
+        directory_path = self.ours.directory_path
+        operations = {}
+
+        for page_hash in self.pages_added:
+            operations.update(get_copy_operations(
+                get_page(self.theirs, page_hash).directory_path, os.path.join(directory_path, page_hash)
+            ))
+
+        for page_hash, changes in self.pages.items():
+            page = get_page(self.ours, page_hash)
+
+            if changes['raw_data'] is not None:
+                operations[page.file_path] = changes['raw_data']
+
+            for visual in changes['visuals_added'].values():
+                target_path = os.path.join(page.directory_path, 'visuals', os.path.basename(visual.directory_path))
+                operations.update(get_copy_operations(visual.directory_path, target_path))
+
+            for name, data in changes['visuals_modified'].items():
+                operations[page.visuals.get_by_hash(name).file_path] = data
+
+            for visual in changes['visuals_removed'].values():
+                operations.update(get_delete_operations(visual.directory_path))
+
+        for page_hash in self.pages_removed:
+            operations.update(get_delete_operations(os.path.join(directory_path, page_hash)))
+
+        if self.page_order != list(self.ours.ordered_pages) or self.pages_added or self.pages_removed:
+            pages_path = os.path.join(directory_path, 'pages.json')
+            pages_data = read_json(pages_path)
+            pages_data['pageOrder'] = self.page_order
+
+            if pages_data.get('activePageName') not in self.page_order and self.page_order:
+                pages_data['activePageName'] = self.page_order[0]
+
+            operations[pages_path] = pages_data
+
+        Transaction(self.ours).write_files(operations)
+        self.ours.refresh()
+
+
+def get_page(report, page_hash: str) -> Page:
+    """
+    Get a page of a report by hash, reading it from disk when the report ignores it
+
+    Args:
+        report (Report): The report the page belongs to.
+        page_hash (str): The hash of the page, listed in the `pageOrder` of the report.
+
+    Returns:
+        Page: The page
+
+    """
+    if page_hash in report.pages.hashes:
+        return report.pages[page_hash]
+
+    return Page(os.path.join(report.directory_path, page_hash), lazy=True, cache=report.cache)
+
+
+def get_copy_operations(source_path: str, target_path: str) -> dict[str, str]:
+    """
+    Get the `Transaction.write_files` operations copying a page or visual directory into a new directory
+
+    Args:
+        source_path (str): The directory to copy.
+        target_path (str): The directory to create, which must not exist.
+
+    Returns:
+        dict[str, str]: The source path of every file, keyed by its target path
+
+    """
+    if os.path.exists(target_path):
+        raise FileExistsError(f"Expected Structure Error || Target directory {target_path} already exists")
+
+    return {
+        os.path.join(target_path, os.path.relpath(os.path.join(directory, file_name), source_path)):
+            os.path.join(directory, file_name)
+        for directory, _, file_names in os.walk(source_path) for file_name in file_names
+    }
+
+
+def get_delete_operations(directory_path: str) -> dict[str, None]:
+    """
+    Get the `Transaction.write_files` operations deleting a page or visual directory
+
+    Args:
+        directory_path (str): The directory to delete.
+
+    Returns:
+        dict[str, None]: None for every file of the directory, keyed by its path
+
+    """
+    return {
+        os.path.join(directory, file_name): None
+        for directory, _, file_names in os.walk(directory_path) for file_name in file_names
+    }
+
+
+def merge_values(base: Any, ours: Any, theirs: Any, mergeable_paths: frozenset[tuple[str, ...]], prefer: str,
+                 conflicts: list[tuple], path: tuple[str, ...] = ()) -> Any:
+    """
+    Merge three versions of a JSON value. Values changed on one side only take that side, dictionaries at a
+    mergeable path are merged key by key keeping our key order, and anything else changed on both sides is a conflict.
+
+    Args:
+        base (Any): The value in the common base, `MISSING` when absent.
+        ours (Any): The value on our side, `MISSING` when absent.
+        theirs (Any): The value on their side, `MISSING` when absent.
+        mergeable_paths (frozenset[tuple[str, ...]]): The paths of the dictionaries to merge key by key.
+        prefer (str): The side whose value is kept on conflict, 'ours' or 'theirs'.
+        conflicts (list[tuple]): The list the `(path, base, ours, theirs)` of every conflict is appended to.
+        path (tuple[str, ...]): The keys leading to the value.
+
+    Returns:
+        Any: The merged value, `MISSING` when the key should be absent
+
+    """
+    if ours is theirs or (ours is not MISSING and theirs is not MISSING and ours == theirs):
+        return ours
+
+    if base is ours or (base is not MISSING and ours is not MISSING and base == ours):
+        return theirs
+
+    if base is theirs or (base is not MISSING and theirs is not MISSING and base == theirs):
+        return ours
+
+    if path in mergeable_paths and isinstance(ours, dict) and isinstance(theirs, dict):
+        base = base if isinstance(base, dict) else {}
+        merged = {}
+
+        for key in list(ours) + [key for key in theirs if key not in ours]:
+            value = merge_values(
+                base.get(key, MISSING), ours.get(key, MISSING), theirs.get(key, MISSING), mergeable_paths, prefer,
+                conflicts, path + (key,)
+            )
+
+            if value is not MISSING:
+                merged[key] = value
+
+        return merged
+
+    conflicts.append((path, base, ours, theirs))
+
+    return theirs if prefer == 'theirs' else ours
+
+
+def merge_order(base: list[str], ours: list[str], theirs: list[str], kept: set[str]) -> tuple[list[str], bool]:
+    """
+    Merge three versions of an ordered list of names, such as `pageOrder`
+
+    Args:
+        base (list[str]): The order in the common base.
+        ours (list[str]): The order on our side.
+        theirs (list[str]): The order on their side.
+        kept (set[str]): The names present after the merge.
+
+    Returns:
+        tuple[list[str], bool]: The merged order, and whether both sides reordered the shared names differently
+
+    """
+    ours = [name for name in ours if name in kept]
+    theirs = [name for name in theirs if name in kept]
+    shared = set(ours) & set(theirs)
+
+    ours_shared = [name for name in ours if name in shared]
+    theirs_shared = [name for name in theirs if name in shared]
+    base_shared = [name for name in base if name in shared]
+
+    if ours_shared == theirs_shared or theirs_shared == base_shared:
+        order, source, conflict = list(ours), theirs, False
+    elif ours_shared == base_shared:
+        order, source, conflict = list(theirs), ours, False
+    else:
+        order, source, conflict = list(ours), theirs, True
+
+    for index, name in enumerate(source):
+        if name in order:
+            continue
+
+        previous_names = [previous for previous in source[:index] if previous in order]
+        order.insert(order.index(previous_names[-1]) + 1 if previous_names else 0, name)
+
+    return order, conflict
+
+
+def merge_pages(result: MergeResult, base: Optional[Page], ours: Page, theirs: Page, prefer: str) -> None:
+    """
+    Merge the `page.json` and the visuals of a page present on both sides into a merge result
+
+    Args:
+        result (MergeResult): The result the changes and conflicts are recorded in.
+        base (Optional[Page]): The page in the common base, None when both sides added it.
+        ours (Page): Our version of the page.
+        theirs (Page): Their version of the page.
+        prefer (str): The side whose value is kept on conflict, 'ours' or 'theirs'.
+
+    Returns:
+        None
+
+    """
+    conflicts = []
+    raw_data = merge_values(
+        base.raw_data if base else MISSING, ours.raw_data, theirs.raw_data, PAGE_MERGEABLE_PATHS, prefer, conflicts
+    )
+    result.conflicts.extend(MergeConflict(ours.hash, None, *conflict) for conflict in conflicts)
+
+    if raw_data != ours.raw_data:
+        result.get_page_changes(ours.hash)['raw_data'] = raw_data
+
+    base_visuals = {visual.name: visual for visual in base.visuals} if base else {}
+    our_visuals = {visual.name: visual for visual in ours.visuals}
+    their_visuals = {visual.name: visual for visual in theirs.visuals}
+
+    for name in list(our_visuals) + [name for name in their_visuals if name not in our_visuals]:
+        base_visual, our_visual, their_visual = base_visuals.get(name), our_visuals.get(name), their_visuals.get(name)
+        base_hash, our_hash, their_hash = (
+            visual.content_hash if visual else None for visual in (base_visual, our_visual, their_visual)
+        )
+
+        if our_hash == their_hash or their_hash == base_hash:
+            continue
+
+        if our_visual is None:
+            if base_visual is not None:
+                result.conflicts.append(MergeConflict(ours.hash, name, (), base_visual.raw_data, MISSING, their_visual.raw_data))
+
+            if base_visual is None or prefer == 'theirs':
+                result.get_page_changes(ours.hash)['visuals_added'][name] = their_visual
+            continue
+
+        if their_visual is None:
+            if our_hash != base_hash:
+                result.conflicts.append(MergeConflict(ours.hash, name, (), base_visual.raw_data, our_visual.raw_data, MISSING))
+
+            if our_hash == base_hash or prefer == 'theirs':
+                result.get_page_changes(ours.hash)['visuals_removed'][name] = our_visual
+            continue
+
+        conflicts = []
+        data = merge_values(
+            base_visual.raw_data if base_visual else MISSING, our_visual.raw_data, their_visual.raw_data,
+            VISUAL_MERGEABLE_PATHS, prefer, conflicts
+        )
+        result.conflicts.extend(MergeConflict(ours.hash, name, *conflict) for conflict in conflicts)
+
+        if data != our_visual.raw_data:
+            result.get_page_changes(ours.hash)['visuals_modified'][name] = data
+
+
+def merge_reports(base, ours, theirs, prefer: str = 'ours') -> MergeResult:
+    """
+    Merge the changes made to a report on two sides since a common base, page by page, visual by visual and
+    property by property. Pages and visuals whose content hash did not change on their side are skipped. Every page
+    of `pageOrder` is merged, including the pages a report ignores, and a page added on their side whose directory
+    already exists on ours is a conflict and never overwritten.
+
+    Args:
+        base (Report): The common base version of the report.
+        ours (Report): Our version of the report, the one the result applies to.
+        theirs (Report): Their version of the report.
+        prefer (str): The side whose value is kept on conflict, 'ours' or 'theirs'.
+
+    Returns:
+        MergeResult: The merged changes and the conflicts, call `apply` to write them into our report
+
+    """
+    if prefer not in ('ours', 'theirs'):
+        raise ValueError(f"Unknown merge preference {prefer}, expected 'ours' or 'theirs'")
+
+    result = MergeResult(ours, theirs)
+    base_hashes, our_hashes, their_hashes = set(base.ordered_pages), set(ours.ordered_pages), set(theirs.ordered_pages)
+    kept = set(our_hashes)
+
+    for page_hash in their_hashes - our_hashes:
+        base_page = get_page(base, page_hash) if page_hash in base_hashes else None
+        their_page = get_page(theirs, page_hash)
+        modified = base_page is not None and their_page.content_hash != base_page.content_hash
+        exists = os.path.exists(os.path.join(ours.directory_path, page_hash))
+
+        if modified or exists:
+            base_data = base_page.raw_data if base_page is not None else MISSING
+            result.conflicts.append(MergeConflict(page_hash, None, (), base_data, MISSING, their_page.raw_data))
+
+        if not exists and (base_page is None or (modified and prefer == 'theirs')):
+            result.pages_added.append(page_hash)
+            kept.add(page_hash)
+
+    for page_hash in (our_hashes & base_hashes) - their_hashes:
+        base_page, our_page = get_page(base, page_hash), get_page(ours, page_hash)
+        modified = our_page.content_hash != base_page.content_hash
+
+        if modified:
+            result.conflicts.append(MergeConflict(page_hash, None, (), base_page.raw_data, our_page.raw_data, MISSING))
+
+        if not modified or prefer == 'theirs':
+            result.pages_removed.append(page_hash)
+            kept.discard(page_hash)
+
+    for page_hash in our_hashes & their_hashes:
+        base_page = get_page(base, page_hash) if page_hash in base_hashes else None
+        our_page, their_page = get_page(ours, page_hash), get_page(theirs, page_hash)
+        their_hash = their_page.content_hash
+
+        if their_hash == our_page.content_hash or (base_page is not None and their_hash == base_page.content_hash):
+            continue
+
+        merge_pages(result, base_page, our_page, their_page, prefer)
+
+    result.page_order, order_conflict = merge_order(base.ordered_pages, ours.ordered_pages, theirs.ordered_pages, kept)
+
+    if order_conflict:
+        result.conflicts.append(MergeConflict('', None, ('pageOrder',), base.ordered_pages, ours.ordered_pages, theirs.ordered_pages))
+
+    return result
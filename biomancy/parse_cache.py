@@ -0,0 +1,216 @@
+""" Module to represent a persistent on-disk cache of parsed PowerBI JSON files """
+import hashlib
+import os
+import pickle
+import threading
+
+from typing import Optional
+
+from biomancy.tools import read_json
+
+
+class ParseCache(object):
+    """
+    Class to represent a persistent on-disk cache of parsed PowerBI JSON files.
+
+    Every cached file is stored as a pickle snapshot keyed by its absolute path and validated against the
+    modification time and size of the source file, so unchanged files are never decoded twice. The cache
+    directory is trusted input, only point it at locations written by this class.
+
+    A cache can be shared by the threads of a pool, and failing to write an entry never fails the read. With a
+    process pool every worker uses its own copy, so `hits`, `misses` and `errors` only count the reads made in
+    the current process.
+    """
+    VERSION: int = 1
+    DEFAULT_MAX_BYTES: int = 256 * 1024 * 1024
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the ParseCache object
+
+        Args:
+            directory (Optional[str]): The directory holding the cache entries, defaults to `$XDG_CACHE_HOME/biomancy`.
+            max_bytes (int): The total size of the cache entries above which the oldest entries are evicted.
+
+        """
+        self.directory: str = directory if directory else self.default_directory()
+        self.max_bytes: int = max_bytes
+        self.hits: int = 0
+        self.misses: int = 0
+        self.errors: int = 0
+        self.__size: Optional[int] = None
+        self.__lock = threading.Lock()
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    def __repr__(self):
+        return f'ParseCache({self.directory})'
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state['_ParseCache__lock']
+
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def default_directory() -> str:
+        """
+        Get the default cache directory
+
+        Returns:
+            str: `$XDG_CACHE_HOME/biomancy`, falling back to `~/.cache/biomancy`
+
+        """
+        cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        return os.path.join(cache_home, 'biomancy')
+
+    def __entry_path(self, file_path: str) -> str:
+        key = hashlib.sha1(os.path.abspath(file_path).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f'{key}.pickle')
+
+    def __entries(self) -> list[os.DirEntry]:
+        return [entry for entry in os.scandir(self.directory) if entry.is_file() and entry.name.endswith('.pickle')]
+
+    def __stat_entries(self) -> list[tuple[int, int, str]]:
+        """ Get the `(mtime_ns, size, path)` of every entry, skipping entries removed by another thread or process """
+        entries = []
+        for entry in self.__entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+
+            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+
+        return entries
+
+    def __evict(self, written_bytes: int) -> None:
+        with self.__lock:
+            if self.__size is None:
+                self.__size = sum(size for _, size, _ in self.__stat_entries())
+            else:
+                self.__size += written_bytes
+
+            if self.__size <= self.max_bytes:
+                return
+
+            entries = sorted(self.__stat_entries())
+            self.__size = sum(size for _, size, _ in entries)
+
+            for _, size, path in entries:
+                if self.__size <= self.max_bytes:
+                    break
+
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+                self.__size -= size
+
+    def get(self, file_path: str, stat: Optional[os.stat_result] = None) -> Optional[dict]:
+        """
+        Get the cached parsed content of a file if the cache entry is still valid
+
+        Args:
+            file_path (str): The path of the source JSON file.
+            stat (Optional[os.stat_result]): The stat of the source file, taken from disk when not given.
+
+        Returns:
+            Optional[dict]: The parsed content, None when the file is not cached or has changed
+
+        """
+        stat = stat if stat else os.stat(file_path)
+
+        try:
+            with open(self.__entry_path(file_path), 'rb') as entry_file:
+                version, mtime_ns, size, data = pickle.loads(entry_file.read())
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+            return None
+
+        if version != self.VERSION or mtime_ns != stat.st_mtime_ns or size != stat.st_size:
+            return None
+
+        return data
+
+    def put(self, file_path: str, data: dict, stat: Optional[os.stat_result] = None) -> None:
+        """
+        Store the parsed content of a file, replacing any previous entry atomically
+
+        Args:
+            file_path (str): The path of the source JSON file.
+            data (dict): The parsed content of the file.
+            stat (Optional[os.stat_result]): The stat of the source file taken before it was read, from disk when not given.
+
+        Returns:
+            None
+
+        """
+        stat = stat if stat else os.stat(file_path)
+        entry_path = self.__entry_path(file_path)
+        temporary_path = f'{entry_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+
+        payload = pickle.dumps((self.VERSION, stat.st_mtime_ns, stat.st_size, data), protocol=5)
+        try:
+            with open(temporary_path, 'wb') as entry_file:
+                entry_file.write(payload)
+            os.replace(temporary_path, entry_path)
+        except OSError:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+
+        self.__evict(len(payload))
+
+    def read_json(self, file_path: str, stat: Optional[os.stat_result] = None) -> dict:
+        """
+        Read and parse a JSON file, serving the result from the cache when the file is unchanged
+
+        Args:
+            file_path (str): The path of the JSON file to read.
+            stat (Optional[os.stat_result]): The stat of the file taken before it is read, from disk when not given.
+
+        Returns:
+            dict: The parsed content of the JSON file
+
+        """
+        stat = stat if stat else os.stat(file_path)
+
+        data = self.get(file_path, stat)
+        if data is not None:
+            with self.__lock:
+                self.hits += 1
+            return data
+
+        with self.__lock:
+            self.misses += 1
+        data = read_json(file_path)
+
+        try:
+            self.put(file_path, data, stat)
+        except (OSError, pickle.PicklingError):
+            with self.__lock:
+                self.errors += 1
+
+        return data
+
+    def clear(self) -> None:
+        """
+        Remove every entry from the cache
+
+        Returns:
+            None
+
+        """
+        with self.__lock:
+            for entry in self.__entries():
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    continue
+
+            self.__size = 0
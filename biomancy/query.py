@@ -0,0 +1,191 @@
+""" Module to query the visuals of a PowerBI report """
+import operator
+
+from typing import Any, Callable, Iterator, Optional, Union
+
+from biomancy.components import Page, Pages, VisualContainerObjects, VisualGroup, VisualShape, VisualType
+
+MISSING = object()
+
+
+class VisualQuery(object):
+    """
+    Class to represent a lazy query over the visuals of a PowerBI report.
+
+    Conditions are given as keyword arguments in the form `<field>[__<key>...][__<lookup>]`, e.g.
+    `where(type='lineChart', width__gt=400, border__show=False)`. The first part of a field is an attribute of
+    the visual, or a section of its `visual_container_objects` such as `border` or `title`. Further parts walk
+    into nested attributes or dict keys. Conditions are compiled once when `where` is called, `type` and `page`
+    conditions are answered from the per-type and page indexes, and matching visuals are streamed one at a time.
+    """
+    LOOKUPS: dict[str, Callable[[Any, Any], bool]] = {
+        'eq': operator.eq,
+        'ne': operator.ne,
+        'gt': operator.gt,
+        'gte': operator.ge,
+        'lt': operator.lt,
+        'lte': operator.le,
+        'in': lambda value, expected: value in expected,
+        'contains': lambda value, expected: expected in value,
+        'startswith': lambda value, expected: value.startswith(expected),
+        'isnull': lambda value, expected: (value is None) == expected,
+    }
+    CONTAINER_SECTIONS: list[str] = list(VisualContainerObjects.SECTIONS)
+
+    def __init__(self, pages: Pages, predicates: tuple = (), visual_types: Optional[frozenset[str]] = None,
+                 page_keys: Optional[frozenset[str]] = None):
+        """
+        Initialize the VisualQuery object
+
+        Args:
+            pages (Pages): The pages to query the visuals of.
+            predicates (tuple): The compiled predicates every visual has to satisfy.
+            visual_types (Optional[frozenset[str]]): The visual types to restrict the query to, all when None.
+            page_keys (Optional[frozenset[str]]): The hashes or display names of the pages to restrict the query to, all when None.
+
+        """
+        self.pages: Pages = pages
+        self.predicates: tuple = predicates
+        self.visual_types: Optional[frozenset[str]] = visual_types
+        self.page_keys: Optional[frozenset[str]] = page_keys
+
+    def __iter__(self) -> Iterator[Union[VisualGroup, VisualShape, VisualType]]:
+        return (visual for _, visual in self.items())
+
+    def __repr__(self):
+        return f'VisualQuery({len(self.predicates)})'
+
+    @staticmethod
+    def __compile_getter(path: list[str]) -> Callable[[Any], Any]:
+        def get(visual):
+            value = visual
+            for index, key in enumerate(path):
+                if value is None or value is MISSING:
+                    return MISSING
+
+                if index == 0 and key in VisualQuery.CONTAINER_SECTIONS and not hasattr(visual, key):
+                    container_objects = getattr(visual, 'visual_container_objects', None)
+                    value = container_objects[key] if container_objects is not None else MISSING
+                elif isinstance(value, dict):
+                    value = value.get(key, MISSING)
+                else:
+                    value = getattr(value, key, MISSING)
+
+            return value
+
+        return get
+
+    @staticmethod
+    def compile(field: str, expected: Any) -> Callable[[Union[VisualGroup, VisualShape, VisualType]], bool]:
+        """
+        Compile a keyword condition to a predicate
+
+        Args:
+            field (str): The condition, e.g. `width__gt` or `border__show`.
+            expected (Any): The value to compare against.
+
+        Returns:
+            Callable[[Union[VisualGroup, VisualShape, VisualType]], bool]: The predicate
+
+        """
+        path = field.split('__')
+        lookup = 'eq'
+
+        if len(path) > 1 and path[-1] in VisualQuery.LOOKUPS:
+            lookup = path.pop()
+
+        getter = VisualQuery.__compile_getter(path)
+        compare = VisualQuery.LOOKUPS[lookup]
+
+        def predicate(visual) -> bool:
+            value = getter(visual)
+
+            if value is MISSING:
+                return lookup == 'ne' or (lookup == 'isnull' and expected)
+
+            try:
+                return compare(value, expected)
+            except (TypeError, AttributeError):
+                return False
+
+        return predicate
+
+    def where(self, **conditions) -> 'VisualQuery':
+        """
+        Narrow the query with additional conditions
+
+        Args:
+            **conditions: The conditions every visual has to satisfy, `page` and `page__in` match page hashes
+                or display names.
+
+        Returns:
+            VisualQuery: A new query combining the existing and the new conditions
+
+        """
+        predicates = list(self.predicates)
+        visual_types = self.visual_types
+        page_keys = self.page_keys
+
+        for field, expected in conditions.items():
+            if field in ('type', 'type__in'):
+                types = frozenset([expected] if field == 'type' else expected)
+                visual_types = types if visual_types is None else visual_types & types
+            elif field in ('page', 'page__in'):
+                keys = frozenset([expected] if field == 'page' else expected)
+                page_keys = keys if page_keys is None else page_keys & keys
+            else:
+                predicates.append(self.compile(field, expected))
+
+        return VisualQuery(self.pages, tuple(predicates), visual_types, page_keys)
+
+    def __get_pages(self) -> Iterator[Page]:
+        if self.page_keys is None:
+            return iter(self.pages)
+
+        pages = {}
+        for key in self.page_keys:
+            page = self.pages[key]
+            if page is not None:
+                pages[page.hash] = page
+
+        return (page for page in self.pages if page.hash in pages)
+
+    def items(self) -> Iterator[tuple[Page, Union[VisualGroup, VisualShape, VisualType]]]:
+        """
+        Stream the matching visuals along with their page
+
+        Returns:
+            Iterator[tuple[Page, Union[VisualGroup, VisualShape, VisualType]]]: The page and visual of every match
+
+        """
+        for page in self.__get_pages():
+            if self.visual_types is None:
+                candidates = page.visuals
+            elif len(self.visual_types) == 1:
+                candidates = page.visuals.get_by_type(next(iter(self.visual_types)))
+            else:
+                candidates = (visual for visual in page.visuals if visual.type in self.visual_types)
+
+            for visual in candidates:
+                if all(predicate(visual) for predicate in self.predicates):
+                    yield page, visual
+
+    def first(self) -> Optional[Union[VisualGroup, VisualShape, VisualType]]:
+        """
+        Get the first matching visual
+
+        Returns:
+            Optional[Union[VisualGroup, VisualShape, VisualType]]: The first match, None when nothing matches
+
+        """
+        return next(iter(self), None)
+
+    def count(self) -> int:
+        """
+        Count the matching visuals without materialising them
+
+        Returns:
+            int: The number of matching visuals
+
+        """
+        return sum(1 for _ in self)
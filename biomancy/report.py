@@ -1,35 +1,80 @@
 """ Module to represent a PBIP directory containing PowerBI pages and their visuals """
-import json
+import asyncio
 import os
 
-from typing import Optional, Union
+from array import array
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Optional, Union
 
+from biomancy import columns, diff, merge, snapshot
 from biomancy.components import Page, Pages, VisualGroup, VisualShape, VisualType
+from biomancy.field_index import FieldIndex
+from biomancy.file_systems import AsyncFileSystem, LocalFileSystem, gather_tasks, read_file
+from biomancy.parse_cache import ParseCache
+from biomancy.query import VisualQuery
+from biomancy.tools import loads, read_json
+from biomancy.transaction import Transaction
+from biomancy.watcher import ReportEvent, ReportWatcher
 
 
 class Report(object):
     """ Class to represent a PBIP directory containing PowerBI pages """
-    def __init__(self, directory_path: str, ignored_pages: Optional[list[str]] = None):
-        self.directory_path = directory_path
+    EXECUTORS: dict[str, type[Executor]] = {'thread': ThreadPoolExecutor, 'process': ProcessPoolExecutor}
+
+    def __init__(self, directory_path: str, ignored_pages: Optional[list[str]] = None, lazy: bool = False,
+                 workers: Optional[int] = None, executor: str = 'thread', cache: Optional[ParseCache] = None,
+                 recover: bool = False):
+        """
+        Initialize the Report object
+
+        Args:
+            directory_path (str): The directory path containing `pages.json` and the page directories, kept as an
+                absolute path so the report and its snapshots do not depend on the working directory.
+            ignored_pages (Optional[list[str]]): Display names of pages to leave out of the report.
+            lazy (bool): When True, pages only read `page.json` and their visuals on first access.
+                Ignoring pages still requires reading `page.json` of every page to resolve display names.
+            workers (Optional[int]): When set, parse `page.json` and `visual.json` files across a pool of this size.
+            executor (str): The pool backend used when `workers` is set, either 'thread' or 'process'.
+            cache (Optional[ParseCache]): The parse cache to serve unchanged `page.json` and `visual.json` files from.
+            recover (bool): Restore the files of a commit interrupted by a process that is no longer running before
+                reading the report, see `Transaction.recover`. Reading never writes to the report otherwise.
+
+        """
+        self.__initialize(directory_path, ignored_pages, lazy, workers, executor, cache, recover)
+        self.__get_page_order()
+
+        if self.workers:
+            self.__load_pages_parallel()
+        else:
+            self.__load_pages()
+
+    def __initialize(self, directory_path: str, ignored_pages: Optional[list[str]] = None, lazy: bool = False,
+                     workers: Optional[int] = None, executor: str = 'thread', cache: Optional[ParseCache] = None,
+                     recover: bool = False):
+        self.directory_path = os.path.abspath(directory_path)
         self.ignored_pages: list[str] = ignored_pages if ignored_pages else []
+        self.lazy: bool = lazy
+        self.workers: Optional[int] = workers
+        self.executor: str = executor
+        self.cache: Optional[ParseCache] = cache
         self.ordered_pages = []
         self.pages: Pages = Pages()
+        self.__field_index: Optional[FieldIndex] = None
+        self.__field_index_revisions: tuple[int, ...] = ()
+        self.__signatures: dict[str, Optional[tuple[int, int]]] = {}
 
-        if not os.path.exists(directory_path):
+        if not os.path.exists(self.directory_path):
             raise FileNotFoundError(f"Expected Structure Error || Target directory {directory_path} not found")
 
-        self.__get_page_order()
-
-        for page_hash in self.ordered_pages:
-            if not os.path.isdir(os.path.join(self.directory_path, page_hash)):
-                raise FileNotFoundError(f"Expected Structure Error || Page directory {page_hash} not found")
-
-            page = Page(os.path.join(self.directory_path, page_hash))
+        if executor not in self.EXECUTORS:
+            raise ValueError(f"Unknown executor {executor}, expected one of {list(self.EXECUTORS)}")
 
-            if self.ignored_pages and self.is_ignored(page.display_name):
-                continue
+        if workers is not None and lazy:
+            raise ValueError("Lazy loading and parallel loading with `workers` cannot be combined")
 
-            self.pages.add(page)
+        if recover:
+            Transaction.recover(self.directory_path)
 
     def __len__(self):
         return len(self.pages)
@@ -37,6 +82,54 @@ class Report(object):
     def __repr__(self):
         return f'Report({len(self.pages)})'
 
+    @property
+    def field_index(self) -> FieldIndex:
+        """
+        Get the inverted index from the semantic model fields referenced by the report to its pages and visuals,
+        built on first access and rebuilt once a page was added, removed, edited, reloaded or reverted, whichever
+        path changed it, as tracked by the `revision` of every page
+
+        Returns:
+            FieldIndex: The field index of the report
+
+        """
+        if self.__field_index is None or self.__field_index_revisions != self.__get_revisions():
+            self.__field_index = FieldIndex(self.pages)
+            self.__field_index_revisions = self.__get_revisions()
+
+        return self.__field_index
+
+    @property
+    def signatures(self) -> dict[str, Optional[tuple[int, int]]]:
+        """
+        Get the modification time and size of `pages.json` and of every file and directory read for the pages,
+        as last seen on disk
+
+        Returns:
+            dict[str, Optional[tuple[int, int]]]: The `(mtime_ns, size)` keyed by path, None for missing paths
+
+        """
+        signatures = dict(self.__signatures)
+
+        for page in self.pages:
+            signatures.update(page.signatures)
+
+        return signatures
+
+    def __get_revisions(self) -> tuple[int, ...]:
+        return tuple(page.revision for page in self.pages)
+
+    @property
+    def visuals(self) -> VisualQuery:
+        """
+        Get a lazy query over every visual of the report, narrow it down with `where`
+
+        Returns:
+            VisualQuery: The query over every visual of the report
+
+        """
+        return VisualQuery(self.pages)
+
     def __get_page_order(self):
         """
         Grabs the order of the pages from the pages.json file
@@ -45,9 +138,433 @@ class Report(object):
             None
 
         """
-        with open(os.path.join(self.directory_path, 'pages.json')) as pages_json:
-            data = json.load(pages_json)
-            self.ordered_pages = data['pageOrder']
+        pages_path = os.path.join(self.directory_path, 'pages.json')
+        signature = snapshot.get_signature(pages_path)
+        data = read_json(pages_path)
+        self.ordered_pages = data['pageOrder']
+        self.__signatures = {pages_path: signature}
+
+    def __get_page_directory(self, page_hash: str) -> str:
+        page_directory = os.path.join(self.directory_path, page_hash)
+
+        if not os.path.isdir(page_directory):
+            raise FileNotFoundError(f"Expected Structure Error || Page directory {page_hash} not found")
+
+        return page_directory
+
+    def __load_pages(self):
+        """
+        Load the pages one after another in `pageOrder`
+
+        Returns:
+            None
+
+        """
+        for page_hash in self.ordered_pages:
+            page = self.__create_page(page_hash)
+
+            if page:
+                self.pages.add(page)
+
+    def __create_page(self, page_hash: str) -> Optional[Page]:
+        """
+        Create the page for a hash, unless its display name is ignored
+
+        Args:
+            page_hash: The hash of the page, matching its directory name
+
+        Returns:
+            Optional[Page]: The created page, None if the page is ignored
+
+        """
+        page = Page(self.__get_page_directory(page_hash), lazy=True, cache=self.cache)
+
+        if self.ignored_pages and self.is_ignored(page.display_name):
+            return None
+
+        if not self.lazy:
+            page.load()
+
+        return page
+
+    @staticmethod
+    def read_json_with_signature(file_path: str, cache: Optional[ParseCache] = None) -> tuple[dict, tuple[int, int]]:
+        """
+        Read and parse a JSON file together with the modification time and size it had when it was read
+
+        Args:
+            file_path (str): The path of the JSON file to read.
+            cache (Optional[ParseCache]): The parse cache to serve an unchanged file from.
+
+        Returns:
+            tuple[dict, tuple[int, int]]: The parsed content and the `(mtime_ns, size)` of the file
+
+        """
+        try:
+            if cache:
+                stat = os.stat(file_path)
+                return cache.read_json(file_path, stat), (stat.st_mtime_ns, stat.st_size)
+
+            content, signature = read_file(file_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f"Expected Structural Error || `{os.path.basename(file_path)}` expected at {file_path}, not found")
+
+        return loads(content), signature
+
+    def __load_pages_parallel(self):
+        """
+        Load the pages by parsing every `page.json` and then every `visual.json` across a pool of workers.
+        Results are collected in submission order, so `pageOrder` and visual ordering are preserved. Every file is
+        recorded with the signature it had when the worker read it, so `refresh` detects writes made since.
+
+        Returns:
+            None
+
+        """
+        pages = [Page(self.__get_page_directory(page_hash), lazy=True, cache=self.cache) for page_hash in self.ordered_pages]
+        read_json_with_signature = partial(self.read_json_with_signature, cache=self.cache)
+
+        with self.EXECUTORS[self.executor](max_workers=self.workers) as executor:
+            pages_data = list(executor.map(read_json_with_signature, [page.file_path for page in pages]))
+            pages_with_data = [
+                (page, raw_data, signature) for page, (raw_data, signature) in zip(pages, pages_data)
+                if not (self.ignored_pages and self.is_ignored(raw_data.get('displayName', '')))
+            ]
+
+            visual_paths = [page.get_visual_paths() for page, _, _ in pages_with_data]
+            flattened_paths = [os.path.join(path, 'visual.json') for paths in visual_paths for path in paths]
+            chunk_size = max(1, len(flattened_paths) // (self.workers * 4))
+            visuals_data = iter(executor.map(read_json_with_signature, flattened_paths, chunksize=chunk_size))
+
+        for (page, raw_data, page_signature), paths in zip(pages_with_data, visual_paths):
+            signatures = {page.file_path: page_signature}
+            page_visuals_data = []
+
+            for path in paths:
+                visual_data, signatures[os.path.join(path, 'visual.json')] = next(visuals_data)
+                page_visuals_data.append(visual_data)
+
+            page.load(raw_data=raw_data, visuals_data=page_visuals_data, signatures=signatures)
+            self.pages.add(page)
+
+    @classmethod
+    async def aload(cls, directory_path: str, concurrency: int = 64, file_system: Optional[AsyncFileSystem] = None,
+                    ignored_pages: Optional[list[str]] = None, recover: bool = False) -> 'Report':
+        """
+        Read a report with many files read at the same time, for storage where every `open` is slow, such as
+        mounted object storage. Pages and visuals are ordered exactly as when reading the report with `Report`.
+
+        Args:
+            directory_path (str): The directory path containing `pages.json` and the page directories.
+            concurrency (int): The maximum number of reads and directory listings in flight.
+            file_system (Optional[AsyncFileSystem]): The file system to read from, a `LocalFileSystem` offloading
+                reads to `concurrency` threads when not given.
+            ignored_pages (Optional[list[str]]): Display names of pages to leave out of the report.
+            recover (bool): Restore the files of a commit interrupted by a process that is no longer running before
+                reading the report, see `Transaction.recover`.
+
+        Returns:
+            Report: The loaded report
+
+        """
+        if concurrency < 1:
+            raise ValueError(f"Expected a concurrency of at least 1, received {concurrency}")
+
+        report = cls.__new__(cls)
+        await asyncio.to_thread(report.__initialize, directory_path, ignored_pages, recover=recover)
+
+        owned_file_system = file_system is None
+        file_system = LocalFileSystem(max_workers=concurrency) if owned_file_system else file_system
+
+        try:
+            await report.__aload_pages(file_system, asyncio.Semaphore(concurrency))
+        finally:
+            if owned_file_system:
+                file_system.close()
+
+        return report
+
+    async def __aload_pages(self, file_system: AsyncFileSystem, semaphore: asyncio.Semaphore):
+        """
+        Load the pages by reading every `page.json`, listing every `visuals` directory and reading every
+        `visual.json` concurrently. Results are gathered in order, so `pageOrder` and visual ordering are preserved,
+        and the first failing read cancels every read still in flight. Parsing and building the pages run in
+        threads, so the event loop only ever waits on the file system.
+
+        Returns:
+            None
+
+        """
+        async def read(file_path: str) -> tuple[dict, tuple[int, int]]:
+            async with semaphore:
+                content, signature = await file_system.read(file_path)
+
+            return await asyncio.to_thread(loads, content), signature
+
+        async def scan(directory_path: str) -> tuple[Optional[tuple[int, int]], list[str]]:
+            async with semaphore:
+                return await file_system.scan(directory_path)
+
+        async def read_visual(file_path: str) -> tuple[dict, tuple[int, int]]:
+            try:
+                return await read(file_path)
+            except FileNotFoundError:
+                raise FileNotFoundError(f"Expected Structural Error || `visual.json` expected at {file_path}, not found")
+
+        def create_page(page_directory: str, raw_data: dict, visuals_data: list[dict],
+                        signatures: dict[str, Optional[tuple[int, int]]], visuals_directories: list[str]) -> Page:
+            page = Page(page_directory, lazy=True)
+            page.load(raw_data=raw_data, visuals_data=visuals_data, signatures=signatures,
+                      visuals_directories=visuals_directories)
+
+            return page
+
+        async def read_page(page_hash: str) -> Optional[Page]:
+            page_directory = os.path.join(self.directory_path, page_hash)
+            page_file_path = os.path.join(page_directory, 'page.json')
+            raw_data, page_signature = await read(page_file_path)
+
+            if self.ignored_pages and self.is_ignored(raw_data.get('displayName', '')):
+                return None
+
+            visuals_dir = os.path.join(page_directory, 'visuals')
+            visuals_signature, visuals_directories = await scan(visuals_dir)
+
+            visuals = await gather_tasks(*(
+                read_visual(os.path.join(visuals_dir, directory, 'visual.json')) for directory in visuals_directories
+            ))
+
+            signatures = {page_file_path: page_signature, visuals_dir: visuals_signature}
+            signatures.update(
+                (os.path.join(visuals_dir, directory, 'visual.json'), signature)
+                for directory, (_, signature) in zip(visuals_directories, visuals)
+            )
+
+            return await asyncio.to_thread(
+                create_page, page_directory, raw_data, [data for data, _ in visuals], signatures, visuals_directories
+            )
+
+        pages_path = os.path.join(self.directory_path, 'pages.json')
+        (data, pages_signature), (_, page_directories) = await gather_tasks(read(pages_path), scan(self.directory_path))
+        self.ordered_pages = data['pageOrder']
+        self.__signatures = {pages_path: pages_signature}
+
+        for page_hash in self.ordered_pages:
+            if page_hash not in page_directories:
+                raise FileNotFoundError(f"Expected Structure Error || Page directory {page_hash} not found")
+
+        pages = await gather_tasks(*(read_page(page_hash) for page_hash in self.ordered_pages))
+
+        for page in pages:
+            if page is not None:
+                self.pages.add(page)
+
+    def refresh(self, page_hashes: Optional[list[str]] = None) -> dict:
+        """
+        Reload what changed on disk since the report was read. `pages.json` is re-read to pick up added, removed
+        and reordered pages, and every remaining page reloads only its own changed files through `Page.refresh`.
+
+        Args:
+            page_hashes (Optional[list[str]]): Only refresh these existing pages, when known to be the only ones touched.
+
+        Returns:
+            dict: `pages_added` and `pages_removed` hashes, `pages_reordered`, and the `Page.refresh` summary
+                of every page with changes under `pages`
+
+        """
+        summary = {'pages_added': [], 'pages_removed': [], 'pages_reordered': False, 'pages': {}}
+        previous_order = list(self.pages.hashes)
+
+        self.__get_page_order()
+
+        for page_hash in previous_order:
+            if page_hash not in self.ordered_pages:
+                self.pages.remove(page_hash)
+                summary['pages_removed'].append(page_hash)
+
+        for page_hash in self.ordered_pages:
+            if page_hash not in self.pages.hashes:
+                page = self.__create_page(page_hash)
+
+                if page:
+                    self.pages.add(page)
+                    summary['pages_added'].append(page_hash)
+
+                continue
+
+            if page_hashes is not None and page_hash not in page_hashes:
+                continue
+
+            page = self.pages[page_hash]
+            page_summary = page.refresh()
+
+            if self.ignored_pages and self.is_ignored(page.display_name):
+                self.pages.remove(page_hash)
+                summary['pages_removed'].append(page_hash)
+            elif any(page_summary.values()):
+                summary['pages'][page_hash] = page_summary
+
+                if page_summary['page_modified']:
+                    self.pages.reindex()
+
+        self.pages.reorder([page_hash for page_hash in self.ordered_pages if page_hash in self.pages.hashes])
+
+        kept_order = [page_hash for page_hash in previous_order if page_hash in self.pages.hashes]
+        summary['pages_reordered'] = kept_order != [page_hash for page_hash in self.pages.hashes if page_hash in previous_order]
+
+        return summary
+
+    def diff(self, other: 'Report') -> dict:
+        """
+        Compare the report with another version of it, see `biomancy.diff.diff_reports`
+
+        Args:
+            other (Report): The other version of the report.
+
+        Returns:
+            dict: The pages added, removed and reordered, and the visuals added, removed, moved, restyled and
+                modified on every page that changed
+
+        """
+        return diff.diff_reports(self, other)
+
+    def merge(self, base: 'Report', theirs: 'Report', prefer: str = 'ours') -> merge.MergeResult:
+        """
+        Three-way merge the changes made to another version of the report since a common base into this report,
+        see `biomancy.merge.merge_reports`. Nothing is written until `apply` is called on the result.
+
+        Args:
+            base (Report): The common base version of the report.
+            theirs (Report): The other version of the report.
+            prefer (str): The side whose value is kept on conflict, 'ours' or 'theirs'.
+
+        Returns:
+            MergeResult: The merged changes and the conflicts
+
+        """
+        return merge.merge_reports(base, self, theirs, prefer=prefer)
+
+    def save(self) -> list[str]:
+        """
+        Write every changed `page.json` and `visual.json` of the report in a single pass. Files are written
+        atomically, keeping their key order and formatting, and pages or visuals that were not changed, or
+        never loaded, are left untouched.
+
+        Returns:
+            list[str]: The paths of the files written
+
+        """
+        written = []
+
+        for page in self.pages:
+            written.extend(page.save())
+
+        return written
+
+    def save_snapshot(self, path: str) -> None:
+        """
+        Store the parsed report, with its pages, visuals, groups and indexes, in a single binary file, see
+        `biomancy.snapshot.save_snapshot`
+
+        Args:
+            path (str): The path of the snapshot file.
+
+        Returns:
+            None
+
+        """
+        snapshot.save_snapshot(self, path)
+
+    @classmethod
+    def load_snapshot(cls, path: str, validate: bool = True) -> 'Report':
+        """
+        Reopen a report from a snapshot file with one sequential read, see `biomancy.snapshot.load_snapshot`.
+        Snapshots are pickles and are trusted input, only load files written by `save_snapshot`.
+
+        Args:
+            path (str): The path of the snapshot file.
+            validate (bool): Compare the modification time and size of the source files with the snapshot, and
+                refresh the report when any of them changed.
+
+        Returns:
+            Report: The report stored in the snapshot
+
+        """
+        report = snapshot.load_snapshot(path, validate=validate)
+
+        if not isinstance(report, cls):
+            raise ValueError(f"Expected a snapshot of a {cls.__name__}, found {type(report).__name__}")
+
+        return report
+
+    def transaction(self, validate: bool = True) -> Transaction:
+        """
+        Stage edits to the pages and visuals of the report and write them all at once when the block exits,
+        discarding them if it raises. A commit interrupted by a process that is no longer running is restored
+        first, and the report refreshed from the restored files.
+
+        Args:
+            validate (bool): Check that every changed page and visual can still be loaded before writing.
+
+        Returns:
+            Transaction: The transaction, to use as a context manager
+
+        """
+        if Transaction.recover(self.directory_path):
+            self.refresh()
+
+        return Transaction(self, validate=validate)
+
+    def watch(self, callback: Callable[[list[ReportEvent]], None], interval: float = 1.0, debounce: float = 0.2,
+              backend: str = 'auto') -> ReportWatcher:
+        """
+        Keep the report synchronised with its directory and push change events to a callback
+
+        Args:
+            callback (Callable[[list[ReportEvent]], None]): Called with the coalesced events of every refresh.
+            interval (float): The number of seconds between two checks while the directory is idle.
+            debounce (float): The number of quiet seconds to wait for before refreshing after activity.
+            backend (str): 'inotify', 'polling', or 'auto' to use inotify when it is available.
+
+        Returns:
+            ReportWatcher: The started watcher, call `stop` on it to stop watching
+
+        """
+        watcher = ReportWatcher(self, interval=interval, debounce=debounce, backend=backend)
+        watcher.subscribe(callback)
+
+        return watcher.start()
+
+    def to_columns(self) -> dict[str, Union[array, list]]:
+        """
+        Export every visual of the report as typed columns in a single pass, see `biomancy.columns.to_columns`
+
+        Returns:
+            dict[str, Union[array, list]]: The columns keyed by name, one row per visual
+
+        """
+        return columns.to_columns(self.pages)
+
+    def to_arrow(self):
+        """
+        Export every visual of the report as an Arrow table, requires `pyarrow`
+
+        Returns:
+            pyarrow.Table: One row per visual
+
+        """
+        return columns.to_arrow(self.pages)
+
+    def to_dataframe(self):
+        """
+        Export every visual of the report as a pandas DataFrame, requires `pandas`
+
+        Returns:
+            pandas.DataFrame: One row per visual
+
+        """
+        return columns.to_dataframe(self.pages)
 
     def get_all_visuals_of_type(self, visual_type: str) -> list[Union[VisualGroup, VisualShape, VisualType]]:
         """
@@ -60,13 +577,7 @@ class Report(object):
             A list of instantiated Visual objects
 
         """
-        visuals_data = []
-        for page in self.pages:
-            for visual in page.visuals:
-                if visual == visual_type:
-                    visuals_data.append(visual)
-
-        return visuals_data
+        return self.pages.get_all_visuals_by_type(visual_type)
 
     def get_page_json(self, display_name: str) -> dict:
         """
@@ -114,11 +625,8 @@ class Report(object):
         """
         relevant_types = {}
         for page in self.pages:
-            for visual in page.visuals:
-                if visual.type != 'shape' and visual.type != 'visualGroup':
-                    if visual.type not in relevant_types:
-                        relevant_types[visual.type] = [visual]
-                    else:
-                        relevant_types[visual.type].append(visual)
+            for visual_type in page.visuals.get_unique_types():
+                if visual_type != 'shape' and visual_type != 'visualGroup':
+                    relevant_types.setdefault(visual_type, []).extend(page.visuals.get_by_type(visual_type))
 
         return relevant_types
@@ -0,0 +1,152 @@
+""" Module to store a parsed PowerBI report in a single binary snapshot file """
+import gc
+import os
+import pickle
+import struct
+
+from typing import Optional
+
+MAGIC: bytes = b'BIOMANCY'
+VERSION: int = 1
+PREAMBLE = struct.Struct('<8sHQ')
+
+
+def get_signature(path: str) -> Optional[tuple[int, int]]:
+    """
+    Get the modification time and size of a path
+
+    Args:
+        path (str): The path of a file or directory.
+
+    Returns:
+        Optional[tuple[int, int]]: The `(mtime_ns, size)` of the path, None when it does not exist
+
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+
+    return stat.st_mtime_ns, stat.st_size
+
+
+def get_source_signatures(report) -> dict[str, Optional[tuple[int, int]]]:
+    """
+    Get the signature of every source file and directory a report was read from, as recorded when it was read,
+    so that a file changed between reading the report and saving the snapshot is still found stale
+
+    Args:
+        report (Report): The report.
+
+    Returns:
+        dict[str, Optional[tuple[int, int]]]: The `(mtime_ns, size)` keyed by path
+
+    """
+    return report.signatures
+
+
+def save_snapshot(report, path: str) -> None:
+    """
+    Write a report with every page, visual and index it holds to a single file. The file starts with a header
+    recording the signature of every source file, followed by the pickled report, and is replaced atomically.
+
+    Args:
+        report (Report): The report to store.
+        path (str): The path of the snapshot file.
+
+    Returns:
+        None
+
+    """
+    header = pickle.dumps({
+        'directory_path': os.path.abspath(report.directory_path),
+        'signatures': get_source_signatures(report),
+    }, protocol=5)
+    payload = pickle.dumps(report, protocol=5)
+
+    temporary_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(temporary_path, 'wb') as snapshot_file:
+            snapshot_file.write(PREAMBLE.pack(MAGIC, VERSION, len(header)))
+            snapshot_file.write(header)
+            snapshot_file.write(payload)
+        os.replace(temporary_path, path)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+
+
+def read_header(data: bytes) -> tuple[dict, int]:
+    """
+    Read the header of a snapshot
+
+    Args:
+        data (bytes): The content of the snapshot file.
+
+    Returns:
+        tuple[dict, int]: The header, and the offset of the pickled report
+
+    """
+    if len(data) < PREAMBLE.size:
+        raise ValueError("Invalid snapshot, the file is truncated")
+
+    magic, version, header_length = PREAMBLE.unpack_from(data)
+
+    if magic != MAGIC:
+        raise ValueError("Invalid snapshot, the file is not a biomancy snapshot")
+
+    if version != VERSION:
+        raise ValueError(f"Unsupported snapshot version {version}, expected {VERSION}")
+
+    offset = PREAMBLE.size + header_length
+    return pickle.loads(memoryview(data)[PREAMBLE.size:offset]), offset
+
+
+def get_stale_paths(header: dict) -> list[str]:
+    """
+    Get the source files and directories that changed since a snapshot was written
+
+    Args:
+        header (dict): The header of the snapshot.
+
+    Returns:
+        list[str]: The paths whose modification time or size differs from the recorded one
+
+    """
+    return [path for path, signature in header['signatures'].items() if get_signature(path) != signature]
+
+
+def load_snapshot(path: str, validate: bool = True):
+    """
+    Read a report from a snapshot file in a single sequential read. When validating, the signature of every
+    source file is compared with the header, and a report whose sources changed since is refreshed so that only
+    the changed files are read again. The report is unpickled, so snapshots are trusted input, only load files
+    written by `save_snapshot`.
+
+    Args:
+        path (str): The path of the snapshot file.
+        validate (bool): Check the source files, and refresh the report when any of them changed.
+
+    Returns:
+        Report: The report stored in the snapshot
+
+    """
+    with open(path, 'rb') as snapshot_file:
+        data = snapshot_file.read()
+
+    header, offset = read_header(data)
+
+    # Unpickling creates every object of the report at once, pause the cyclic garbage collector meanwhile
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        report = pickle.loads(memoryview(data)[offset:])
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    if validate and get_stale_paths(header):
+        report.refresh()
+
+    return report
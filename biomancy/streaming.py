@@ -0,0 +1,95 @@
+""" Module to stream the visuals of a PBIP directory without loading the whole report """
+import os
+
+from typing import Any, Iterator, Optional
+
+from biomancy.components import Page, Visuals
+from biomancy.parse_cache import ParseCache
+from biomancy.tools import read_json
+
+DEFAULT_FIELDS: dict[str, str] = {
+    'x': 'position.x',
+    'y': 'position.y',
+    'z': 'position.z',
+    'width': 'position.width',
+    'height': 'position.height',
+    'tab_order': 'position.tabOrder',
+    'parent_group_name': 'parentGroupName',
+}
+
+
+def get_path(data: dict, path: str) -> Any:
+    """
+    Get a nested value from the raw data of a PowerBI JSON file
+
+    Args:
+        data (dict): The raw data from the PowerBI JSON file.
+        path (str): The dotted path of the value, e.g. `position.x` or `visual.query.queryState`.
+
+    Returns:
+        Any: The value, None when any part of the path is missing
+
+    """
+    value = data
+    for key in path.split('.'):
+        if isinstance(value, dict):
+            value = value.get(key)
+        elif isinstance(value, list) and key.isdigit() and int(key) < len(value):
+            value = value[int(key)]
+        else:
+            return None
+
+    return value
+
+
+def iter_visuals(directory_path: str, fields: Optional[list[str]] = None, ignored_pages: Optional[list[str]] = None,
+                 cache: Optional[ParseCache] = None) -> Iterator[dict[str, Any]]:
+    """
+    Stream the visuals of a PBIP directory one record at a time, following `pageOrder`. Only one `visual.json`
+    is held in memory at a time and no visual objects are constructed, so memory stays flat regardless of the
+    size of the report.
+
+    Args:
+        directory_path (str): The directory path containing `pages.json` and the page directories.
+        fields (Optional[list[str]]): Dotted paths into `visual.json` to extract, e.g. `position.x`, defaults
+            to the position fields and `parentGroupName`.
+        ignored_pages (Optional[list[str]]): Display names of pages to skip.
+        cache (Optional[ParseCache]): The parse cache to serve unchanged files from.
+
+    Returns:
+        Iterator[dict[str, Any]]: One record per visual with `page_hash`, `page_display_name`, `name`, `type`
+            and the requested fields
+
+    """
+    if not os.path.exists(directory_path):
+        raise FileNotFoundError(f"Expected Structure Error || Target directory {directory_path} not found")
+
+    field_paths = DEFAULT_FIELDS if fields is None else {field: field for field in fields}
+    ignored_pages = ignored_pages if ignored_pages else []
+
+    for page_hash in read_json(os.path.join(directory_path, 'pages.json'))['pageOrder']:
+        page_directory = os.path.join(directory_path, page_hash)
+
+        if not os.path.isdir(page_directory):
+            raise FileNotFoundError(f"Expected Structure Error || Page directory {page_hash} not found")
+
+        page = Page(page_directory, lazy=True, cache=cache)
+        page_display_name = page.display_name
+
+        if page_display_name in ignored_pages:
+            continue
+
+        for visual_path in page.get_visual_paths():
+            data = Visuals.read_visual_json(visual_path, cache=cache)
+
+            record = {
+                'page_hash': page_hash,
+                'page_display_name': page_display_name,
+                'name': data.get('name'),
+                'type': 'visualGroup' if 'visualGroup' in data else get_path(data, 'visual.visualType'),
+            }
+
+            for field, path in field_paths.items():
+                record[field] = get_path(data, path)
+
+            yield record
@@ -0,0 +1,45 @@
+""" Module to define the ThemeDataColor class. """
+
+
+class ThemeDataColor(object):
+    """ Class to represent a color of the report theme, referenced by its index and a lightness shift """
+    __slots__ = ('color_id', 'percent')
+
+    def __init__(self, color_id: int, percent: float = 0):
+        self.color_id: int = color_id
+        self.percent: float = percent
+
+    def __eq__(self, other):
+        if isinstance(other, ThemeDataColor):
+            return self.color_id == other.color_id and self.percent == other.percent
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.color_id, self.percent))
+
+    def __repr__(self):
+        return f"ThemeDataColor({self.color_id}, {self.percent})"
+
+    @classmethod
+    def from_json(cls, data: dict) -> 'ThemeDataColor':
+        """
+        Create a theme data color from its expression.
+
+        Args:
+            data (dict): The `ThemeDataColor` expression, e.g. `{'ColorId': 2, 'Percent': -0.25}`.
+
+        Returns:
+            ThemeDataColor: The theme data color.
+
+        """
+        return cls(data['ColorId'], data.get('Percent', 0))
+
+    def to_json(self) -> dict:
+        """
+        Returns the theme data color as an expression.
+
+        Returns:
+            dict: The theme data color as an expression.
+
+        """
+        return {"ThemeDataColor": {"ColorId": self.color_id, "Percent": self.percent}}
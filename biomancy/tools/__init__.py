@@ -1,4 +1,6 @@
 """ This module contains utility functions for the biomancy package. """
+from .expressions import decode_expression, decode_literal
+from .json_backend import dumps, get_backend, loads, read_json, set_backend, write_json
 
 
 def to_bool(string: str) -> bool:
@@ -17,3 +19,4 @@ def to_bool(string: str) -> bool:
         raise ValueError(f'This method only accepts "true" or "false" as input. Received: {string}')
 
     return True if lowered == 'true' else False
+
@@ -0,0 +1,138 @@
+""" This module decodes the expressions used as property values in PowerBI JSON files. """
+import datetime
+import functools
+import re
+import sys
+
+from typing import Any
+
+from ..fields import FIELD_KINDS, extract_field_references, iter_field_references
+from ..theme_json.definitions.theme_data_color import ThemeDataColor
+
+LITERAL_CACHE_SIZE: int = 65536
+NUMBER_PATTERN = re.compile(r'^(-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)([DLM])$')
+
+
+class Conditional(object):
+    """ Class to represent a conditional expression, a value picked by the first matching case """
+    __slots__ = ('cases', 'default_value')
+
+    def __init__(self, cases: list[tuple[dict, Any]], default_value: Any = None):
+        """
+        Initialize the Conditional object
+
+        Args:
+            cases (list[tuple[dict, Any]]): The raw condition and the decoded value of every case, in order.
+            default_value (Any): The decoded value used when no case matches.
+
+        """
+        self.cases: list[tuple[dict, Any]] = cases
+        self.default_value: Any = default_value
+
+    def __repr__(self):
+        return f"Conditional({len(self.cases)} cases)"
+
+    @property
+    def fields(self) -> list[tuple[str, str, str]]:
+        """
+        Get the semantic model fields the conditions depend on
+
+        Returns:
+            list[tuple[str, str, str]]: The distinct `(kind, table, name)` references of the conditions
+
+        """
+        return extract_field_references([condition for condition, _ in self.cases])
+
+
+@functools.lru_cache(maxsize=LITERAL_CACHE_SIZE)
+def decode_literal(value: str) -> Any:
+    """
+    Decode the value of a literal expression. Results are memoized, and text is interned, so the same literal
+    repeated across visuals is decoded once and shared.
+
+    Args:
+        value (str): The literal, e.g. `"'Sales'"`, `'12D'`, `'4L'`, `'true'`, `'null'` or `"datetime'2024-01-01T00:00:00'"`.
+
+    Returns:
+        Any: The text without quotes, a number (an int unless it has a fraction or exponent), a bool, None, a
+            datetime, or the literal itself when its format is unknown
+
+    """
+    if len(value) >= 2 and value[0] == "'" and value[-1] == "'":
+        return sys.intern(value[1:-1].replace("''", "'"))
+
+    if value == 'true':
+        return True
+
+    if value == 'false':
+        return False
+
+    if value == 'null':
+        return None
+
+    match = NUMBER_PATTERN.match(value)
+    if match:
+        number = match.group(1)
+        return float(number) if any(character in number for character in '.eE') else int(number)
+
+    if value.startswith("datetime'") and value.endswith("'"):
+        return datetime.datetime.fromisoformat(value[9:-1])
+
+    return sys.intern(value)
+
+
+def get_expression(value: Any) -> Any:
+    """
+    Unwrap the expression of a property value, e.g. `{'expr': {...}}` or `{'solid': {'color': {'expr': {...}}}}`
+
+    Args:
+        value (Any): The raw value of a property, or a bare expression.
+
+    Returns:
+        Any: The expression, or the value itself when it is not wrapped
+
+    """
+    while isinstance(value, dict):
+        if isinstance(value.get('solid'), dict) and 'color' in value['solid']:
+            value = value['solid']['color']
+        elif isinstance(value.get('expr'), dict):
+            value = value['expr']
+        else:
+            break
+
+    return value
+
+
+def decode_expression(value: Any) -> Any:
+    """
+    Decode the value of a property
+
+    Args:
+        value (Any): The raw value of a property, or a bare expression.
+
+    Returns:
+        Any: The decoded literal, a `ThemeDataColor`, the `(kind, table, name)` of a measure or column, a
+            `Conditional`, or the raw value when the expression is of another kind
+
+    """
+    expression = get_expression(value)
+
+    if not isinstance(expression, dict):
+        return expression
+
+    if 'Literal' in expression:
+        literal = expression['Literal'].get('Value')
+        return decode_literal(literal) if isinstance(literal, str) else literal
+
+    if 'ThemeDataColor' in expression:
+        return ThemeDataColor.from_json(expression['ThemeDataColor'])
+
+    if 'Conditional' in expression:
+        conditional = expression['Conditional']
+        cases = [(case.get('Condition'), decode_expression(case.get('Value'))) for case in conditional.get('Cases', [])]
+        return Conditional(cases, decode_expression(conditional.get('DefaultValue')))
+
+    if any(kind in expression for kind in FIELD_KINDS):
+        return next(iter_field_references(expression), value)
+
+    return value
@@ -0,0 +1,74 @@
+""" This module computes content hashes of PowerBI JSON structures. """
+import hashlib
+import json
+
+from typing import Any
+
+STYLE_KEYS: tuple[str, ...] = ('objects', 'visualContainerObjects')
+
+
+def canonical_json(data: Any) -> bytes:
+    """
+    Serialize content to JSON with sorted keys and no whitespace, so that equal content always gives equal bytes.
+    The standard library is always used, so hashes do not depend on the JSON backends installed.
+
+    Args:
+        data (Any): The content to serialize.
+
+    Returns:
+        bytes: The canonical JSON content.
+
+    """
+    return json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def hash_json(data: Any) -> str:
+    """
+    Hash content regardless of the order of its keys.
+
+    Args:
+        data (Any): The content to hash.
+
+    Returns:
+        str: The hexadecimal digest of the content.
+
+    """
+    return hashlib.blake2b(canonical_json(data), digest_size=16).hexdigest()
+
+
+def combine_hashes(*hashes: str) -> str:
+    """
+    Hash a sequence of hashes into a single parent hash.
+
+    Args:
+        *hashes (str): The child hashes, in a meaningful order.
+
+    Returns:
+        str: The hexadecimal digest of the children.
+
+    """
+    return hashlib.blake2b('|'.join(hashes).encode('ascii'), digest_size=16).hexdigest()
+
+
+def hash_visual_sections(data: dict) -> dict[str, str]:
+    """
+    Hash the raw data of a `visual.json` file per section, so that moves, restyles and other changes can be told apart.
+
+    Args:
+        data (dict): The raw data of the `visual.json` file.
+
+    Returns:
+        dict[str, str]: The hash of the `position`, the `style` (formatting `objects` and `visualContainerObjects`),
+            the remaining `content`, and of the whole `visual`.
+
+    """
+    section_key = 'visual' if 'visual' in data else 'visualGroup'
+    section = data.get(section_key, {})
+    style = {key: section[key] for key in STYLE_KEYS if key in section}
+    content = {key: value for key, value in data.items() if key != 'position'}
+    content[section_key] = {key: value for key, value in section.items() if key not in STYLE_KEYS}
+
+    hashes = {'position': hash_json(data.get('position')), 'style': hash_json(style), 'content': hash_json(content)}
+    hashes['visual'] = combine_hashes(hashes['position'], hashes['style'], hashes['content'])
+
+    return hashes
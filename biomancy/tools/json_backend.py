@@ -0,0 +1,212 @@
+""" This module selects the JSON library used to read and write PowerBI JSON files. """
+import codecs
+import json
+import os
+import re
+import tempfile
+
+from typing import Any, Callable, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+COMPACT_SEPARATORS: tuple[str, str] = (',', ':')
+
+
+def _orjson_dumps(data: Any, indent: Optional[int] = None, separators: tuple[str, str] = COMPACT_SEPARATORS) -> str:
+    if indent not in (None, 2) or (indent is None and separators != COMPACT_SEPARATORS):
+        return _json_dumps(data, indent=indent, separators=separators)
+
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0).decode('utf-8')
+
+
+def _ujson_dumps(data: Any, indent: Optional[int] = None, separators: tuple[str, str] = COMPACT_SEPARATORS) -> str:
+    if indent is None and separators != COMPACT_SEPARATORS:
+        return _json_dumps(data, indent=indent, separators=separators)
+
+    return ujson.dumps(data, indent=indent or 0, ensure_ascii=False, escape_forward_slashes=False)
+
+
+def _json_dumps(data: Any, indent: Optional[int] = None, separators: tuple[str, str] = COMPACT_SEPARATORS) -> str:
+    return json.dumps(data, indent=indent, separators=separators if indent is None else None, ensure_ascii=False)
+
+
+BACKENDS: dict[str, tuple[Callable[[bytes], Any], Callable[..., str]]] = {'json': (json.loads, _json_dumps)}
+
+if ujson is not None:
+    BACKENDS['ujson'] = (ujson.loads, _ujson_dumps)
+
+if orjson is not None:
+    BACKENDS['orjson'] = (orjson.loads, _orjson_dumps)
+
+INDENT_PATTERN = re.compile(rb'\r?\n( +)\S')
+FIRST_KEY_PATTERN = re.compile(rb'^(?:\xef\xbb\xbf)?\s*\{\s*"(?:[^"\\]|\\.)*"\s*:( ?)')
+
+_backend: str = 'orjson' if orjson is not None else 'ujson' if ujson is not None else 'json'
+
+
+def get_backend() -> str:
+    """
+    Get the name of the JSON library in use.
+
+    Returns:
+        str: 'orjson', 'ujson' or 'json'.
+
+    """
+    return _backend
+
+
+def set_backend(name: str) -> None:
+    """
+    Select the JSON library used to read and write PowerBI JSON files.
+
+    Args:
+        name (str): 'orjson', 'ujson' or 'json', the first two only when installed.
+
+    Returns:
+        None
+
+    """
+    global _backend
+
+    if name not in BACKENDS:
+        raise ValueError(f'JSON backend {name} is not available, expected one of {list(BACKENDS)}')
+
+    _backend = name
+
+
+def loads(data: bytes) -> Any:
+    """
+    Parse JSON content with the selected backend.
+
+    Args:
+        data (bytes): The UTF-8 encoded JSON content, with or without a byte order mark.
+
+    Returns:
+        Any: The parsed content.
+
+    """
+    if data.startswith(codecs.BOM_UTF8):
+        data = data[len(codecs.BOM_UTF8):]
+
+    return BACKENDS[_backend][0](data)
+
+
+def dumps(data: Any, indent: Optional[int] = None, separators: tuple[str, str] = COMPACT_SEPARATORS) -> str:
+    """
+    Serialize content to JSON with the selected backend. Every backend produces the same layout, only the
+    formatting of floats in exponent notation may differ.
+
+    Args:
+        data (Any): The content to serialize.
+        indent (Optional[int]): The indentation of nested levels, compact output when None.
+        separators (tuple[str, str]): The item and key separators of compact output, e.g. `(', ', ': ')`.
+
+    Returns:
+        str: The JSON content.
+
+    """
+    return BACKENDS[_backend][1](data, indent=indent, separators=separators)
+
+
+def read_json(file_path: str) -> dict:
+    """
+    Read and parse a JSON file, reading its bytes in a single call.
+
+    Args:
+        file_path (str): The path of the JSON file to read.
+
+    Returns:
+        dict: The parsed content of the JSON file.
+
+    """
+    with open(file_path, 'rb') as json_file:
+        return loads(json_file.read())
+
+
+def detect_format(content: bytes) -> tuple[bool, Optional[int], tuple[str, str], str, bool]:
+    """
+    Detect how a JSON file is formatted, so that rewriting it only changes the values that changed.
+
+    Args:
+        content (bytes): The content of the JSON file.
+
+    Returns:
+        tuple[bool, Optional[int], tuple[str, str], str, bool]: Whether it starts with a byte order mark, the
+            indentation of nested levels (None when compact), the separators of compact content, the line ending
+            and whether it ends with a line ending.
+
+    """
+    bom = content.startswith(codecs.BOM_UTF8)
+    match = INDENT_PATTERN.search(content)
+    indent = len(match.group(1)) if match else None
+    first_key = FIRST_KEY_PATTERN.match(content)
+    separators = (', ', ': ') if first_key and first_key.group(1) else COMPACT_SEPARATORS
+    newline = '\r\n' if b'\r\n' in content else '\n'
+    trailing_newline = content.endswith(b'\n')
+
+    return bom, indent, separators, newline, trailing_newline
+
+
+def write_json(file_path: str, data: Any) -> bool:
+    """
+    Serialize content to a JSON file atomically, through a temporary file renamed over the target. Key order is
+    kept, and the byte order mark, indentation, separators and line endings of an existing file are preserved.
+    Power BI's two space indentation is used for new files. Content is always serialized with the standard
+    library, so the bytes written do not depend on the selected backend.
+
+    Args:
+        file_path (str): The path of the JSON file to write.
+        data (Any): The content to serialize.
+
+    Returns:
+        bool: True if the file was written, False if its content was already identical.
+
+    """
+    try:
+        with open(file_path, 'rb') as json_file:
+            previous = json_file.read()
+    except FileNotFoundError:
+        previous = None
+
+    bom, indent, separators, newline, trailing_newline = (
+        detect_format(previous) if previous is not None else (False, 2, COMPACT_SEPARATORS, '\n', False)
+    )
+
+    text = _json_dumps(data, indent=indent, separators=separators)
+    if newline != '\n':
+        text = text.replace('\n', newline)
+    if trailing_newline:
+        text += newline
+
+    content = (codecs.BOM_UTF8 if bom else b'') + text.encode('utf-8')
+    if content == previous:
+        return False
+
+    directory_path, file_name = os.path.split(os.path.abspath(file_path))
+    file_descriptor, temporary_path = tempfile.mkstemp(prefix=f'.{file_name}.', suffix='.tmp', dir=directory_path)
+
+    try:
+        with os.fdopen(file_descriptor, 'wb') as temporary_file:
+            temporary_file.write(content)
+            temporary_file.flush()
+            os.fsync(temporary_file.fileno())
+
+        if previous is not None:
+            os.chmod(temporary_path, os.stat(file_path).st_mode & 0o7777)
+
+        os.replace(temporary_path, file_path)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+
+    return True
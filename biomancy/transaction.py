@@ -0,0 +1,500 @@
+""" Module to apply bulk edits to a PowerBI report as a single transaction """
+import copy
+import json
+import os
+import shutil
+import socket
+import threading
+import uuid
+
+from typing import Callable, Optional, Union
+
+from biomancy.components import Page, Visuals
+from biomancy.tools import read_json, write_json
+
+
+def is_process_alive(pid: int) -> bool:
+    """
+    Check if a process of this host is still running
+
+    Args:
+        pid (int): The process id.
+
+    Returns:
+        bool: True if the process is running, False otherwise
+
+    """
+    if os.name == 'nt':
+        import ctypes
+
+        handle = ctypes.windll.kernel32.OpenProcess(0x100000, False, pid)
+        if not handle:
+            return False
+
+        try:
+            return ctypes.windll.kernel32.WaitForSingleObject(handle, 0) == 0x102
+        finally:
+            ctypes.windll.kernel32.CloseHandle(handle)
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+    return True
+
+
+def remove_empty_directories(file_path: str, root_path: str) -> None:
+    """
+    Remove the directories left empty above a deleted file, up to but excluding a root directory
+
+    Args:
+        file_path (str): The path of the deleted file.
+        root_path (str): The directory to stop at.
+
+    Returns:
+        None
+
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    root_path = os.path.abspath(root_path)
+
+    while directory != root_path and directory.startswith(root_path) and os.path.isdir(directory):
+        if os.listdir(directory):
+            return
+
+        os.rmdir(directory)
+        directory = os.path.dirname(directory)
+
+
+class Transaction(object):
+    """
+    Class to stage edits to the pages and visuals of a report and write them all, or none of them.
+
+    Nothing is copied when the transaction starts: the files on disk hold the state of every clean page and visual,
+    and only pages and visuals that already had unsaved changes are snapshotted. On commit the staged changes are
+    validated, the files about to be overwritten are backed up to a journal, and every dirty file is written.
+    A failure restores the files from the journal. A commit interrupted by a crash is rolled back by the next
+    transaction or commit on the report, or when it is opened with `recover=True`, never by a plain read.
+
+    Commits hold an exclusive lock file recording the process id and host of their owner, so a report recovered
+    while another process is committing is left untouched, and its journal is only replayed once that process is
+    dead, by the single process that took the lock over.
+    """
+    JOURNAL_DIRECTORY: str = '.biomancy-journal'
+    MANIFEST: str = 'journal.json'
+    LOCK: str = '.biomancy-journal.lock'
+
+    def __init__(self, report, validate: bool = True):
+        """
+        Initialize the Transaction object
+
+        Args:
+            report (Report): The report to edit.
+            validate (bool): Check that every changed page and visual can still be loaded before writing.
+
+        """
+        self.report = report
+        self.validate: bool = validate
+        self.journal_path: str = os.path.join(report.directory_path, self.JOURNAL_DIRECTORY)
+        self.lock_path: str = os.path.join(report.directory_path, self.LOCK)
+        self.written: list[str] = []
+
+        self.__snapshots: Optional[dict[str, tuple[Optional[dict], dict[str, dict]]]] = None
+
+    def __enter__(self):
+        return self.begin()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.rollback()
+            return False
+
+        self.commit()
+        return False
+
+    @property
+    def is_active(self) -> bool:
+        """
+        Check if the transaction has begun and was neither committed nor rolled back
+
+        Returns:
+            bool: True if the transaction is active, False otherwise
+
+        """
+        return self.__snapshots is not None
+
+    def __get_dirty_pages(self) -> list[Page]:
+        return [page for page in self.report.pages if page.dirty or page.dirty_visuals]
+
+    def begin(self) -> 'Transaction':
+        """
+        Start staging edits, snapshotting only the pages and visuals that already have unsaved changes
+
+        Returns:
+            Transaction: The transaction itself
+
+        """
+        if self.is_active:
+            raise RuntimeError("Transaction already active")
+
+        self.written = []
+        self.__snapshots = {
+            page.hash: (
+                copy.deepcopy(page.raw_data) if page.dirty else None,
+                {visual.name: copy.deepcopy(visual.raw_data) for visual in page.dirty_visuals}
+            )
+            for page in self.__get_dirty_pages()
+        }
+
+        return self
+
+    def get_errors(self) -> list[str]:
+        """
+        Check that every changed page and visual can still be loaded
+
+        Returns:
+            list[str]: A description of every invalid page or visual, empty when all are valid
+
+        """
+        errors = []
+
+        for page in self.__get_dirty_pages():
+            if page.dirty and not isinstance(page.raw_data.get('name'), str):
+                errors.append(f"{page.file_path}: `name` expected in page.json")
+
+            for visual in page.dirty_visuals:
+                try:
+                    Visuals.create_visual(copy.deepcopy(visual.raw_data))
+                except (KeyError, TypeError, ValueError) as error:
+                    errors.append(f"{visual.file_path}: {error!r}")
+
+        return errors
+
+    @staticmethod
+    def get_owner() -> dict:
+        """ Get the process id and host of the current process, as recorded in lock files """
+        return {'pid': os.getpid(), 'host': socket.gethostname()}
+
+    @staticmethod
+    def __read_owner(lock_path: str) -> Optional[dict]:
+        try:
+            owner = read_json(lock_path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            return {}
+
+        return owner if isinstance(owner, dict) else {}
+
+    @classmethod
+    def read_lock(cls, directory_path: str) -> Optional[dict]:
+        """
+        Read the owner of the commit lock of a report
+
+        Args:
+            directory_path (str): The directory path of the report.
+
+        Returns:
+            Optional[dict]: The `pid` and `host` of the owner, empty when unreadable, None when the report is not locked
+
+        """
+        return cls.__read_owner(os.path.join(directory_path, cls.LOCK))
+
+    @staticmethod
+    def is_owner_alive(owner: dict) -> bool:
+        """
+        Check if the owner of a lock may still be running. Owners on other hosts cannot be checked and are
+        considered alive, unreadable locks are considered abandoned.
+
+        Args:
+            owner (dict): The owner returned by `read_lock`.
+
+        Returns:
+            bool: True if the owner may still be running, False otherwise
+
+        """
+        if not isinstance(owner.get('pid'), int):
+            return False
+
+        if owner.get('host') != socket.gethostname():
+            return True
+
+        return is_process_alive(owner['pid'])
+
+    @classmethod
+    def try_lock(cls, directory_path: str) -> bool:
+        """
+        Take the commit lock of a report, taking it over from an owner that is no longer running. The lock is
+        written to a temporary file and linked into place, so it is never seen half written, and a stale lock is
+        claimed by renaming it away, which only one process can do.
+
+        Args:
+            directory_path (str): The directory path of the report.
+
+        Returns:
+            bool: True if the lock was taken, False if it is held by a process that may still be running
+
+        """
+        lock_path = os.path.join(directory_path, cls.LOCK)
+        unique = f'{os.getpid()}.{threading.get_ident()}'
+        temporary_path = f'{lock_path}.{unique}.tmp'
+
+        with open(temporary_path, 'w', encoding='utf-8') as lock_file:
+            lock_file.write(json.dumps({**cls.get_owner(), 'token': uuid.uuid4().hex}))
+            lock_file.flush()
+            os.fsync(lock_file.fileno())
+
+        try:
+            for _ in range(8):
+                try:
+                    os.link(temporary_path, lock_path)
+                    return True
+                except FileExistsError:
+                    owner = cls.read_lock(directory_path)
+
+                if owner is None:
+                    continue
+
+                if cls.is_owner_alive(owner):
+                    return False
+
+                claim_path = f'{lock_path}.{unique}.stale'
+
+                try:
+                    os.rename(lock_path, claim_path)
+                except FileNotFoundError:
+                    continue
+
+                if cls.__read_owner(claim_path) != owner:
+                    # The lock was taken over and replaced since it was read, hand it back to its new owner
+                    try:
+                        os.link(claim_path, lock_path)
+                    except FileExistsError:
+                        pass
+
+                os.remove(claim_path)
+        finally:
+            os.remove(temporary_path)
+
+        return False
+
+    def __acquire_lock(self) -> None:
+        directory_path = self.report.directory_path
+
+        if not self.try_lock(directory_path):
+            owner = self.read_lock(directory_path) or {}
+            raise RuntimeError(f"Report {directory_path} is locked by process {owner.get('pid')} on {owner.get('host')}")
+
+        if os.path.exists(self.journal_path):
+            try:
+                self.__replay_journal(directory_path)
+            except BaseException:
+                self.__release_lock()
+                raise
+
+    def __release_lock(self) -> None:
+        if os.path.exists(self.lock_path):
+            os.remove(self.lock_path)
+
+    def __write_journal(self, file_paths: list[str]) -> None:
+        if os.path.exists(self.journal_path):
+            shutil.rmtree(self.journal_path)
+
+        os.makedirs(self.journal_path)
+        entries = []
+
+        for index, file_path in enumerate(file_paths):
+            backup = None
+
+            if os.path.exists(file_path):
+                backup = f'{index:06d}.bak'
+                backup_path = os.path.join(self.journal_path, backup)
+                shutil.copy2(file_path, backup_path)
+
+                with open(backup_path, 'rb') as backup_file:
+                    os.fsync(backup_file.fileno())
+
+            entries.append({'path': os.path.relpath(file_path, self.report.directory_path), 'backup': backup})
+
+        write_json(os.path.join(self.journal_path, self.MANIFEST), {'files': entries})
+
+    def commit(self) -> list[str]:
+        """
+        Validate the staged edits and write every dirty file, restoring every file if any write fails
+
+        Returns:
+            list[str]: The paths of the files written
+
+        """
+        if not self.is_active:
+            raise RuntimeError("Transaction is not active")
+
+        if self.validate:
+            errors = self.get_errors()
+
+            if errors:
+                self.rollback()
+                raise ValueError(f"Transaction rolled back, {len(errors)} invalid change(s): {errors}")
+
+        dirty_pages = self.__get_dirty_pages()
+        staged = {page.hash: (page.dirty, [visual.name for visual in page.dirty_visuals]) for page in dirty_pages}
+        file_paths = [page.file_path for page in dirty_pages if page.dirty]
+        file_paths.extend(visual.file_path for page in dirty_pages for visual in page.dirty_visuals)
+
+        if not file_paths:
+            self.__snapshots = None
+            return []
+
+        try:
+            self.written = self.__write_journaled(file_paths, self.report.save)
+        except BaseException:
+            for page in dirty_pages:
+                page_dirty, visual_names = staged[page.hash]
+                page.dirty = page.dirty or page_dirty
+
+                for name in visual_names:
+                    page.visuals.get_by_hash(name).dirty = True
+
+            self.rollback()
+            raise
+
+        self.__snapshots = None
+
+        return self.written
+
+    def __write_journaled(self, file_paths: list[str], write: Callable[[], list[str]]) -> list[str]:
+        self.__acquire_lock()
+
+        try:
+            self.__write_journal(file_paths)
+            written = write()
+        except BaseException:
+            self.recover(self.report.directory_path, force=True)
+            raise
+
+        shutil.rmtree(self.journal_path)
+        self.__release_lock()
+
+        return written
+
+    def write_files(self, operations: dict[str, Union[dict, str, None]]) -> list[str]:
+        """
+        Write, copy and delete files of the report as a single unit, outside of any staged edit. The files are
+        journaled and locked as in a commit, so a failure restores every one of them and removes the files created.
+
+        Args:
+            operations (dict[str, Union[dict, str, None]]): The operations applied in order, keyed by file path: the
+                data to write as JSON, the path of a file to copy, or None to delete the file.
+
+        Returns:
+            list[str]: The paths of the files written, copied or deleted
+
+        """
+        def write() -> list[str]:
+            changed = []
+
+            for file_path, operation in operations.items():
+                if operation is None:
+                    if os.path.exists(file_path):
+                        os.remove(file_path)
+                        remove_empty_directories(file_path, self.report.directory_path)
+                        changed.append(file_path)
+                elif isinstance(operation, str):
+                    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                    shutil.copy2(operation, file_path)
+                    changed.append(file_path)
+                elif write_json(file_path, operation):
+                    changed.append(file_path)
+
+            return changed
+
+        if not operations:
+            return []
+
+        return self.__write_journaled(list(operations), write)
+
+    def rollback(self) -> None:
+        """
+        Discard the staged edits, restoring the pages and visuals to their state when the transaction began
+
+        Returns:
+            None
+
+        """
+        if not self.is_active:
+            raise RuntimeError("Transaction is not active")
+
+        for page in self.__get_dirty_pages():
+            raw_data, visuals_data = self.__snapshots.get(page.hash, (None, {}))
+            page.revert(raw_data=raw_data, visuals_data=visuals_data)
+
+        self.__snapshots = None
+
+    @classmethod
+    def __replay_journal(cls, directory_path: str) -> list[str]:
+        journal_path = os.path.join(directory_path, cls.JOURNAL_DIRECTORY)
+        manifest_path = os.path.join(journal_path, cls.MANIFEST)
+        restored = []
+
+        if not os.path.exists(journal_path):
+            return restored
+
+        if os.path.exists(manifest_path):
+            for entry in read_json(manifest_path)['files']:
+                file_path = os.path.join(directory_path, entry['path'])
+
+                if entry['backup'] is None:
+                    if os.path.exists(file_path):
+                        os.remove(file_path)
+                        remove_empty_directories(file_path, directory_path)
+                else:
+                    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                    temporary_path = f'{file_path}.{os.getpid()}.tmp'
+                    shutil.copy2(os.path.join(journal_path, entry['backup']), temporary_path)
+                    os.replace(temporary_path, file_path)
+
+                restored.append(file_path)
+
+        shutil.rmtree(journal_path)
+
+        return restored
+
+    @classmethod
+    def recover(cls, directory_path: str, force: bool = False) -> list[str]:
+        """
+        Restore the files of a report from the journal left by an interrupted commit. The commit lock is taken
+        first, so nothing is done while the process owning it is alive, a commit in progress is never rolled back,
+        and two processes never restore the same journal.
+
+        Args:
+            directory_path (str): The directory path of the report.
+            force (bool): Restore the files even if the owner of the lock is alive or cannot be checked.
+
+        Returns:
+            list[str]: The paths of the files restored
+
+        """
+        journal_path = os.path.join(directory_path, cls.JOURNAL_DIRECTORY)
+        lock_path = os.path.join(directory_path, cls.LOCK)
+
+        if force:
+            restored = cls.__replay_journal(directory_path)
+
+            if os.path.exists(lock_path):
+                os.remove(lock_path)
+
+            return restored
+
+        if not os.path.exists(lock_path) and not os.path.exists(journal_path):
+            return []
+
+        if not cls.try_lock(directory_path):
+            return []
+
+        try:
+            return cls.__replay_journal(directory_path)
+        finally:
+            os.remove(lock_path)
@@ -0,0 +1,395 @@
+""" Module to keep a Report synchronised with its PBIP directory """
+import os
+import threading
+import time
+
+from typing import Callable, Optional
+
+try:
+    import inotify_simple
+except ImportError:
+    inotify_simple = None
+
+
+class ReportEvent(object):
+    """ Class to represent a change applied to a Report while watching its directory """
+    PAGE_ADDED: str = 'page_added'
+    PAGE_REMOVED: str = 'page_removed'
+    PAGE_MODIFIED: str = 'page_modified'
+    PAGES_REORDERED: str = 'pages_reordered'
+    VISUAL_ADDED: str = 'visual_added'
+    VISUAL_MODIFIED: str = 'visual_modified'
+    VISUAL_REMOVED: str = 'visual_removed'
+    GROUP_MEMBERSHIP_CHANGED: str = 'group_membership_changed'
+    PAGE_CONFLICT: str = 'page_conflict'
+    VISUAL_CONFLICT: str = 'visual_conflict'
+    ERROR: str = 'error'
+
+    def __init__(self, kind: str, page_hash: Optional[str] = None, name: Optional[str] = None,
+                 error: Optional[Exception] = None):
+        """
+        Initialize the ReportEvent object
+
+        Args:
+            kind (str): The kind of change, one of the ReportEvent constants.
+            page_hash (Optional[str]): The hash of the page the change applies to.
+            name (Optional[str]): The name of the visual or visual group the change applies to.
+            error (Optional[Exception]): The exception raised while refreshing, for `ERROR` events.
+
+        """
+        self.kind: str = kind
+        self.page_hash: Optional[str] = page_hash
+        self.name: Optional[str] = name
+        self.error: Optional[Exception] = error
+
+    def __eq__(self, other):
+        if not isinstance(other, ReportEvent):
+            return NotImplemented
+
+        return (self.kind, self.page_hash, self.name) == (other.kind, other.page_hash, other.name)
+
+    def __hash__(self):
+        return hash((self.kind, self.page_hash, self.name))
+
+    def __repr__(self):
+        if self.error is not None:
+            return f'ReportEvent({self.kind}, {self.error!r})'
+
+        return f'ReportEvent({self.kind}, {self.page_hash}, {self.name})'
+
+    @staticmethod
+    def from_summary(summary: dict) -> list['ReportEvent']:
+        """
+        Convert the summary returned by `Report.refresh` to a list of events
+
+        Args:
+            summary (dict): The summary returned by `Report.refresh`.
+
+        Returns:
+            list[ReportEvent]: The events described by the summary
+
+        """
+        events = [ReportEvent(ReportEvent.PAGE_ADDED, page_hash) for page_hash in summary['pages_added']]
+        events += [ReportEvent(ReportEvent.PAGE_REMOVED, page_hash) for page_hash in summary['pages_removed']]
+
+        if summary['pages_reordered']:
+            events.append(ReportEvent(ReportEvent.PAGES_REORDERED))
+
+        for page_hash, page_summary in summary['pages'].items():
+            if page_summary['page_modified']:
+                events.append(ReportEvent(ReportEvent.PAGE_MODIFIED, page_hash))
+
+            events += [ReportEvent(ReportEvent.VISUAL_ADDED, page_hash, name) for name in page_summary['added']]
+            events += [ReportEvent(ReportEvent.VISUAL_MODIFIED, page_hash, name) for name in page_summary['modified']]
+            events += [ReportEvent(ReportEvent.VISUAL_REMOVED, page_hash, name) for name in page_summary['removed']]
+            events += [ReportEvent(ReportEvent.GROUP_MEMBERSHIP_CHANGED, page_hash, name) for name in page_summary['groups']]
+
+            if page_summary['page_conflict']:
+                events.append(ReportEvent(ReportEvent.PAGE_CONFLICT, page_hash))
+
+            events += [ReportEvent(ReportEvent.VISUAL_CONFLICT, page_hash, name) for name in page_summary['conflicts']]
+
+        return events
+
+
+class ReportWatcher(object):
+    """
+    Class to keep a Report synchronised with its PBIP directory.
+
+    A background thread waits for file system activity, through inotify when the optional `inotify_simple`
+    package is installed on Linux or by polling `Report.refresh` otherwise. Bursts of activity are debounced,
+    the report is refreshed once and the coalesced events are pushed to every subscriber. Subscribers are
+    called on the watcher thread while `lock` is held, hold the same lock to read the report from other threads.
+
+    A refresh failing, typically on a file that is still being written, does not stop the watcher. Subscribers
+    receive an `ERROR` event holding the exception, and the whole report is refreshed again after `interval`. A
+    subscriber raising is reported the same way, without retrying the refresh or skipping the other subscribers.
+    """
+    BACKENDS: list[str] = ['auto', 'inotify', 'polling']
+
+    def __init__(self, report, interval: float = 1.0, debounce: float = 0.2, backend: str = 'auto'):
+        """
+        Initialize the ReportWatcher object
+
+        Args:
+            report (Report): The report to keep synchronised.
+            interval (float): The number of seconds between two checks while the directory is idle.
+            debounce (float): The number of quiet seconds to wait for before refreshing after activity.
+            backend (str): 'inotify', 'polling', or 'auto' to use inotify when it is available.
+
+        """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend {backend}, expected one of {self.BACKENDS}")
+
+        if backend == 'inotify' and inotify_simple is None:
+            raise ImportError("The inotify backend requires the `inotify_simple` package")
+
+        if backend == 'auto':
+            backend = 'inotify' if inotify_simple is not None else 'polling'
+
+        self.report = report
+        self.interval: float = interval
+        self.debounce: float = debounce
+        self.backend: str = backend
+        self.lock: threading.RLock = threading.RLock()
+        self.subscribers: list[Callable[[list[ReportEvent]], None]] = []
+
+        self.__stop_event: threading.Event = threading.Event()
+        self.__thread: Optional[threading.Thread] = None
+        self.__inotify = None
+        self.__watched_directories: dict[int, str] = {}
+        self.__failed: bool = False
+
+    def __repr__(self):
+        return f'ReportWatcher({self.report.directory_path}, {self.backend})'
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    @property
+    def is_running(self) -> bool:
+        """
+        Check if the watcher thread is running
+
+        Returns:
+            bool: True if the watcher thread is running, False otherwise
+
+        """
+        return self.__thread is not None and self.__thread.is_alive()
+
+    @staticmethod
+    def coalesce(events: list[ReportEvent]) -> list[ReportEvent]:
+        """
+        Merge the events of several refreshes into the net change they describe, e.g. a visual added then
+        modified is reported as added, and a visual added then removed is not reported at all
+
+        Args:
+            events (list[ReportEvent]): The events, oldest first.
+
+        Returns:
+            list[ReportEvent]: The coalesced events, in order of first occurrence
+
+        """
+        lifecycles = {
+            ReportEvent.PAGE_ADDED: ('page', 'added'), ReportEvent.PAGE_REMOVED: ('page', 'removed'),
+            ReportEvent.PAGE_MODIFIED: ('page', 'modified'), ReportEvent.VISUAL_ADDED: ('visual', 'added'),
+            ReportEvent.VISUAL_REMOVED: ('visual', 'removed'), ReportEvent.VISUAL_MODIFIED: ('visual', 'modified'),
+        }
+        kinds = {
+            'page': {'added': ReportEvent.PAGE_ADDED, 'removed': ReportEvent.PAGE_REMOVED, 'modified': ReportEvent.PAGE_MODIFIED},
+            'visual': {'added': ReportEvent.VISUAL_ADDED, 'removed': ReportEvent.VISUAL_REMOVED, 'modified': ReportEvent.VISUAL_MODIFIED},
+        }
+        transitions = {
+            ('added', 'modified'): 'added', ('added', 'removed'): None, ('modified', 'removed'): 'removed',
+            ('removed', 'added'): 'modified', ('modified', 'modified'): 'modified',
+        }
+
+        merged: dict[tuple, ReportEvent] = {}
+        for event in events:
+            if event.kind not in lifecycles:
+                merged.setdefault((event.kind, event.page_hash, event.name), event)
+                continue
+
+            category, state = lifecycles[event.kind]
+            key = (category, event.page_hash, event.name)
+            previous = merged.get(key)
+
+            if previous is None:
+                merged[key] = event
+                continue
+
+            merged_state = transitions.get((lifecycles[previous.kind][1], state), state)
+
+            if merged_state is None:
+                merged.pop(key)
+            else:
+                merged[key] = ReportEvent(kinds[category][merged_state], event.page_hash, event.name)
+
+        return list(merged.values())
+
+    def subscribe(self, callback: Callable[[list[ReportEvent]], None]) -> None:
+        """
+        Register a callback receiving the list of coalesced events of every refresh
+
+        Args:
+            callback (Callable[[list[ReportEvent]], None]): The callback to register.
+
+        Returns:
+            None
+
+        """
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[list[ReportEvent]], None]) -> None:
+        """
+        Remove a registered callback
+
+        Args:
+            callback (Callable[[list[ReportEvent]], None]): The callback to remove.
+
+        Returns:
+            None
+
+        """
+        self.subscribers.remove(callback)
+
+    def start(self) -> 'ReportWatcher':
+        """
+        Start the watcher thread
+
+        Returns:
+            ReportWatcher: The watcher itself
+
+        """
+        if self.is_running:
+            return self
+
+        self.__stop_event.clear()
+
+        if self.backend == 'inotify':
+            self.__inotify = inotify_simple.INotify()
+            self.__watch_directories()
+
+        self.__thread = threading.Thread(target=self.__run, name=repr(self), daemon=True)
+        self.__thread.start()
+
+        return self
+
+    def stop(self) -> None:
+        """
+        Stop the watcher thread and wait for it to finish
+
+        Returns:
+            None
+
+        """
+        self.__stop_event.set()
+
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+
+        if self.__inotify is not None:
+            self.__inotify.close()
+            self.__inotify = None
+            self.__watched_directories = {}
+
+    def __run(self):
+        while not self.__stop_event.is_set():
+            try:
+                if self.__failed:
+                    self.__retry()
+                elif self.backend == 'inotify':
+                    self.__wait_inotify()
+                else:
+                    self.__poll()
+            except Exception as error:
+                self.__failed = True
+                self.__publish_error(error)
+                self.__stop_event.wait(self.interval)
+
+    def __retry(self):
+        with self.lock:
+            if self.__inotify is not None:
+                self.__watch_directories()
+
+            summary = self.report.refresh()
+            self.__failed = False
+            self.__publish(ReportEvent.from_summary(summary))
+
+    def __publish_error(self, error: Exception) -> None:
+        with self.lock:
+            for callback in list(self.subscribers):
+                try:
+                    callback([ReportEvent(ReportEvent.ERROR, error=error)])
+                except Exception:
+                    continue
+
+    def __publish(self, events: list[ReportEvent]) -> None:
+        events = self.coalesce(events)
+        if not events:
+            return
+
+        for callback in list(self.subscribers):
+            try:
+                callback(events)
+            except Exception as error:
+                self.__publish_error(error)
+
+    def __poll(self):
+        with self.lock:
+            events = ReportEvent.from_summary(self.report.refresh())
+
+        if not events:
+            self.__stop_event.wait(self.interval)
+            return
+
+        try:
+            while not self.__stop_event.wait(self.debounce):
+                with self.lock:
+                    new_events = ReportEvent.from_summary(self.report.refresh())
+
+                if not new_events:
+                    break
+
+                events += new_events
+        except Exception:
+            with self.lock:
+                self.__publish(events)
+            raise
+
+        with self.lock:
+            self.__publish(events)
+
+    def __watch_directories(self):
+        mask = (inotify_simple.flags.CREATE | inotify_simple.flags.DELETE | inotify_simple.flags.MODIFY
+                | inotify_simple.flags.MOVED_FROM | inotify_simple.flags.MOVED_TO | inotify_simple.flags.CLOSE_WRITE)
+        watched = set(self.__watched_directories.values())
+
+        for directory, _, _ in os.walk(self.report.directory_path):
+            if directory not in watched:
+                try:
+                    self.__watched_directories[self.__inotify.add_watch(directory, mask)] = directory
+                except OSError:
+                    continue
+
+    def __touched_pages(self, events) -> Optional[list[str]]:
+        page_hashes = set()
+
+        for event in events:
+            directory = self.__watched_directories.get(event.wd)
+            if directory is None:
+                continue
+
+            relative_path = os.path.relpath(os.path.join(directory, event.name), self.report.directory_path)
+            parts = relative_path.split(os.sep)
+
+            if parts[0] in ('.', 'pages.json'):
+                continue
+
+            page_hashes.add(parts[0])
+
+        return sorted(page_hashes)
+
+    def __wait_inotify(self):
+        events = self.__inotify.read(timeout=int(self.interval * 1000))
+        if not events:
+            return
+
+        deadline = time.monotonic() + self.debounce
+        while not self.__stop_event.is_set():
+            new_events = self.__inotify.read(timeout=max(0, int((deadline - time.monotonic()) * 1000)))
+
+            if not new_events:
+                break
+
+            events += new_events
+            deadline = time.monotonic() + self.debounce
+
+        with self.lock:
+            self.__watch_directories()
+            summary = self.report.refresh(page_hashes=self.__touched_pages(events))
+            self.__publish(ReportEvent.from_summary(summary))
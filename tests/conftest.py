@@ -0,0 +1,87 @@
+""" Fixtures building small PBIP report directories on disk """
+import json
+import os
+
+import pytest
+
+VISUAL_SCHEMA = 'https://developer.microsoft.com/json-schemas/fabric/item/report/definition/visualContainer/1.0.0/schema.json'
+PAGE_SCHEMA = 'https://developer.microsoft.com/json-schemas/fabric/item/report/definition/page/1.0.0/schema.json'
+VISUAL_TYPES = ['lineChart', 'card', 'shape', 'slicer', 'tableEx']
+
+
+def literal(value: str) -> dict:
+    return {'expr': {'Literal': {'Value': value}}}
+
+
+def dump(path: str, data: dict) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, indent=2)
+
+
+def load(path: str) -> dict:
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def visual_data(name: str, visual_type: str, index: int, parent_group_name: str = None) -> dict:
+    data = {
+        '$schema': VISUAL_SCHEMA,
+        'name': name,
+        'position': {'x': 40 * index, 'y': 30 * index, 'z': index, 'width': 200, 'height': 100, 'tabOrder': index},
+        'visual': {
+            'visualType': visual_type,
+            'query': {'queryState': {'Values': {'projections': [{
+                'field': {'Measure': {'Expression': {'SourceRef': {'Entity': 'Sales'}}, 'Property': 'Total'}},
+                'queryRef': 'Sales.Total',
+            }]}}},
+            'objects': {'legend': [{'properties': {'show': literal('true')}}]},
+            'visualContainerObjects': {'title': [{'properties': {'text': literal(f"'Title {index}'")}}]},
+        },
+    }
+
+    if parent_group_name:
+        data['parentGroupName'] = parent_group_name
+
+    return data
+
+
+def make_report(directory: str, pages: int = 3, visuals: int = 5) -> str:
+    page_order = [f'page{page:02d}' for page in range(pages)]
+    dump(os.path.join(directory, 'pages.json'), {'pageOrder': page_order, 'activePageName': page_order[0]})
+
+    for page, page_hash in enumerate(page_order):
+        page_directory = os.path.join(directory, page_hash)
+        dump(os.path.join(page_directory, 'page.json'), {
+            '$schema': PAGE_SCHEMA, 'name': page_hash, 'displayName': f'Page {page}', 'height': 720, 'width': 1280,
+        })
+
+        group = f'group{page:02d}'
+        dump(os.path.join(page_directory, 'visuals', group, 'visual.json'), {
+            '$schema': VISUAL_SCHEMA, 'name': group,
+            'position': {'x': 0, 'y': 0, 'z': 0, 'width': 600, 'height': 400},
+            'visualGroup': {'displayName': f'Group {page}', 'groupMode': 'ScaleMode'},
+        })
+
+        for index in range(visuals):
+            name = f'visual{page:02d}{index:02d}'
+            dump(os.path.join(page_directory, 'visuals', name, 'visual.json'), visual_data(
+                name, VISUAL_TYPES[index % len(VISUAL_TYPES)], index, parent_group_name=group if index % 2 == 0 else None
+            ))
+
+    return directory
+
+
+def visual_path(directory: str, page_hash: str, visual_name: str) -> str:
+    return os.path.join(directory, page_hash, 'visuals', visual_name, 'visual.json')
+
+
+def bump_mtime(path: str) -> None:
+    """ Move the modification time forward, so a rewrite within the timestamp granularity is still detected """
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def report_directory(tmp_path) -> str:
+    return make_report(str(tmp_path / 'report'))
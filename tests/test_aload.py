@@ -0,0 +1,108 @@
+import asyncio
+import os
+import threading
+
+import pytest
+
+from biomancy import Report, Transaction
+from biomancy import report as report_module
+from biomancy.components import Page
+from biomancy.file_systems import AsyncFileSystem, FakeFileSystem, LocalFileSystem, read_file, scan_directory
+from conftest import make_report
+
+
+def describe(report):
+    return [
+        (page.hash, page.raw_data, [(visual.name, visual.raw_data) for visual in page.visuals], page.signatures)
+        for page in report.pages
+    ]
+
+
+@pytest.mark.parametrize('file_system', [None, FakeFileSystem(latency=0.001)])
+def test_aload_matches_report(tmp_path, file_system):
+    directory = make_report(str(tmp_path / 'report'), pages=4, visuals=12)
+    report = Report(directory)
+
+    loaded = asyncio.run(Report.aload(directory, concurrency=8, file_system=file_system))
+
+    assert loaded.ordered_pages == report.ordered_pages
+    assert loaded.pages.hashes == report.pages.hashes
+    assert describe(loaded) == describe(report)
+    assert loaded.signatures == report.signatures
+
+
+class FailingFileSystem(FakeFileSystem):
+    """ Fail reading the visuals of `page00` right away while the reads of every other page are still waiting """
+    async def read(self, path):
+        if os.sep + 'page00' + os.sep in path:
+            if os.path.basename(path) == 'visual.json':
+                raise FileNotFoundError(path)
+
+            return read_file(path)
+
+        return await super().read(path)
+
+    async def scan(self, path):
+        if path.endswith(os.path.join('page00', 'visuals')):
+            return scan_directory(path)
+
+        return await super().scan(path)
+
+
+def test_aload_failure_cancels_pending_reads(report_directory):
+    file_system = FailingFileSystem(latency=0.05)
+
+    async def load():
+        with pytest.raises(FileNotFoundError, match='visual.json'):
+            await Report.aload(report_directory, file_system=file_system)
+
+        return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+    assert asyncio.run(load()) == []
+    assert file_system.in_flight == 0
+
+
+def test_aload_recovers_off_the_event_loop(report_directory, monkeypatch):
+    threads = []
+    recover = Transaction.recover
+
+    def recording_recover(directory_path, force=False):
+        threads.append(threading.current_thread())
+        return recover(directory_path, force=force)
+
+    monkeypatch.setattr(Transaction, 'recover', recording_recover)
+    asyncio.run(Report.aload(report_directory, recover=True))
+
+    assert threads and threads[0] is not threading.main_thread()
+
+
+def test_closed_local_file_system_raises(report_directory):
+    file_system = LocalFileSystem(max_workers=2)
+    file_system.close()
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(file_system.read(os.path.join(report_directory, 'pages.json')))
+
+
+def test_aload_parses_and_builds_pages_off_the_event_loop(report_directory, monkeypatch):
+    threads = set()
+    loads, load = report_module.loads, Page.load
+
+    def recording_loads(content):
+        threads.add(threading.current_thread())
+        return loads(content)
+
+    def recording_load(page, *args, **kwargs):
+        threads.add(threading.current_thread())
+        return load(page, *args, **kwargs)
+
+    monkeypatch.setattr(report_module, 'loads', recording_loads)
+    monkeypatch.setattr(Page, 'load', recording_load)
+    asyncio.run(Report.aload(report_directory))
+
+    assert threads and threading.main_thread() not in threads
+
+
+def test_async_file_system_is_abstract():
+    with pytest.raises(TypeError):
+        AsyncFileSystem()
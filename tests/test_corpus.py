@@ -0,0 +1,43 @@
+import os
+import sqlite3
+
+import pytest
+
+from biomancy import CorpusIndex
+from conftest import make_report, visual_path
+
+
+def test_index_fleet_records_bad_reports(tmp_path):
+    make_report(str(tmp_path / 'good.Report' / 'definition'), pages=2, visuals=2)
+    bad = make_report(str(tmp_path / 'bad.Report' / 'definition'), pages=2, visuals=2)
+
+    with open(visual_path(bad, 'page01', 'visual0101'), 'w', encoding='utf-8') as file:
+        file.write('{"name": ')
+
+    with CorpusIndex() as corpus:
+        summary = corpus.index_fleet(str(tmp_path))
+
+        assert list(summary['reports']) == [os.path.abspath(tmp_path / 'good.Report' / 'definition')]
+        assert list(summary['failures']) == [os.path.abspath(bad)]
+        assert corpus.reports_using_type('card') == list(summary['reports'])
+
+
+def test_index_fleet_raises_programming_errors(tmp_path):
+    make_report(str(tmp_path / 'good.Report' / 'definition'), pages=1, visuals=1)
+
+    corpus = CorpusIndex()
+    corpus.close()
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        corpus.index_fleet(str(tmp_path))
+
+
+def test_index_report_drops_deleted_visual_file(report_directory):
+    with CorpusIndex() as corpus:
+        corpus.index_report(report_directory)
+        path = visual_path(report_directory, 'page00', 'visual0001')
+        os.remove(path)
+
+        assert corpus.index_report(report_directory)['visuals_removed'] == 1
+        assert corpus.query('SELECT name FROM visuals WHERE name = ?', ('visual0001',)) == []
+        assert corpus.query('SELECT path FROM files WHERE path = ?', (os.path.abspath(path),)) == []
@@ -0,0 +1,63 @@
+from biomancy import Report
+from biomancy.tools import json_backend
+from conftest import dump, load, visual_path
+
+
+def test_content_hash_is_cached_and_invalidated(report_directory):
+    page = Report(report_directory).pages['page00']
+    original = page.content_hash
+
+    assert page.content_hash == original
+
+    page.raw_data['displayName'] = 'Not flagged'
+    assert page.content_hash == original
+    page.raw_data['displayName'] = 'Page 0'
+
+    page.visuals.get_by_hash('visual0001').position.x = 5
+    moved = page.content_hash
+    assert moved != original
+
+    page.visuals.get_by_hash('visual0001').raw_data['visual']['visualType'] = 'slicer'
+    page.visuals.get_by_hash('visual0001').mark_dirty()
+    assert page.content_hash != moved
+
+    page.raw_data['displayName'] = 'Renamed'
+    page.mark_dirty()
+    renamed = page.content_hash
+
+    page.revert()
+    assert page.content_hash == original != renamed
+
+
+def test_content_hash_does_not_depend_on_backend(report_directory):
+    backend = json_backend.get_backend()
+    hashes = set()
+
+    try:
+        for name in json_backend.BACKENDS:
+            json_backend.set_backend(name)
+            hashes.add(Report(report_directory).pages['page00'].content_hash)
+    finally:
+        json_backend.set_backend(backend)
+
+    assert len(hashes) == 1
+
+
+def test_diff_classifies_changes(report_directory, tmp_path):
+    report = Report(report_directory)
+
+    path = visual_path(report_directory, 'page00', 'visual0001')
+    data = load(path)
+    data['position']['x'] = 5
+    dump(path, data)
+
+    path = visual_path(report_directory, 'page01', 'visual0102')
+    data = load(path)
+    data['visual']['objects']['legend'][0]['properties']['show']['expr']['Literal']['Value'] = 'false'
+    dump(path, data)
+
+    changes = report.diff(Report(report_directory))
+
+    assert changes['pages']['page00']['moved'] == ['visual0001']
+    assert changes['pages']['page01']['restyled'] == ['visual0102']
+    assert 'page02' not in changes['pages']
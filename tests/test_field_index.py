@@ -0,0 +1,45 @@
+import pytest
+
+from biomancy import Report
+from conftest import dump, load, visual_path
+
+MEASURE = {'Measure': {'Expression': {'SourceRef': {'Entity': 'Orders'}}, 'Property': 'Count'}}
+
+
+def use_orders(data):
+    data['visual']['query']['queryState']['Values']['projections'][0]['field'] = MEASURE
+    return data
+
+
+def test_field_index_is_built_once(report_directory):
+    report = Report(report_directory)
+
+    assert report.field_index is report.field_index
+    assert report.field_index.get_tables() == ['Sales']
+
+
+def test_page_refresh_rebuilds_field_index(report_directory):
+    report = Report(report_directory)
+    assert report.field_index.get_tables() == ['Sales']
+
+    path = visual_path(report_directory, 'page00', 'visual0001')
+    dump(path, use_orders(load(path)))
+    report.pages['page00'].refresh()
+
+    assert report.field_index.get_visual_references('Orders') == [('page00', 'visual0001')]
+
+
+def test_edit_and_rollback_rebuild_field_index(report_directory):
+    report = Report(report_directory)
+    assert report.field_index.get_tables() == ['Sales']
+
+    with pytest.raises(KeyError):
+        with report.transaction():
+            visual = report.pages['page00'].visuals.get_by_hash('visual0001')
+            use_orders(visual.raw_data)
+            visual.mark_dirty()
+
+            assert report.field_index.get_visual_references('Orders') == [('page00', 'visual0001')]
+            raise KeyError('abort')
+
+    assert report.field_index.get_tables() == ['Sales']
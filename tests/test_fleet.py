@@ -0,0 +1,29 @@
+import os
+
+from biomancy import scan
+from conftest import make_report
+
+
+def crash_on_broken(report):
+    if 'broken' in report.directory_path:
+        os._exit(1)
+
+    return len(report.pages)
+
+
+def make_fleet(root: str, names: list[str]) -> None:
+    for name in names:
+        make_report(os.path.join(root, f'{name}.Report', 'definition'), pages=2, visuals=2)
+
+
+def test_scan_survives_dying_worker(tmp_path):
+    names = [f'report{index}' for index in range(6)] + ['broken']
+    make_fleet(str(tmp_path), names)
+
+    results = {os.path.basename(os.path.dirname(result.path)): result
+               for result in scan(str(tmp_path), workers=2, executor='process', analyze=crash_on_broken)}
+
+    assert sorted(results) == sorted(f'{name}.Report' for name in names)
+    assert not results['broken.Report'].ok
+    assert 'BrokenProcessPool' in results['broken.Report'].error
+    assert all(results[f'{name}.Report'].value == 2 for name in names if name != 'broken')
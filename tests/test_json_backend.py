@@ -0,0 +1,43 @@
+import pytest
+
+from biomancy.tools import json_backend
+
+
+@pytest.fixture
+def restore_backend():
+    backend = json_backend.get_backend()
+    yield
+    json_backend.set_backend(backend)
+
+
+@pytest.mark.parametrize('indent', [None, 2])
+def test_backends_produce_identical_layout(restore_backend, indent):
+    data = {'name': 'visual', 'position': {'x': 1.5, 'y': 2}, 'filters': [], 'objects': {}, 'text': 'é/<>'}
+    outputs = set()
+
+    for backend in json_backend.BACKENDS:
+        json_backend.set_backend(backend)
+        outputs.add(json_backend.dumps(data, indent=indent))
+
+    assert len(outputs) == 1
+
+
+@pytest.mark.parametrize('content', [
+    b'{"a":1,"b":[1,2]}',
+    b'{"a": 1, "b": [1, 2]}',
+    b'{\n  "a": 1,\n  "b": [\n    1,\n    2\n  ]\n}',
+    b'\xef\xbb\xbf{\r\n    "a": 1\r\n}\r\n',
+])
+def test_write_json_preserves_format(restore_backend, tmp_path, content):
+    path = tmp_path / 'file.json'
+
+    for backend in json_backend.BACKENDS:
+        json_backend.set_backend(backend)
+        path.write_bytes(content)
+        data = json_backend.read_json(str(path))
+
+        assert not json_backend.write_json(str(path), data)
+
+        data['a'] = 2
+        assert json_backend.write_json(str(path), data)
+        assert path.read_bytes() == content.replace(b'1', b'2', 1)
@@ -0,0 +1,16 @@
+from biomancy import Report
+from biomancy.layout import find_misalignments
+
+
+def test_misalignments_compare_grouped_edges(report_directory):
+    page = Report(report_directory).pages['page00']
+
+    for name, x in zip(['visual0000', 'visual0001', 'visual0002', 'visual0003', 'visual0004'], [10, 10, 11, 10, 13]):
+        page.visuals.get_by_hash(name).position.x = x
+
+    assert [misalignment for misalignment in find_misalignments(page) if misalignment[0] == 'left'] == [
+        ('left', 'visual0000', 'visual0002', 1),
+        ('left', 'visual0001', 'visual0002', 1),
+        ('left', 'visual0003', 'visual0002', 1),
+        ('left', 'visual0002', 'visual0004', 2),
+    ]
@@ -0,0 +1,111 @@
+import os
+import shutil
+
+import pytest
+
+from biomancy import Report, Transaction
+from biomancy.tools import json_backend
+from conftest import dump, load, visual_path
+
+
+@pytest.fixture
+def sides(report_directory, tmp_path):
+    ours, theirs = str(tmp_path / 'ours'), str(tmp_path / 'theirs')
+    shutil.copytree(report_directory, ours)
+    shutil.copytree(report_directory, theirs)
+
+    return report_directory, ours, theirs
+
+
+def set_visual_x(directory, page_hash, name, x):
+    path = visual_path(directory, page_hash, name)
+    data = load(path)
+    data['position']['x'] = x
+    dump(path, data)
+
+
+def add_page(directory, page_hash, source_hash='page00'):
+    shutil.copytree(os.path.join(directory, source_hash), os.path.join(directory, page_hash))
+    pages_data = load(os.path.join(directory, 'pages.json'))
+    pages_data['pageOrder'].append(page_hash)
+    dump(os.path.join(directory, 'pages.json'), pages_data)
+
+
+def test_merge_round_trip(sides):
+    base, ours, theirs = sides
+    set_visual_x(ours, 'page00', 'visual0001', 111)
+    set_visual_x(theirs, 'page00', 'visual0003', 333)
+    add_page(theirs, 'page99')
+
+    result = Report(ours).merge(Report(base), Report(theirs))
+    result.apply()
+
+    assert result.ok
+    assert load(os.path.join(ours, 'pages.json'))['pageOrder'] == ['page00', 'page01', 'page02', 'page99']
+    assert load(visual_path(ours, 'page00', 'visual0001'))['position']['x'] == 111
+    assert load(visual_path(ours, 'page00', 'visual0003'))['position']['x'] == 333
+    assert load(visual_path(ours, 'page99', 'visual0001')) == load(visual_path(theirs, 'page99', 'visual0001'))
+    assert Report(ours).pages.hashes == result.ours.pages.hashes
+
+
+def test_merge_keeps_ignored_pages_in_order(sides):
+    base, ours, theirs = sides
+    add_page(theirs, 'page99')
+
+    result = Report(ours, ignored_pages=['Page 1']).merge(Report(base), Report(theirs, ignored_pages=['Page 1']))
+    result.apply()
+
+    assert load(os.path.join(ours, 'pages.json'))['pageOrder'] == ['page00', 'page01', 'page02', 'page99']
+    assert os.path.isdir(os.path.join(ours, 'page01'))
+
+
+def test_merge_never_overwrites_existing_page_directory(sides):
+    base, ours, theirs = sides
+    add_page(theirs, 'page99')
+    shutil.copytree(os.path.join(ours, 'page01'), os.path.join(ours, 'page99'))
+    before = load(os.path.join(ours, 'page99', 'page.json'))
+
+    result = Report(ours).merge(Report(base), Report(theirs), prefer='theirs')
+    result.apply()
+
+    assert [conflict.page_hash for conflict in result.conflicts] == ['page99']
+    assert result.pages_added == []
+    assert load(os.path.join(ours, 'page99', 'page.json')) == before
+    assert 'page99' not in load(os.path.join(ours, 'pages.json'))['pageOrder']
+
+
+def test_failed_apply_restores_directory(sides, monkeypatch):
+    base, ours, theirs = sides
+    set_visual_x(theirs, 'page00', 'visual0003', 333)
+    add_page(theirs, 'page99')
+    shutil.rmtree(os.path.join(theirs, 'page02'))
+    pages_data = load(os.path.join(theirs, 'pages.json'))
+    pages_data['pageOrder'].remove('page02')
+    dump(os.path.join(theirs, 'pages.json'), pages_data)
+
+    result = Report(ours).merge(Report(base), Report(theirs))
+    before = {
+        os.path.relpath(os.path.join(directory, name), ours): load(os.path.join(directory, name))
+        for directory, _, names in os.walk(ours) for name in names
+    }
+    write_json = json_backend.write_json
+
+    def failing_write_json(file_path, data):
+        if os.path.basename(file_path) == 'pages.json':
+            raise OSError('disk full')
+        return write_json(file_path, data)
+
+    monkeypatch.setattr('biomancy.transaction.write_json', failing_write_json)
+
+    with pytest.raises(OSError):
+        result.apply()
+
+    after = {
+        os.path.relpath(os.path.join(directory, name), ours): load(os.path.join(directory, name))
+        for directory, _, names in os.walk(ours) for name in names
+    }
+
+    assert after == before
+    assert not os.path.exists(os.path.join(ours, 'page99'))
+    assert not os.path.exists(os.path.join(ours, Transaction.JOURNAL_DIRECTORY))
+    assert not os.path.exists(os.path.join(ours, Transaction.LOCK))
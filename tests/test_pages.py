@@ -0,0 +1,12 @@
+from biomancy import Report
+
+
+def test_lookup_by_new_display_name_after_rename(report_directory):
+    report = Report(report_directory)
+    page = report.pages['Page 1']
+
+    page.raw_data['displayName'] = 'Renamed'
+    page.mark_dirty()
+
+    assert report.pages['Renamed'] is page
+    assert report.pages['Page 1'] is None
@@ -0,0 +1,15 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from biomancy.parse_cache import ParseCache
+from conftest import visual_path
+
+
+def test_counters_add_up_across_threads(report_directory, tmp_path):
+    cache = ParseCache(str(tmp_path / 'cache'))
+    path = visual_path(report_directory, 'page00', 'visual0001')
+    cache.read_json(path)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: cache.read_json(path), range(2000)))
+
+    assert (cache.hits, cache.misses, cache.errors) == (2000, 1, 0)
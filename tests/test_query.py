@@ -0,0 +1,20 @@
+from biomancy import Report
+
+
+def test_type_in_keeps_loading_order(report_directory):
+    report = Report(report_directory)
+    types = ['slicer', 'card', 'lineChart']
+
+    matches = list(report.visuals.where(type__in=types))
+
+    expected = [visual for page in report.pages for visual in page.visuals if visual.type in types]
+    assert [visual.name for visual in matches] == [visual.name for visual in expected]
+    assert report.visuals.where(type__in=types).first() is expected[0]
+
+
+def test_single_type_uses_type_index(report_directory):
+    report = Report(report_directory)
+
+    matches = list(report.visuals.where(type='card'))
+
+    assert [visual.name for visual in matches] == [visual.name for visual in report.get_all_visuals_of_type('card')]
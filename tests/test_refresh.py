@@ -0,0 +1,139 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from biomancy import Report, report as report_module
+from conftest import bump_mtime, dump, load, visual_data, visual_path
+
+
+def test_refresh_without_changes(report_directory):
+    report = Report(report_directory)
+
+    summary = report.refresh()
+
+    assert summary == {'pages_added': [], 'pages_removed': [], 'pages_reordered': False, 'pages': {}}
+
+
+def test_refresh_reloads_modified_added_and_removed_visuals(report_directory):
+    report = Report(report_directory)
+    path = visual_path(report_directory, 'page00', 'visual0001')
+    data = load(path)
+    data['position']['x'] = 999
+    dump(path, data)
+    bump_mtime(path)
+
+    dump(visual_path(report_directory, 'page00', 'visual0099'), visual_data('visual0099', 'card', 9))
+    shutil.rmtree(os.path.dirname(visual_path(report_directory, 'page00', 'visual0002')))
+
+    summary = report.refresh()['pages']['page00']
+
+    assert summary['modified'] == ['visual0001']
+    assert summary['added'] == ['visual0099']
+    assert summary['removed'] == ['visual0002']
+    assert report.pages['page00'].visuals.get_by_hash('visual0001').position.x == 999
+
+
+def test_refresh_retries_partially_written_visual(report_directory):
+    report = Report(report_directory)
+    path = visual_path(report_directory, 'page00', 'visual0001')
+    data = load(path)
+
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(json.dumps(data)[:40])
+    bump_mtime(path)
+
+    with pytest.raises(ValueError):
+        report.refresh()
+
+    with pytest.raises(ValueError):
+        report.refresh()
+
+    data['position']['x'] = 999
+    dump(path, data)
+
+    summary = report.refresh()
+
+    assert summary['pages']['page00']['modified'] == ['visual0001']
+    assert report.pages['page00'].visuals.get_by_hash('visual0001').position.x == 999
+
+
+def test_refresh_retries_partially_written_page(report_directory):
+    report = Report(report_directory)
+    path = os.path.join(report_directory, 'page01', 'page.json')
+    data = load(path)
+
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(json.dumps(data)[:20])
+    bump_mtime(path)
+
+    with pytest.raises(ValueError):
+        report.refresh()
+
+    with pytest.raises(ValueError):
+        report.refresh()
+
+    data['displayName'] = 'Renamed'
+    dump(path, data)
+
+    report.refresh()
+
+    assert report.pages['page01'].display_name == 'Renamed'
+
+
+def test_refresh_keeps_dirty_visuals_and_reports_conflicts(report_directory):
+    report = Report(report_directory)
+    page = report.pages['page00']
+    edited = page.visuals.get_by_hash('visual0001')
+    edited.position.x = 5
+    page.visuals.get_by_hash('visual0002').position.x = 6
+
+    path = visual_path(report_directory, 'page00', 'visual0001')
+    data = load(path)
+    data['position']['x'] = 999
+    dump(path, data)
+    bump_mtime(path)
+    shutil.rmtree(os.path.dirname(visual_path(report_directory, 'page00', 'visual0002')))
+
+    summary = report.refresh()['pages']['page00']
+
+    assert summary['conflicts'] == ['visual0002', 'visual0001']
+    assert summary['modified'] == [] and summary['removed'] == []
+    assert page.visuals.get_by_hash('visual0001') is edited and edited.x == 5
+    assert report.refresh()['pages']['page00']['conflicts'] == ['visual0002', 'visual0001']
+
+    assert sorted(page.revert()) == ['visual0001', 'visual0002']
+    assert page.visuals.get_by_hash('visual0001').x == 999
+    assert 'visual0002' not in page.visuals.hashes
+    assert report.refresh()['pages'] == {}
+
+
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+def test_parallel_load_records_signatures_as_read(report_directory, executor):
+    report = Report(report_directory, workers=2, executor=executor)
+
+    assert report.signatures == Report(report_directory).signatures
+
+
+def test_parallel_load_detects_write_during_read(report_directory, monkeypatch):
+    path = visual_path(report_directory, 'page00', 'visual0001')
+    original_loads = report_module.loads
+
+    def loads_then_write(content):
+        data = original_loads(content)
+
+        if data.get('name') == 'visual0001' and data['position']['x'] != 99:
+            data_on_disk = load(path)
+            data_on_disk['position']['x'] = 99
+            dump(path, data_on_disk)
+            bump_mtime(path)
+
+        return data
+
+    monkeypatch.setattr(report_module, 'loads', loads_then_write)
+    report = Report(report_directory, workers=2)
+    monkeypatch.undo()
+
+    assert report.refresh()['pages']['page00']['modified'] == ['visual0001']
+    assert report.pages['page00'].visuals.get_by_hash('visual0001').x == 99
@@ -0,0 +1,62 @@
+import os
+
+from biomancy import Report
+from conftest import load, visual_path
+
+
+def test_save_writes_only_dirty_files(report_directory):
+    report = Report(report_directory)
+    page = report.pages['page00']
+    path = visual_path(report_directory, 'page00', 'visual0001')
+    untouched = visual_path(report_directory, 'page00', 'visual0002')
+    untouched_mtime = os.stat(untouched).st_mtime_ns
+
+    page.visuals.get_by_hash('visual0001').position.x = 5
+    page.raw_data['displayName'] = 'Renamed'
+    page.mark_dirty()
+
+    written = report.save()
+
+    assert sorted(written) == sorted([path, page.file_path])
+    assert load(path)['position']['x'] == 5
+    assert load(page.file_path)['displayName'] == 'Renamed'
+    assert os.stat(untouched).st_mtime_ns == untouched_mtime
+    assert report.save() == []
+
+
+def test_save_round_trip_keeps_format(report_directory):
+    report = Report(report_directory)
+    path = visual_path(report_directory, 'page01', 'visual0103')
+
+    with open(path, 'rb') as file:
+        before = file.read()
+
+    visual = report.pages['page01'].visuals.get_by_hash('visual0103')
+    x = visual.position.x
+    visual.position.x = 1
+    report.save()
+    visual.position.x = x
+    report.save()
+
+    with open(path, 'rb') as file:
+        assert file.read() == before
+
+
+def test_save_is_not_reloaded_by_refresh(report_directory):
+    report = Report(report_directory)
+    report.pages['page00'].visuals.get_by_hash('visual0001').position.x = 5
+
+    report.save()
+
+    assert report.refresh()['pages'] == {}
+    assert Report(report_directory).pages['page00'].visuals.get_by_hash('visual0001').position.x == 5
+
+
+def test_setting_position_to_none_removes_key(report_directory):
+    report = Report(report_directory)
+    visual = report.pages['page00'].visuals.get_by_hash('visual0001')
+
+    visual.position.tab_order = None
+    report.save()
+
+    assert 'tabOrder' not in load(visual_path(report_directory, 'page00', 'visual0001'))['position']
@@ -0,0 +1,67 @@
+import os
+
+import pytest
+
+from biomancy import Report
+from conftest import bump_mtime, dump, load, visual_path
+
+
+def test_snapshot_round_trip(report_directory, tmp_path):
+    report = Report(report_directory)
+    path = str(tmp_path / 'report.snapshot')
+
+    report.save_snapshot(path)
+    loaded = Report.load_snapshot(path)
+
+    assert loaded.ordered_pages == report.ordered_pages
+    assert [page.content_hash for page in loaded.pages] == [page.content_hash for page in report.pages]
+
+
+def test_snapshot_records_pages_json_as_read(report_directory, tmp_path):
+    report = Report(report_directory)
+    pages_path = os.path.join(report_directory, 'pages.json')
+    pages_data = load(pages_path)
+    pages_data['pageOrder'].remove('page02')
+    dump(pages_path, pages_data)
+    bump_mtime(pages_path)
+
+    path = str(tmp_path / 'report.snapshot')
+    report.save_snapshot(path)
+    loaded = Report.load_snapshot(path)
+
+    assert report.ordered_pages == ['page00', 'page01', 'page02']
+    assert loaded.ordered_pages == ['page00', 'page01']
+    assert loaded.pages.hashes == ['page00', 'page01']
+
+
+def test_failed_snapshot_write_removes_temporary_file(report_directory, tmp_path, monkeypatch):
+    report = Report(report_directory)
+
+    def failing_replace(source, target):
+        raise OSError('disk full')
+
+    monkeypatch.setattr('biomancy.snapshot.os.replace', failing_replace)
+
+    with pytest.raises(OSError):
+        report.save_snapshot(str(tmp_path / 'report.snapshot'))
+
+    assert os.listdir(tmp_path) == ['report']
+
+
+def test_snapshot_of_relative_path_loads_from_other_directory(report_directory, tmp_path, monkeypatch):
+    monkeypatch.chdir(os.path.dirname(report_directory))
+    report = Report('report')
+    path = str(tmp_path / 'report.snapshot')
+    report.save_snapshot(path)
+
+    visual_file_path = visual_path(report_directory, 'page00', 'visual0001')
+    data = load(visual_file_path)
+    data['position']['x'] = 999
+    dump(visual_file_path, data)
+    bump_mtime(visual_file_path)
+
+    monkeypatch.chdir(tmp_path)
+    loaded = Report.load_snapshot(path)
+
+    assert loaded.directory_path == report_directory
+    assert loaded.pages['page00'].visuals.get_by_hash('visual0001').x == 999
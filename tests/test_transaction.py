@@ -0,0 +1,184 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from biomancy import Report, Transaction
+from conftest import load, visual_path
+
+
+def get_visual(report, page_hash='page00', name='visual0001'):
+    return report.pages[page_hash].visuals.get_by_hash(name)
+
+
+def test_commit_writes_every_change(report_directory):
+    report = Report(report_directory)
+
+    with report.transaction():
+        get_visual(report).position.x = 5
+        get_visual(report, 'page01', 'visual0102').position.y = 7
+
+    assert load(visual_path(report_directory, 'page00', 'visual0001'))['position']['x'] == 5
+    assert load(visual_path(report_directory, 'page01', 'visual0102'))['position']['y'] == 7
+    assert not os.path.exists(os.path.join(report_directory, Transaction.JOURNAL_DIRECTORY))
+    assert not os.path.exists(os.path.join(report_directory, Transaction.LOCK))
+
+
+def test_exception_rolls_back(report_directory):
+    report = Report(report_directory)
+    before = load(visual_path(report_directory, 'page00', 'visual0001'))
+
+    with pytest.raises(KeyError):
+        with report.transaction():
+            get_visual(report).position.x = 5
+            raise KeyError('abort')
+
+    assert get_visual(report).position.x == before['position']['x']
+    assert not get_visual(report).dirty
+    assert load(visual_path(report_directory, 'page00', 'visual0001')) == before
+
+
+def test_invalid_change_is_rejected(report_directory):
+    report = Report(report_directory)
+
+    with pytest.raises(ValueError):
+        with report.transaction():
+            get_visual(report).position.x = 5
+            del get_visual(report, 'page01', 'visual0102').raw_data['visual']
+            get_visual(report, 'page01', 'visual0102').mark_dirty()
+
+    assert load(visual_path(report_directory, 'page00', 'visual0001'))['position']['x'] == 40
+    assert 'visual' in get_visual(report, 'page01', 'visual0102').raw_data
+
+
+def test_failed_write_restores_files(report_directory, monkeypatch):
+    report = Report(report_directory)
+    before = load(visual_path(report_directory, 'page00', 'visual0001'))
+    original_save = type(get_visual(report, 'page01', 'visual0102')).save
+
+    def failing_save(visual):
+        if visual.name == 'visual0102':
+            raise OSError('disk full')
+        return original_save(visual)
+
+    monkeypatch.setattr(type(get_visual(report, 'page01', 'visual0102')), 'save', failing_save)
+
+    with pytest.raises(OSError):
+        with report.transaction():
+            get_visual(report).position.x = 5
+            get_visual(report, 'page01', 'visual0102').position.y = 7
+
+    assert load(visual_path(report_directory, 'page00', 'visual0001')) == before
+    assert not os.path.exists(os.path.join(report_directory, Transaction.LOCK))
+
+
+def write_journal(report_directory: str, pid: int) -> str:
+    """ Leave the journal and lock of a commit that overwrote a visual """
+    path = visual_path(report_directory, 'page00', 'visual0001')
+    journal_path = os.path.join(report_directory, Transaction.JOURNAL_DIRECTORY)
+    os.makedirs(journal_path)
+
+    with open(path, 'rb') as source, open(os.path.join(journal_path, '000000.bak'), 'wb') as backup:
+        backup.write(source.read())
+
+    with open(os.path.join(journal_path, Transaction.MANIFEST), 'w', encoding='utf-8') as manifest:
+        json.dump({'files': [{'path': os.path.relpath(path, report_directory), 'backup': '000000.bak'}]}, manifest)
+
+    with open(os.path.join(report_directory, Transaction.LOCK), 'w', encoding='utf-8') as lock:
+        json.dump({'pid': pid, 'host': Transaction.get_owner()['host']}, lock)
+
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write('{"half": ')
+
+    return path
+
+
+def dead_pid():
+    process = subprocess.run([sys.executable, '-c', 'import os; print(os.getpid())'], capture_output=True, check=True)
+    return int(process.stdout)
+
+
+def test_open_leaves_commit_of_live_process(report_directory):
+    path = write_journal(report_directory, os.getpid())
+
+    with pytest.raises(ValueError):
+        Report(report_directory, recover=True)
+
+    assert os.path.exists(os.path.join(report_directory, Transaction.JOURNAL_DIRECTORY))
+    assert os.path.exists(os.path.join(report_directory, Transaction.LOCK))
+    assert Transaction.recover(report_directory) == []
+
+    assert Transaction.recover(report_directory, force=True) == [path]
+    assert load(path)['name'] == 'visual0001'
+
+
+def test_plain_open_never_recovers(report_directory):
+    path = write_journal(report_directory, dead_pid())
+
+    with pytest.raises(ValueError):
+        Report(report_directory)
+
+    assert os.path.exists(os.path.join(report_directory, Transaction.JOURNAL_DIRECTORY))
+    assert os.path.exists(os.path.join(report_directory, Transaction.LOCK))
+    assert open(path, encoding='utf-8').read() == '{"half": '
+
+
+def test_open_recovers_commit_of_dead_process(report_directory):
+    path = write_journal(report_directory, dead_pid())
+
+    report = Report(report_directory, recover=True)
+
+    assert get_visual(report).name == 'visual0001'
+    assert load(path)['name'] == 'visual0001'
+    assert not os.path.exists(os.path.join(report_directory, Transaction.JOURNAL_DIRECTORY))
+    assert not os.path.exists(os.path.join(report_directory, Transaction.LOCK))
+
+
+def test_transaction_recovers_commit_of_dead_process(report_directory):
+    report = Report(report_directory)
+    path = write_journal(report_directory, dead_pid())
+
+    with report.transaction():
+        get_visual(report, 'page01', 'visual0102').position.y = 7
+
+    assert load(path)['name'] == 'visual0001'
+    assert load(visual_path(report_directory, 'page01', 'visual0102'))['position']['y'] == 7
+    assert not os.path.exists(os.path.join(report_directory, Transaction.JOURNAL_DIRECTORY))
+    assert not os.path.exists(os.path.join(report_directory, Transaction.LOCK))
+
+
+def test_recover_takes_stale_lock_once(report_directory):
+    path = write_journal(report_directory, dead_pid())
+    barrier = threading.Barrier(4)
+    results = []
+
+    def recover():
+        barrier.wait()
+        results.append(Transaction.recover(report_directory))
+
+    threads = [threading.Thread(target=recover) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(results, key=len) == [[], [], [], [path]]
+    assert load(path)['name'] == 'visual0001'
+    assert not os.path.exists(os.path.join(report_directory, Transaction.LOCK))
+
+
+def test_commit_refuses_report_locked_by_live_process(report_directory):
+    report = Report(report_directory)
+
+    with open(os.path.join(report_directory, Transaction.LOCK), 'w', encoding='utf-8') as lock:
+        json.dump(Transaction.get_owner(), lock)
+
+    with pytest.raises(RuntimeError):
+        with report.transaction():
+            get_visual(report).position.x = 5
+
+    assert not get_visual(report).dirty
+    assert load(visual_path(report_directory, 'page00', 'visual0001'))['position']['x'] == 40
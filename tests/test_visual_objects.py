@@ -0,0 +1,48 @@
+from biomancy import Report
+from conftest import literal
+
+
+def get_visual(report, name):
+    return report.pages['page00'].visuals.get_by_hash(name)
+
+
+def test_mark_dirty_decodes_edited_sections_again(report_directory):
+    visual = get_visual(Report(report_directory), 'visual0000')
+    visual_objects, container_objects = visual.visual_objects, visual.visual_container_objects
+
+    assert visual_objects.legend == {'show': True}
+    assert container_objects.title == {'text': 'Title 0'}
+
+    visual.raw_data['visual']['objects']['legend'][0]['properties']['show'] = literal('false')
+    visual.raw_data['visual']['visualContainerObjects'] = {'title': [{'properties': {'text': literal("'Renamed'")}}]}
+    visual.mark_dirty()
+
+    assert visual_objects.legend == {'show': False}
+    assert visual.visual_objects.legend == {'show': False}
+    assert visual.visual_container_objects.title == {'text': 'Renamed'}
+
+
+def test_mark_dirty_picks_up_added_objects(report_directory):
+    visual = get_visual(Report(report_directory), 'visual0000')
+    del visual.raw_data['visual']['objects']
+    visual.mark_dirty()
+
+    assert visual.visual_objects.legend == {}
+
+    visual.raw_data['visual'].setdefault('objects', {})['labels'] = [{'properties': {'show': literal('true')}}]
+    visual.mark_dirty()
+
+    assert visual.visual_objects.labels == {'show': True}
+
+
+def test_shape_visual_objects(report_directory):
+    visual = get_visual(Report(report_directory), 'visual0002')
+
+    assert visual.type == 'shape'
+    assert visual.visual_objects.legend == {'show': True}
+
+    visual.raw_data['visual']['objects'] = {'fillCustom': [{'properties': {'transparency': literal('20D')}}]}
+    visual.mark_dirty()
+
+    assert visual.visual_objects.legend == {}
+    assert visual.visual_objects.fill_custom == {'transparency': 20}
@@ -0,0 +1,64 @@
+from biomancy import Report
+from biomancy.components import Visuals
+from conftest import visual_data
+
+
+def make_visuals(types):
+    visuals = Visuals()
+
+    for index, visual_type in enumerate(types):
+        visuals.add(f'/reports/visual{index:02d}', data=visual_data(f'visual{index:02d}', visual_type, index))
+
+    return visuals
+
+
+def test_replace_and_remove_keep_positions():
+    visuals = make_visuals(['card', 'slicer', 'card', 'tableEx', 'card'])
+
+    visuals.remove('visual01')
+    replaced = visuals.replace('visual03', '/reports/visual03', data=visual_data('visual03', 'tableEx', 9))
+    visuals.remove('visual00')
+    renamed = visuals.replace('visual04', '/reports/visual04', data=visual_data('visual05', 'card', 5))
+
+    assert visuals.hashes == ['visual02', 'visual03', 'visual05']
+    assert [visual.name for visual in visuals] == visuals.hashes
+    assert visuals[1] is replaced and visuals.get_by_hash('visual05') is renamed
+
+
+def test_replace_keeps_type_lists_in_loading_order():
+    visuals = make_visuals(['card', 'slicer', 'card', 'tableEx', 'card'])
+
+    visuals.replace('visual00', '/reports/visual00', data=visual_data('visual00', 'card', 7))
+    visuals.replace('visual03', '/reports/visual03', data=visual_data('visual03', 'card', 3))
+    visuals.replace('visual01', '/reports/visual01', data=visual_data('visual01', 'tableEx', 1))
+
+    assert [visual.name for visual in visuals.get_by_type('card')] == ['visual00', 'visual02', 'visual03', 'visual04']
+    assert [visual.name for visual in visuals.get_by_type('tableEx')] == ['visual01']
+    assert 'slicer' not in visuals.get_unique_types()
+
+
+def test_mark_dirty_moves_visual_to_its_new_type():
+    visuals = make_visuals(['card', 'slicer', 'card', 'tableEx', 'card'])
+    visual = visuals.get_by_hash('visual02')
+
+    visual.raw_data['visual']['visualType'] = 'tableEx'
+    visual.raw_data['visual']['query'] = {'queryState': {}}
+    visual.mark_dirty()
+
+    assert visual.type == 'tableEx' and visual.query == {'queryState': {}}
+    assert [visual.name for visual in visuals.get_by_type('card')] == ['visual00', 'visual04']
+    assert [visual.name for visual in visuals.get_by_type('tableEx')] == ['visual02', 'visual03']
+
+
+def test_mark_dirty_moves_visual_between_groups(report_directory):
+    page = Report(report_directory).pages['page00']
+    visual = page.visuals.get_by_hash('visual0001')
+    grouped = page.visuals.get_by_hash('visual0002')
+
+    visual.raw_data['parentGroupName'] = 'group00'
+    visual.mark_dirty()
+    del grouped.raw_data['parentGroupName']
+    grouped.mark_dirty()
+
+    assert visual.parent_group_name == 'group00' and grouped.parent_group_name is None
+    assert sorted(page.visual_groups['group00'].children) == ['visual0000', 'visual0001', 'visual0004']
@@ -0,0 +1,81 @@
+import json
+import threading
+
+from biomancy import Report, ReportEvent
+from conftest import bump_mtime, dump, load, visual_path
+
+
+def test_watcher_survives_partially_written_file(report_directory):
+    report = Report(report_directory)
+    received = []
+    failed = threading.Event()
+    modified = threading.Event()
+
+    def callback(events):
+        received.extend(events)
+
+        if any(event.kind == ReportEvent.ERROR for event in events):
+            failed.set()
+
+        if any(event.kind == ReportEvent.VISUAL_MODIFIED for event in events):
+            modified.set()
+
+    path = visual_path(report_directory, 'page00', 'visual0001')
+    data = load(path)
+
+    watcher = report.watch(callback, interval=0.05, debounce=0.05, backend='polling')
+    try:
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(json.dumps(data)[:40])
+        bump_mtime(path)
+
+        assert failed.wait(5)
+
+        data['position']['x'] = 999
+        dump(path, data)
+
+        assert modified.wait(5)
+        assert watcher.is_running
+    finally:
+        watcher.stop()
+
+    errors = [event for event in received if event.kind == ReportEvent.ERROR]
+    assert isinstance(errors[0].error, ValueError)
+    assert report.pages['page00'].visuals.get_by_hash('visual0001').position.x == 999
+
+
+def test_watcher_reports_failing_subscriber(report_directory):
+    report = Report(report_directory)
+    received = []
+    modified = threading.Event()
+    reported = threading.Event()
+
+    def failing_callback(events):
+        if not any(event.kind == ReportEvent.ERROR for event in events):
+            raise RuntimeError('subscriber failed')
+
+    def callback(events):
+        received.extend(events)
+
+        if any(event.kind == ReportEvent.VISUAL_MODIFIED for event in events):
+            modified.set()
+
+        if any(isinstance(event.error, RuntimeError) for event in events):
+            reported.set()
+
+    path = visual_path(report_directory, 'page00', 'visual0001')
+    data = load(path)
+
+    watcher = report.watch(failing_callback, interval=0.05, debounce=0.05, backend='polling')
+    watcher.subscribe(callback)
+    try:
+        data['position']['x'] = 999
+        dump(path, data)
+        bump_mtime(path)
+
+        assert modified.wait(5) and reported.wait(5)
+        assert watcher.is_running
+    finally:
+        watcher.stop()
+
+    assert [event.kind for event in received].count(ReportEvent.VISUAL_MODIFIED) == 1